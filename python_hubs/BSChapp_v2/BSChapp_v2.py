@@ -1,18 +1,30 @@
 import io
+import os
+import sys
 from datetime import date
 import streamlit as st
 
+# python_hubs/ on the path -> shared logic package (artifact contracts)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from logic.artifact_validation import format_errors, split_tags, validate  # noqa: E402
+
 # --------------------------
 # PDF engine (ReportLab)
 # --------------------------
+# Layout lives in pdf_engine.py (measured wrapping, one text object per paragraph,
+# page chrome as a reusable form XObject).
 REPORTLAB_OK = True
 try:
-    from reportlab.pdfgen import canvas
-    from reportlab.lib.pagesizes import letter
-    from reportlab.lib.units import inch
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from pdf_engine import write_artifact_pdf
+    from class_set import class_set_items, parse_roster, write_class_set_pdf, write_class_set_zip
 except Exception:
     REPORTLAB_OK = False
 
+# Rendered bytes keyed by a hash of every input (memory LRU + optional disk store),
+# so reruns with unchanged inputs skip ReportLab entirely.
+from render_cache import get_or_render  # noqa: E402
+
 
 # ============================================================
 # BSChapp v2 — GLASSY UI + PROJECT NORTH STAR INTEGRATION (FROZEN)
@@ -103,6 +115,19 @@ DEFAULT_PROMPTS = {
     "Photo Evidence": "Artifact Type:\n\nEvidence Summary (Teacher):\n\nStudent Objective:\n\nNotes:",
 }
 
+# artifact -> artifact_contracts/schemas/<contract>.schema.json
+ARTIFACT_CONTRACTS = {
+    "Exit Ticket": "exit_ticket",
+    "Worksheet": "worksheet",
+    "Lesson Plan": "lesson_plan",
+    "PBIS Reflective Note": "pbis_form",
+    "Photo Evidence": "evidence_capture",
+}
+
+# grade band -> contract grade_level; bands the contracts don't cover (HS, K-4)
+# have no equivalent, so grade_level is left out of the check for them
+CONTRACT_GRADE_LEVELS = {"MS": "MS", "5": "5"}
+
 # =====================
 # THEME TOKENS (v2 with GLASSY)
 # =====================
@@ -138,18 +163,16 @@ GOOGLE_SITE_PLACEHOLDER = "https://sites.google.com/"
 # =====================
 # HELPERS
 # =====================
-def wrap_lines(text: str, max_chars: int = 95):
-    out = []
-    for para in (text or "").split("\n"):
-        if para == "":
-            out.append("")
-            continue
-        line = para
-        while len(line) > max_chars:
-            out.append(line[:max_chars])
-            line = line[max_chars:]
-        out.append(line)
-    return out
+def contract_issues(artifact: str, lesson_title: str, standard_tags: str, grade_band: str, unit: str):
+    """Header fields checked against the artifact's contract (only the fields it declares)."""
+    record = {"unit": unit}
+    if grade_band in CONTRACT_GRADE_LEVELS:
+        record["grade_level"] = CONTRACT_GRADE_LEVELS[grade_band]
+    if lesson_title:
+        record["title"] = lesson_title
+    if standard_tags:
+        record["standard_tags"] = split_tags(standard_tags)
+    return validate(ARTIFACT_CONTRACTS[artifact], record, partial=True)
 
 
 def build_pdf_bytes(
@@ -164,113 +187,24 @@ def build_pdf_bytes(
     unit: str,
 ) -> bytes:
     buf = io.BytesIO()
-    c = canvas.Canvas(buf, pagesize=letter)
-    w, h = letter
-    margin = 0.75 * inch
-    x0 = margin
-    y = h - margin
-
-    # Title
-    c.setFont("Helvetica-Bold", 18)
-    c.drawString(x0, y, artifact)
-
-    # Science emblems top-right
-    if subject == "Science":
-        c.setFont("Helvetica-Bold", 11)
-        c.drawRightString(w - margin, y + 2, f"[{NGSS_EMBLEM}]  [{FIVE_E_EMBLEM}]")
-
-    y -= 0.32 * inch
-
-    # Date
-    c.setFont("Helvetica", 12)
-    c.drawString(x0, y, f"Date: {date.today().isoformat()}")
-    y -= 0.22 * inch
-
-    # Rails
-    c.setFont("Helvetica-Bold", 12)
-    c.drawString(x0, y, "Grade Band:")
-    c.setFont("Helvetica", 12)
-    c.drawString(x0 + 1.2 * inch, y, grade_band)
-    y -= 0.22 * inch
-
-    c.setFont("Helvetica-Bold", 12)
-    c.drawString(x0, y, "Subject:")
-    c.setFont("Helvetica", 12)
-    c.drawString(x0 + 1.2 * inch, y, subject)
-    y -= 0.22 * inch
-
-    if subject == "Science" and branch:
-        c.setFont("Helvetica-Bold", 12)
-        c.drawString(x0, y, "Branch:")
-        c.setFont("Helvetica", 12)
-        c.drawString(x0 + 1.2 * inch, y, branch)
-        y -= 0.22 * inch
-
-    c.setFont("Helvetica-Bold", 12)
-    c.drawString(x0, y, "Unit:")
-    c.setFont("Helvetica", 12)
-    c.drawString(x0 + 1.2 * inch, y, unit)
-    y -= 0.22 * inch
+    write_artifact_pdf(
+        buf,
+        artifact=artifact,
+        lesson_title=lesson_title,
+        standard_tags=standard_tags,
+        signature=signature,
+        body_text=body_text,
+        grade_band=grade_band,
+        subject=subject,
+        branch=branch,
+        unit=unit,
+        emblems=pdf_emblems(subject),
+    )
+    return buf.getvalue()
 
-    if lesson_title:
-        c.setFont("Helvetica-Bold", 12)
-        c.drawString(x0, y, "Lesson/Topic:")
-        c.setFont("Helvetica", 12)
-        c.drawString(x0 + 1.2 * inch, y, lesson_title)
-        y -= 0.22 * inch
 
-    if standard_tags:
-        c.setFont("Helvetica-Bold", 12)
-        c.drawString(x0, y, "Standards:")
-        c.setFont("Helvetica", 12)
-        c.drawString(x0 + 1.2 * inch, y, standard_tags)
-        y -= 0.22 * inch
-
-    # Signature (bridge blue)
-    if signature:
-        c.setFillColorRGB(0.184, 0.357, 0.918)
-        c.setFont("Helvetica-Bold", 11.5)
-        c.drawRightString(w - margin, h - margin + 0.05 * inch, f"✍️ {signature}")
-        c.setFillColorRGB(0, 0, 0)
-
-    # Divider
-    y -= 0.08 * inch
-    c.setLineWidth(1.2)
-    c.line(x0, y, w - margin, y)
-    y -= 0.25 * inch
-
-    # Body
-    c.setFont("Helvetica", 12)
-    lines = wrap_lines(body_text, max_chars=95)
-    line_h = 14.5
-    bottom = margin
-
-    for ln in lines:
-        if y <= bottom + 0.6 * inch:
-            c.showPage()
-            y = h - margin
-
-            if subject == "Science":
-                c.setFont("Helvetica-Bold", 11)
-                c.drawRightString(w - margin, y + 2, f"[{NGSS_EMBLEM}]  [{FIVE_E_EMBLEM}]")
-
-            if signature:
-                c.setFillColorRGB(0.184, 0.357, 0.918)
-                c.setFont("Helvetica-Bold", 11.5)
-                c.drawRightString(w - margin, h - margin + 0.05 * inch, f"✍️ {signature}")
-                c.setFillColorRGB(0, 0, 0)
-
-            c.setFont("Helvetica", 12)
-
-        c.drawString(x0, y, ln)
-        y -= line_h
-
-    # Footer (v2)
-    c.setFont("Helvetica-Oblique", 9.5)
-    c.drawString(x0, margin - 0.25 * inch, "BSChapp v2 • We are L.E.A.D.")
-
-    c.save()
-    return buf.getvalue()
+def pdf_emblems(subject: str) -> str:
+    return f"[{NGSS_EMBLEM}]  [{FIVE_E_EMBLEM}]" if subject == "Science" else ""
 
 
 def build_html(
@@ -621,18 +555,24 @@ button[kind="primary"] {{
 
     today = date.today().isoformat()
 
+    issues = contract_issues(artifact, lesson_title.strip(), standard_tags.strip(), grade_band, unit)
+    if issues:
+        st.warning(f"Outside the {artifact} contract: {format_errors(issues)}")
+
+    render_fields = dict(
+        artifact=artifact,
+        lesson_title=lesson_title.strip(),
+        standard_tags=standard_tags.strip(),
+        signature=signature.strip(),
+        body_text=body,
+        grade_band=grade_band,
+        subject=subject_mode,
+        branch=science_branch,
+        unit=unit,
+    )
+
     if REPORTLAB_OK:
-        pdf_bytes = build_pdf_bytes(
-            artifact=artifact,
-            lesson_title=lesson_title.strip(),
-            standard_tags=standard_tags.strip(),
-            signature=signature.strip(),
-            body_text=body,
-            grade_band=grade_band,
-            subject=subject_mode,
-            branch=science_branch,
-            unit=unit,
-        )
+        pdf_bytes = get_or_render("pdf", render_fields, lambda: build_pdf_bytes(**render_fields), today=today)
         filename = f"{artifact.replace(' ', '_').lower()}_{today}.pdf"
         st.download_button(
             "Download PDF (tap to print)",
@@ -643,16 +583,8 @@ button[kind="primary"] {{
         )
     else:
         st.warning("PDF engine not installed yet. Add `reportlab` to requirements.txt to enable PDF downloads.")
-        html = build_html(
-            artifact=artifact,
-            lesson_title=lesson_title.strip(),
-            standard_tags=standard_tags.strip(),
-            signature=signature.strip(),
-            body_text=body,
-            grade_band=grade_band,
-            subject=subject_mode,
-            branch=science_branch,
-            unit=unit,
+        html = get_or_render(
+            "html", render_fields, lambda: build_html(**render_fields).encode("utf-8"), today=today
         )
         filename = f"{artifact.replace(' ', '_').lower()}_{today}.html"
         st.download_button(
@@ -663,6 +595,56 @@ button[kind="primary"] {{
             use_container_width=True,
         )
         st.info("iPhone: after download → open HTML → Share → Print → pinch-out → Save/Share PDF.")
+        return
+
+    # --- Class set: every chosen document x every student, one file ---
+    with st.expander("Class set (one file for the whole class)"):
+        set_artifacts = st.multiselect("Documents", ARTIFACTS, default=[artifact])
+        roster_text = st.text_area(
+            "Roster — one per line: Name, or Period, Name (blank = one copy of each)",
+            height=160,
+        )
+        set_format = st.radio("Output", ["One merged PDF", "ZIP of PDFs"], horizontal=True)
+
+        if st.button("Build class set", use_container_width=True, disabled=not set_artifacts):
+            header = dict(
+                lesson_title=lesson_title.strip(),
+                standard_tags=standard_tags.strip(),
+                signature=signature.strip(),
+                grade_band=grade_band,
+                subject=subject_mode,
+                branch=science_branch,
+                unit=unit,
+                emblems=pdf_emblems(subject_mode),
+            )
+            docs = [
+                dict(header, artifact=a, body_text=body if a == artifact else DEFAULT_PROMPTS.get(a, ""))
+                for a in set_artifacts
+            ]
+            items = class_set_items(docs, parse_roster(roster_text))
+            buf = io.BytesIO()
+            with st.spinner(f"Rendering {len(items)} document(s)…"):
+                if set_format == "One merged PDF":
+                    pages = write_class_set_pdf(buf, items, today=today)
+                    st.session_state["class_set_file"] = (
+                        f"class_set_{today}.pdf", buf.getvalue(), "application/pdf", f"{pages} pages"
+                    )
+                else:
+                    n = write_class_set_zip(buf, items, today=today)
+                    st.session_state["class_set_file"] = (
+                        f"class_set_{today}.zip", buf.getvalue(), "application/zip", f"{n} PDFs"
+                    )
+
+        ready = st.session_state.get("class_set_file")
+        if ready:
+            fname, data, mime, summary = ready
+            st.download_button(
+                f"Download class set ({summary})",
+                data=data,
+                file_name=fname,
+                mime=mime,
+                use_container_width=True,
+            )
 
 
 if __name__ == "__main__":
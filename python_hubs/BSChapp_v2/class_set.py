@@ -0,0 +1,158 @@
+# python_hubs/BSChapp_v2/class_set.py
+# ============================================================
+# BSChapp v2 — Class set export (one click, one file)
+# - A "class set" = artifacts x students (optionally grouped by period)
+# - Merged PDF: every copy drawn on ONE canvas, so fonts and each distinct
+#   page chrome (form XObject) are embedded once; bookmarks per period/copy
+# - ZIP: one PDF per copy, rendered in parallel worker processes
+# ============================================================
+
+from __future__ import annotations
+
+import io
+import os
+import re
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from reportlab.pdfgen import canvas
+
+from pdf_engine import PAGE_SIZE, Output, define_chrome, draw_artifact, write_artifact_pdf
+
+# fields one copy carries (same names as build_pdf_bytes, plus student/group)
+ITEM_FIELDS = (
+    "artifact",
+    "lesson_title",
+    "standard_tags",
+    "signature",
+    "body_text",
+    "grade_band",
+    "subject",
+    "branch",
+    "unit",
+    "emblems",
+    "student",
+    "group",
+)
+
+
+def parse_roster(text: str) -> List[Tuple[str, str]]:
+    """
+    One student per line: "Name" or "Period 2, Name" (also "|" or tab).
+    Returns [(group, name)]; blank lines skipped.
+    """
+    out = []
+    for line in (text or "").splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        parts = [p.strip() for p in re.split(r"[,|\t]", line, maxsplit=1)]
+        out.append((parts[0], parts[1]) if len(parts) == 2 and parts[1] else ("", parts[0]))
+    return out
+
+
+def class_set_items(artifacts: Iterable[Dict[str, Any]], roster: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
+    """Every artifact for every student (roster order); an empty roster = one copy of each."""
+    people = roster or [("", "")]
+    items = []
+    for group, student in people:
+        for art in artifacts:
+            item = {f: art.get(f, "") for f in ITEM_FIELDS}
+            item.update(student=student, group=group)
+            items.append(item)
+    return items
+
+
+def _copy_title(item: Dict[str, Any]) -> str:
+    return f"{item['student']} — {item['artifact']}" if item["student"] else item["artifact"]
+
+
+def _file_name(item: Dict[str, Any], used: set) -> str:
+    stem = re.sub(r"[^a-z0-9]+", "_", " ".join(
+        p for p in (item["group"], item["student"], item["artifact"]) if p
+    ).lower()).strip("_") or "artifact"
+    name, n = f"{stem}.pdf", 2
+    while name in used:
+        name, n = f"{stem}_{n}.pdf", n + 1
+    used.add(name)
+    return name
+
+
+# -----------------------------
+# Merged PDF
+# -----------------------------
+def write_class_set_pdf(out: Output, items: List[Dict[str, Any]], *, today: str = "") -> int:
+    """All copies in one PDF, each starting on a fresh page. Returns the page count."""
+    c = canvas.Canvas(out, pagesize=PAGE_SIZE)
+    c.setTitle("BSChapp v2 — Class set")
+    chromes: Dict[Tuple[str, str], str] = {}
+    groups_seen = set()
+    for i, item in enumerate(items):
+        key = (item["emblems"], item["signature"])
+        if key not in chromes:
+            chromes[key] = define_chrome(c, f"chrome{len(chromes)}", emblems=key[0], signature=key[1])
+
+        level = 0
+        if item["group"]:
+            if item["group"] not in groups_seen:
+                groups_seen.add(item["group"])
+                c.bookmarkPage(f"g{len(groups_seen)}")
+                c.addOutlineEntry(item["group"], f"g{len(groups_seen)}", level=0)
+            level = 1
+        c.bookmarkPage(f"a{i}")
+        c.addOutlineEntry(_copy_title(item), f"a{i}", level=level)
+
+        draw_artifact(
+            c,
+            artifact=item["artifact"],
+            lesson_title=item["lesson_title"],
+            standard_tags=item["standard_tags"],
+            body_text=item["body_text"],
+            grade_band=item["grade_band"],
+            subject=item["subject"],
+            branch=item["branch"],
+            unit=item["unit"],
+            chrome=chromes[key],
+            today=today,
+            student=item["student"],
+        )
+        c.showPage()
+    c.showOutline()
+    pages = c.getPageNumber() - 1
+    c.save()
+    return pages
+
+
+# -----------------------------
+# ZIP (parallel)
+# -----------------------------
+def render_copy(job: Tuple[Dict[str, Any], str]) -> bytes:
+    # top-level so process pools can pickle it
+    item, today = job
+    buf = io.BytesIO()
+    write_artifact_pdf(
+        buf,
+        today=today,
+        **{f: item[f] for f in ITEM_FIELDS if f != "group"},
+    )
+    return buf.getvalue()
+
+
+def write_class_set_zip(
+    out: Output,
+    items: List[Dict[str, Any]],
+    *,
+    today: str = "",
+    workers: Optional[int] = None,
+    use_processes: bool = True,
+) -> int:
+    """One PDF per copy, rendered across a worker pool and written as results arrive."""
+    used: set = set()
+    names = [_file_name(item, used) for item in items]
+    pool_cls = ProcessPoolExecutor if use_processes and len(items) > 1 else ThreadPoolExecutor
+    chunksize = max(1, len(items) // ((workers or os.cpu_count() or 1) * 4))
+    with pool_cls(max_workers=workers) as pool, zipfile.ZipFile(out, "w", compression=zipfile.ZIP_DEFLATED) as z:
+        for name, pdf in zip(names, pool.map(render_copy, [(item, today) for item in items], chunksize=chunksize)):
+            z.writestr(name, pdf)
+    return len(items)
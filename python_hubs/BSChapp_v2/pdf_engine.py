@@ -0,0 +1,260 @@
+# python_hubs/BSChapp_v2/pdf_engine.py
+# ============================================================
+# BSChapp v2 — PDF layout engine (ReportLab)
+# - Wraps by MEASURED width (pdfmetrics.stringWidth), not character count
+#   -> word widths cached per (font, size), so long packets measure each word once
+# - One text object per paragraph (per page slice) instead of one drawString per line
+# - Page chrome (emblems, signature, footer) built ONCE as a form XObject
+#   and stamped on every page with doForm
+# - Writes straight into a path or binary file object (no extra BytesIO copy)
+# ============================================================
+
+from __future__ import annotations
+
+import math
+from datetime import date
+from typing import IO, Dict, List, Tuple, Union
+
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.units import inch
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.pdfgen import canvas
+
+PAGE_SIZE = letter
+MARGIN = 0.75 * inch
+LABEL_W = 1.2 * inch
+
+TITLE_FONT = ("Helvetica-Bold", 18)
+LABEL_FONT = ("Helvetica-Bold", 12)
+VALUE_FONT = ("Helvetica", 12)
+BODY_FONT = ("Helvetica", 12)
+BODY_LEADING = 14.5
+RAIL_LEADING = 0.22 * inch
+EMBLEM_FONT = ("Helvetica-Bold", 11)
+SIGNATURE_FONT = ("Helvetica-Bold", 11.5)
+SIGNATURE_RGB = (0.184, 0.357, 0.918)  # bridge blue
+FOOTER_FONT = ("Helvetica-Oblique", 9.5)
+FOOTER_TEXT = "BSChapp v2 • We are L.E.A.D."
+
+# body stops this far above the bottom margin (room for the footer)
+BODY_FLOOR = MARGIN + 0.6 * inch
+
+Output = Union[str, IO[bytes]]
+
+
+# -----------------------------
+# Measurement + wrapping
+# -----------------------------
+_WIDTHS: Dict[Tuple[str, float], Dict[str, float]] = {}
+
+
+def text_width(text: str, font: str, size: float) -> float:
+    """stringWidth, memoised per (font, size)."""
+    table = _WIDTHS.setdefault((font, size), {})
+    w = table.get(text)
+    if w is None:
+        w = table[text] = stringWidth(text, font, size)
+    return w
+
+
+def _split_long(word: str, font: str, size: float, max_width: float) -> List[str]:
+    """A single word wider than the line is broken between characters."""
+    parts: List[str] = []
+    cur, cur_w = "", 0.0
+    for ch in word:
+        cw = text_width(ch, font, size)
+        if cur and cur_w + cw > max_width:
+            parts.append(cur)
+            cur, cur_w = "", 0.0
+        cur += ch
+        cur_w += cw
+    if cur:
+        parts.append(cur)
+    return parts
+
+
+def wrap_paragraph(text: str, font: str, size: float, max_width: float) -> List[str]:
+    """Greedy word wrap by measured width. '' -> [''] (a blank line keeps its height)."""
+    if not text.strip():
+        return [""]
+    space = text_width(" ", font, size)
+    lines: List[str] = []
+    cur: List[str] = []
+    cur_w = 0.0
+    for word in text.split(" "):
+        w = text_width(word, font, size)
+        if cur and cur_w + space + w <= max_width:
+            cur.append(word)
+            cur_w += space + w
+            continue
+        if cur:
+            lines.append(" ".join(cur))
+        if w > max_width:
+            *full, last = _split_long(word, font, size, max_width)
+            lines.extend(full)
+            cur, cur_w = [last], text_width(last, font, size)
+        else:
+            cur, cur_w = [word], w
+    lines.append(" ".join(cur))
+    return lines
+
+
+def wrap_text(text: str, font: str, size: float, max_width: float) -> List[List[str]]:
+    """Paragraphs (split on newlines), each as its list of wrapped lines."""
+    return [wrap_paragraph(p, font, size, max_width) for p in (text or "").split("\n")]
+
+
+# -----------------------------
+# Page chrome (form XObject)
+# -----------------------------
+def define_chrome(c: canvas.Canvas, name: str, *, emblems: str = "", signature: str = "", footer: str = FOOTER_TEXT) -> str:
+    """Draws the per-page decorations once into a reusable form; returns its name."""
+    w, h = c._pagesize
+    c.beginForm(name)
+    if emblems:
+        c.setFont(*EMBLEM_FONT)
+        c.drawRightString(w - MARGIN, h - MARGIN + 2, emblems)
+    if signature:
+        c.setFillColorRGB(*SIGNATURE_RGB)
+        c.setFont(*SIGNATURE_FONT)
+        c.drawRightString(w - MARGIN, h - MARGIN + 0.05 * inch, f"✍️ {signature}")
+        c.setFillColorRGB(0, 0, 0)
+    if footer:
+        c.setFont(*FOOTER_FONT)
+        c.drawString(MARGIN, MARGIN - 0.25 * inch, footer)
+    c.endForm()
+    return name
+
+
+# -----------------------------
+# Layout
+# -----------------------------
+class _Cursor:
+    """Current page position; starts a new page (with chrome) when the body runs out."""
+
+    def __init__(self, c: canvas.Canvas, chrome: str):
+        self.c = c
+        self.chrome = chrome
+        self.height = c._pagesize[1]
+        self.y = self.height - MARGIN
+        c.doForm(chrome)
+
+    def new_page(self) -> None:
+        self.c.showPage()
+        self.c.doForm(self.chrome)
+        self.y = self.height - MARGIN
+
+    def lines_left(self, leading: float) -> int:
+        # a line is drawn while y is still above the floor
+        return max(0, math.ceil((self.y - BODY_FLOOR) / leading))
+
+    def draw_lines(self, x: float, lines: List[str], font: Tuple[str, float], leading: float) -> None:
+        """One text object per page slice of the paragraph."""
+        i = 0
+        while i < len(lines):
+            room = self.lines_left(leading)
+            if room == 0:
+                self.new_page()
+                continue
+            chunk = lines[i:i + room]
+            t = self.c.beginText(x, self.y)
+            t.setFont(font[0], font[1], leading)
+            for ln in chunk:
+                t.textLine(ln)
+            self.c.drawText(t)
+            self.y -= leading * len(chunk)
+            i += len(chunk)
+
+
+def draw_artifact(
+    c: canvas.Canvas,
+    *,
+    artifact: str,
+    lesson_title: str,
+    standard_tags: str,
+    body_text: str,
+    grade_band: str,
+    subject: str,
+    branch: str,
+    unit: str,
+    chrome: str,
+    today: str = "",
+    student: str = "",
+) -> None:
+    """Lays one artifact out from the top of the current (fresh) page."""
+    w, _ = c._pagesize
+    x0 = MARGIN
+    cur = _Cursor(c, chrome)
+
+    c.setFont(*TITLE_FONT)
+    c.drawString(x0, cur.y, artifact)
+    cur.y -= 0.32 * inch
+
+    c.setFont(*VALUE_FONT)
+    c.drawString(x0, cur.y, f"Date: {today or date.today().isoformat()}")
+    cur.y -= RAIL_LEADING
+
+    rails = [("Student:", student)] if student else []
+    rails += [("Grade Band:", grade_band), ("Subject:", subject)]
+    if subject == "Science" and branch:
+        rails.append(("Branch:", branch))
+    rails.append(("Unit:", unit))
+    if lesson_title:
+        rails.append(("Lesson/Topic:", lesson_title))
+    if standard_tags:
+        rails.append(("Standards:", standard_tags))
+
+    value_w = w - MARGIN - (x0 + LABEL_W)
+    for label, value in rails:
+        c.setFont(*LABEL_FONT)
+        c.drawString(x0, cur.y, label)
+        cur.draw_lines(x0 + LABEL_W, wrap_paragraph(value or "", *VALUE_FONT, value_w), VALUE_FONT, RAIL_LEADING)
+
+    # Divider
+    cur.y -= 0.08 * inch
+    c.setLineWidth(1.2)
+    c.line(x0, cur.y, w - MARGIN, cur.y)
+    cur.y -= 0.25 * inch
+
+    body_w = w - 2 * MARGIN
+    for para in wrap_text(body_text, *BODY_FONT, body_w):
+        cur.draw_lines(x0, para, BODY_FONT, BODY_LEADING)
+
+
+def write_artifact_pdf(
+    out: Output,
+    *,
+    artifact: str,
+    lesson_title: str,
+    standard_tags: str,
+    signature: str,
+    body_text: str,
+    grade_band: str,
+    subject: str,
+    branch: str,
+    unit: str,
+    emblems: str = "",
+    today: str = "",
+    student: str = "",
+) -> int:
+    """Renders one artifact into `out` (path or binary file). Returns the page count."""
+    c = canvas.Canvas(out, pagesize=PAGE_SIZE)
+    c.setTitle(f"{artifact} — {lesson_title}" if lesson_title else artifact)
+    chrome = define_chrome(c, "chrome", emblems=emblems, signature=signature)
+    draw_artifact(
+        c,
+        artifact=artifact,
+        lesson_title=lesson_title,
+        standard_tags=standard_tags,
+        body_text=body_text,
+        grade_band=grade_band,
+        subject=subject,
+        branch=branch,
+        unit=unit,
+        chrome=chrome,
+        today=today,
+        student=student,
+    )
+    pages = c.getPageNumber()
+    c.save()
+    return pages
@@ -0,0 +1,172 @@
+# python_hubs/BSChapp_v2/render_cache.py
+# ============================================================
+# BSChapp v2 — Content-addressed render cache (PDF / HTML bytes)
+# - Key = sha256 of (kind, every input field, date, renderer version)
+#   -> same inputs on a Streamlit rerun never touch ReportLab again
+# - In-memory LRU (bounded by total bytes) in this module, so it survives reruns
+# - Optional on-disk store (BSCHAPP_RENDER_CACHE=<folder>), size-bounded:
+#   least recently used files are evicted first
+# ============================================================
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from datetime import date
+from typing import Any, Callable, Dict, Mapping, Optional
+
+# bump when pdf_engine.py / build_html change the output for the same inputs
+RENDERER_VERSION = "v2.1"
+
+MEMORY_MAX_BYTES = 64 * 1024 * 1024
+DISK_DIR = os.environ.get("BSCHAPP_RENDER_CACHE", "")
+DISK_MAX_BYTES = 512 * 1024 * 1024
+
+_LOCK = threading.Lock()
+_MEMORY: "OrderedDict[str, bytes]" = OrderedDict()
+_STATE = {"memory_bytes": 0, "disk_bytes": None, "hits": 0, "disk_hits": 0, "misses": 0}
+
+
+def render_key(kind: str, fields: Mapping[str, Any], today: Optional[str] = None) -> str:
+    payload = json.dumps(
+        [kind, RENDERER_VERSION, today or date.today().isoformat(), sorted(fields.items())],
+        ensure_ascii=False,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# -----------------------------
+# Memory (LRU)
+# -----------------------------
+def _memory_get(key: str) -> Optional[bytes]:
+    data = _MEMORY.get(key)
+    if data is not None:
+        _MEMORY.move_to_end(key)
+    return data
+
+
+def _memory_put(key: str, data: bytes) -> None:
+    if len(data) > MEMORY_MAX_BYTES:
+        return
+    old = _MEMORY.pop(key, None)
+    if old is not None:
+        _STATE["memory_bytes"] -= len(old)
+    _MEMORY[key] = data
+    _STATE["memory_bytes"] += len(data)
+    while _STATE["memory_bytes"] > MEMORY_MAX_BYTES:
+        _, evicted = _MEMORY.popitem(last=False)
+        _STATE["memory_bytes"] -= len(evicted)
+
+
+# -----------------------------
+# Disk (optional)
+# -----------------------------
+def _disk_path(key: str) -> str:
+    return os.path.join(DISK_DIR, key[:2], key)
+
+
+def _disk_entries():
+    for root, _, files in os.walk(DISK_DIR):
+        for name in files:
+            if len(name) == 64:
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                yield path, st.st_size, st.st_mtime_ns
+
+
+def _disk_get(key: str) -> Optional[bytes]:
+    if not DISK_DIR:
+        return None
+    path = _disk_path(key)
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+        os.utime(path)  # mtime doubles as "last used" for eviction
+    except OSError:
+        return None
+    return data
+
+
+def _disk_evict() -> None:
+    entries = sorted(_disk_entries(), key=lambda e: e[2])
+    total = sum(size for _, size, _ in entries)
+    for path, size, _ in entries:
+        if total <= DISK_MAX_BYTES:
+            break
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            pass
+    _STATE["disk_bytes"] = total
+
+
+def _disk_put(key: str, data: bytes) -> None:
+    if not DISK_DIR or len(data) > DISK_MAX_BYTES:
+        return
+    path = _disk_path(key)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)  # readers never see a half-written file
+    except OSError:
+        return
+    if _STATE["disk_bytes"] is None:
+        _disk_evict()  # first write this process: learn the current size
+    else:
+        _STATE["disk_bytes"] += len(data)
+        if _STATE["disk_bytes"] > DISK_MAX_BYTES:
+            _disk_evict()
+
+
+# -----------------------------
+# Public API
+# -----------------------------
+def get_or_render(kind: str, fields: Mapping[str, Any], render: Callable[[], bytes], today: Optional[str] = None) -> bytes:
+    """Cached bytes for these inputs; `render()` only runs on a miss (memory, then disk)."""
+    key = render_key(kind, fields, today)
+    with _LOCK:
+        data = _memory_get(key)
+        if data is not None:
+            _STATE["hits"] += 1
+            return data
+        data = _disk_get(key)
+        if data is not None:
+            _STATE["disk_hits"] += 1
+            _memory_put(key, data)
+            return data
+        _STATE["misses"] += 1
+    data = render()
+    with _LOCK:
+        _memory_put(key, data)
+        _disk_put(key, data)
+    return data
+
+
+def cache_stats() -> Dict[str, Any]:
+    with _LOCK:
+        return {
+            "entries": len(_MEMORY),
+            "memory_bytes": _STATE["memory_bytes"],
+            "hits": _STATE["hits"],
+            "disk_hits": _STATE["disk_hits"],
+            "misses": _STATE["misses"],
+            "disk_dir": DISK_DIR or None,
+        }
+
+
+def clear_memory() -> None:
+    with _LOCK:
+        _MEMORY.clear()
+        _STATE["memory_bytes"] = 0
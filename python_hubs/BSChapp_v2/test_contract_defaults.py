@@ -0,0 +1,19 @@
+# python_hubs/BSChapp_v2/test_contract_defaults.py
+# The untouched page (only a subject picked) stays inside every artifact's contract.
+
+from pathlib import Path
+
+from streamlit.testing.v1 import AppTest
+
+APP = str(Path(__file__).resolve().parent / "BSChapp_v2.py")
+
+
+def test_default_inputs_have_no_contract_issues():
+    at = AppTest.from_file(APP, default_timeout=30).run()
+    at.selectbox(key="subject_mode").set_value("Science").run()
+    artifacts = at.selectbox[-1]
+    assert artifacts.label == "Choose a document"
+    for artifact in artifacts.options:
+        at.selectbox[-1].set_value(artifact).run()
+        assert not at.exception
+        assert not [w.value for w in at.warning if "contract" in w.value], artifact
@@ -1,14 +1,20 @@
+# python_hubs/Dev_Forge/pages/BlockForge/BlockForge.py
+# BlockForge — Streamlit Code Block Inserter (Core App)
+# Minimal deps. JSON-backed block library. Puzzle-like sequencing. Prompt builder.
+
 from __future__ import annotations
 
 import json
+import sys
 from dataclasses import dataclass
+from functools import partial
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
 import streamlit as st
 
 # ─────────────────────────────────────────────────────────────
-# PATHWAYS (repo-aware)
+# Paths
 # ─────────────────────────────────────────────────────────────
 
 HERE = Path(__file__).resolve().parent               # .../pages/BlockForge
@@ -16,9 +22,15 @@ PAGES_DIR = HERE.parent                              # .../pages
 BRANCH_DIR = PAGES_DIR / "BlockForge_Branches"       # .../pages/BlockForge_Branches
 
 DATA_DIR = HERE / "data"
+COMP_DIR = HERE / "components"
+
 BLOCKS_JSON = DATA_DIR / "blocks.json"
 PROMPT_TEMPLATE = DATA_DIR / "prompt_template.txt"
 
+# Highlighted code cards (PNG / SVG) come from Code_Library's renderer
+sys.path.insert(0, str(HERE.parent / "code_library"))
+from block_render import block_to_image, block_to_svg  # noqa: E402
+
 
 def find_repo_root(start: Path) -> Path:
     """
@@ -48,44 +60,6 @@ PATHWAYS = {
     "BLOCKFORGE_DIR": HERE,
     "BRANCH_DIR": BRANCH_DIR,
 }
-st.set_page_config(page_title="BlockForge", page_icon="🧱", layout="wide")
-
-
-@dataclass(frozen=True)
-class Block:
-    id: str
-    title: str
-    category: str
-    tags: List[str]
-    description: str
-    code: str
-## 2) The app (`python_hubs/Dev_Forge/pages/BlockForge/BlockForge.py`)
-
-```python
-# python_hubs/Dev_Forge/pages/BlockForge/BlockForge.py
-# BlockForge — Streamlit Code Block Inserter (Core App)
-# Minimal deps. JSON-backed block library. Puzzle-like sequencing. Prompt builder.
-
-from __future__ import annotations
-
-import json
-import textwrap
-from dataclasses import dataclass
-from pathlib import Path
-from typing import Dict, List, Optional, Tuple
-
-import streamlit as st
-
-# ─────────────────────────────────────────────────────────────
-# Paths
-# ─────────────────────────────────────────────────────────────
-
-HERE = Path(__file__).resolve().parent
-DATA_DIR = HERE / "data"
-COMP_DIR = HERE / "components"
-
-BLOCKS_JSON = DATA_DIR / "blocks.json"
-PROMPT_TEMPLATE = DATA_DIR / "prompt_template.txt"
 
 # ─────────────────────────────────────────────────────────────
 # Page config
@@ -452,7 +426,7 @@ with col_right:
 
     with tabs[2]:
         st.markdown("**Quick exports**")
-        md = f"# BlockForge Sequence\n\n## Blocks\n" + "\n".join([f"- `{bid}`" for bid in st.session_state.bf_sequence]) + "\n\n## Code\n```python\n" + assembled.rstrip() + "\n```\n"
+        md = "# BlockForge Sequence\n\n## Blocks\n" + "\n".join([f"- `{bid}`" for bid in st.session_state.bf_sequence]) + "\n\n## Code\n```python\n" + assembled.rstrip() + "\n```\n"
         st.download_button(
             "⬇️ Download README.md",
             data=md.encode("utf-8"),
@@ -462,6 +436,27 @@ with col_right:
             disabled=not st.session_state.bf_sequence,
         )
 
+        # Highlighted card of the assembled code (drawn on click only)
+        card_args = dict(title="BlockForge Sequence", role_color="#A855F7", code_format="python")
+        st.download_button(
+            "🖼️ Download card (PNG)",
+            data=partial(block_to_image, assembled, fmt="PNG", **card_args),
+            file_name="blockforge_card.png",
+            mime="image/png",
+            use_container_width=True,
+            disabled=not assembled.strip(),
+            on_click="ignore",
+        )
+        st.download_button(
+            "✒️ Download card (SVG)",
+            data=partial(block_to_svg, assembled, **card_args),
+            file_name="blockforge_card.svg",
+            mime="image/svg+xml",
+            use_container_width=True,
+            disabled=not assembled.strip(),
+            on_click="ignore",
+        )
+
         # Optional: export current sequence as a preset json (not writing to blocks.json)
         preset = {
             "name": "MyPreset",
@@ -31,8 +31,18 @@ with st.expander("Session State Pattern"):
 
 
 from pathlib import Path
-import json, io, zipfile, textwrap, datetime
-from PIL import Image, ImageDraw, ImageFont
+from functools import partial
+import datetime, sys
+
+# Image export lives in code_library/ (imported module => render cache survives reruns)
+sys.path.insert(0, str(Path(__file__).resolve().with_name("code_library")))
+from block_render import cache_stats, export_image, export_name, now_utc_date, prerender  # noqa: E402
+from block_store import get_store  # noqa: E402
+from block_archive import archive_bytes, download_name  # noqa: E402
+
+# Syntax highlighting (token cache by content hash) lives in render_kit/
+sys.path.insert(0, str(Path(__file__).resolve().with_name("render_kit")))
+from highlight import highlight_html  # noqa: E402
 
 # =====================
 # CONFIG
@@ -92,9 +102,6 @@ ROLE_META = {
 
 CODE_FORMATS = ["python", "html", "css", "javascript", "json", "markdown", "text"]
 
-def now_utc_date():
-    return datetime.datetime.utcnow().strftime("%Y-%m-%d")
-
 # =====================
 # SESSION STATE
 # =====================
@@ -165,141 +172,18 @@ html,body,[data-testid="stAppViewContainer"]{
     unsafe_allow_html=True,
 )
 
-# =====================
-# IMAGE EXPORT (WITH BANNER + META BOX)
-# =====================
-
-def _safe_font(mono=True, size=20):
-    # Prefer a mono font for code rendering
-    try:
-        if mono:
-            return ImageFont.truetype("DejaVuSansMono.ttf", size)
-        return ImageFont.truetype("DejaVuSans.ttf", size)
-    except Exception:
-        return ImageFont.load_default()
-
-def block_to_image(
-    code: str,
-    *,
-    title: str = "DevForge Block",
-    role_color: str = "#E5E7EB",
-    code_format: str = "text",
-    date_str: str = "",
-    fmt: str = "JPEG",
-    bg: str = "#FFFFFF",
-    fg: str = "#111827",
-):
-    """
-    Produces a bannered image:
-    - Top banner: title (left) + meta box (right: date + format)
-    - Colored role stripe under banner
-    - Code body
-    """
-    padding = 28
-    font_size = 20
-    wrap = 92
-
-    if not date_str:
-        date_str = now_utc_date()
-
-    # Wrap code
-    lines = []
-    for l in code.splitlines():
-        lines += textwrap.wrap(l, wrap) or [""]
-
-    mono = _safe_font(mono=True, size=font_size)
-    ui = _safe_font(mono=False, size=18)
-    ui_bold = _safe_font(mono=False, size=22)
-
-    # Measure line height
-    dummy = Image.new("RGB", (1, 1))
-    d = ImageDraw.Draw(dummy)
-    lh = d.textbbox((0, 0), "Ag", font=mono)[3] + 7
-
-    # Measure code width
-    code_w = 0
-    for l in lines:
-        code_w = max(code_w, d.textbbox((0, 0), l, font=mono)[2])
-
-    # Banner sizing
-    banner_h = 88
-    stripe_h = 10
-    meta_w = 240
-
-    # Total image size
-    w = max(code_w + padding * 2, 920)
-    w = w + meta_w  # space for meta box on right without squeezing title
-    h = banner_h + stripe_h + (lh * max(1, len(lines))) + padding * 2 + 10
-
-    img = Image.new("RGB", (w, h), bg)
-    draw = ImageDraw.Draw(img)
-
-    # Banner background
-    banner_bg = "#F8FAFC"
-    banner_border = "#D1D5DB"
-    draw.rounded_rectangle((14, 14, w - 14, 14 + banner_h), radius=18, fill=banner_bg, outline=banner_border, width=2)
-
-    # Title text (left)
-    title_x = 34
-    title_y = 24
-    draw.text((title_x, title_y), title, font=ui_bold, fill="#111827")
-    draw.text((title_x, title_y + 34), "DevForge • Bannered Export", font=ui, fill="#6B7280")
-
-    # Meta box (right)
-    box_x2 = w - 34
-    box_x1 = box_x2 - meta_w
-    box_y1 = 26
-    box_y2 = 14 + banner_h - 12
-    draw.rounded_rectangle((box_x1, box_y1, box_x2, box_y2), radius=16, fill="#FFFFFF", outline=banner_border, width=2)
-
-    # Meta contents
-    draw.text((box_x1 + 16, box_y1 + 10), f"DATE: {date_str}", font=ui, fill="#111827")
-    draw.text((box_x1 + 16, box_y1 + 34), f"FORMAT: {code_format.lower()}", font=ui, fill="#111827")
-    draw.text((box_x1 + 16, box_y1 + 58), f"EXPORT: {fmt.upper()}", font=ui, fill="#6B7280")
-
-    # Role stripe
-    stripe_y1 = 14 + banner_h + 8
-    draw.rounded_rectangle((14, stripe_y1, w - 14, stripe_y1 + stripe_h), radius=10, fill=role_color, outline=None)
-
-    # Code area background
-    code_top = stripe_y1 + stripe_h + 16
-    code_left = 14
-    code_right = w - 14
-    code_bottom = h - 14
-    draw.rounded_rectangle((code_left, code_top, code_right, code_bottom), radius=18, fill="#FFFFFF", outline=banner_border, width=2)
-
-    # Code text
-    y = code_top + 18
-    x = code_left + 22
-    for l in lines:
-        draw.text((x, y), l, font=mono, fill=fg)
-        y += lh
-
-    buf = io.BytesIO()
-    img.save(buf, format=fmt, quality=95)
-    return buf.getvalue()
-
 # =====================
 # DATA
 # =====================
 
-def load_blocks():
-    blocks = []
-    for p in BLOCKS_DIR.glob("*.json"):
-        try:
-            blocks.append(json.loads(p.read_text(encoding="utf-8")))
-        except Exception:
-            # Skip malformed files safely
-            continue
-    return sorted(blocks, key=lambda x: x.get("created", ""), reverse=True)
+# SQLite + FTS5 store (blocks/blocks.sqlite); existing blocks/*.json are imported once
+STORE = get_store(BLOCKS_DIR)
 
 def save_block(data):
-    (BLOCKS_DIR / f"{data['id']}.json").write_text(json.dumps(data, indent=2), encoding="utf-8")
+    STORE.save(data)
 
 def delete_block(block_id):
-    p = BLOCKS_DIR / f"{block_id}.json"
-    if p.exists():
-        p.unlink()
+    STORE.delete(block_id)
 
 def slugify(s: str) -> str:
     s = (s or "").strip().lower()
@@ -356,7 +240,14 @@ with st.sidebar:
     st.header("Filters")
     role_filter = st.selectbox("Role", ["All"] + list(ROLE_META.keys()), index=0)
     fmt_filter = st.selectbox("Code format", ["All"] + CODE_FORMATS, index=0)
-    query = st.text_input("Search title/tags")
+    tag_filter = st.multiselect("Tags", STORE.all_tags())
+    query = st.text_input("Search title/tags/code")
+
+    st.header("Image export")
+    prerender_images = st.toggle(
+        "Pre-render images",
+        help="Draw JPEG/PNG cards for the listed blocks in the background, so downloads start instantly.",
+    )
 
 # =====================
 # CREATE BLOCK
@@ -408,31 +299,31 @@ with st.expander("➕ Create New Block", expanded=False):
 # BLOCK LIST
 # =====================
 
-blocks = load_blocks()
-
-def _matches(b):
-    # role filter
-    if role_filter != "All" and b.get("role_name") != role_filter:
-        return False
-    # format filter
-    if fmt_filter != "All" and (b.get("code_format") or "").lower() != fmt_filter:
-        return False
-    # query filter
-    q = (query or "").strip().lower()
-    if q:
-        hay = " ".join([
-            (b.get("title") or ""),
-            " ".join(b.get("tags") or []),
-            (b.get("role_name") or ""),
-            (b.get("code_format") or ""),
-        ]).lower()
-        if q not in hay:
-            return False
-    return True
-
-filtered = [b for b in blocks if _matches(b)]
-
-st.subheader(f"Library ({len(filtered)} shown / {len(blocks)} total)")
+filters = {
+    "role_name": None if role_filter == "All" else role_filter,
+    "code_format": None if fmt_filter == "All" else fmt_filter,
+    "tags": tag_filter,
+}
+# Best match first while searching, newest first otherwise
+filtered = STORE.search(query, **filters)
+total = STORE.count()
+
+st.subheader(f"Library ({len(filtered)} shown / {total} total)")
+
+# Facet counts for the current result set
+facets = STORE.facets(query, **filters)
+with st.sidebar:
+    if facets["role"]:
+        st.caption("Roles: " + " • ".join(f"{ROLE_META.get(r, {}).get('label', r or '—')} ({n})" for r, n in facets["role"].items()))
+    if facets["tag"]:
+        st.caption("Tags: " + " • ".join(f"{t} ({n})" for t, n in list(facets["tag"].items())[:15]))
+
+# Images are drawn on click (or in the background when pre-render is on), never per rerun
+today = now_utc_date()
+if prerender_images:
+    prerender(filtered, date_str=today)
+    stats = cache_stats()
+    st.sidebar.caption(f"{stats['entries']} image(s) ready • {stats['pending']} rendering")
 
 # One optional system rule: only one red block per tool view
 # (Not enforced here — this is a library; you enforce it when assembling tools.)
@@ -462,37 +353,33 @@ for b in filtered:
             unsafe_allow_html=True,
         )
 
-        st.markdown(f"<div class='code'>{(b.get('code') or '').replace('<','&lt;').replace('>','&gt;')}</div>", unsafe_allow_html=True)
+        st.markdown(f"<div class='code'>{highlight_html(b.get('code') or '', code_format)}</div>", unsafe_allow_html=True)
 
-        c1, c2, c3, c4, c5 = st.columns([0.18, 0.18, 0.22, 0.22, 0.20])
+        c1, c2, c6, c3, c4, c5 = st.columns([0.15, 0.15, 0.15, 0.19, 0.19, 0.17])
 
         with c1:
             st.download_button(
                 "📸 JPEG",
-                block_to_image(
-                    b.get("code", ""),
-                    title=b.get("title", "DevForge Block"),
-                    role_color=role_hex,
-                    code_format=code_format,
-                    date_str=now_utc_date(),
-                    fmt="JPEG",
-                ),
-                f"{b.get('id','block')}.jpg",
-                "image/jpeg",
+                partial(export_image, b, "JPEG", today),
+                *export_name(b, "JPEG"),
+                key=f"jpg_{b.get('id','block')}",
+                on_click="ignore",
             )
         with c2:
             st.download_button(
                 "🖼️ PNG",
-                block_to_image(
-                    b.get("code", ""),
-                    title=b.get("title", "DevForge Block"),
-                    role_color=role_hex,
-                    code_format=code_format,
-                    date_str=now_utc_date(),
-                    fmt="PNG",
-                ),
-                f"{b.get('id','block')}.png",
-                "image/png",
+                partial(export_image, b, "PNG", today),
+                *export_name(b, "PNG"),
+                key=f"png_{b.get('id','block')}",
+                on_click="ignore",
+            )
+        with c6:
+            st.download_button(
+                "✒️ SVG",
+                partial(export_image, b, "SVG", today),
+                *export_name(b, "SVG"),
+                key=f"svg_{b.get('id','block')}",
+                on_click="ignore",
             )
         with c3:
             md = f"```{code_format}\n{b.get('code','')}\n```"
@@ -525,15 +412,15 @@ for b in filtered:
 
 st.markdown("<div class='hr'></div>", unsafe_allow_html=True)
 
-if blocks:
-    buf = io.BytesIO()
-    with zipfile.ZipFile(buf, "w") as z:
-        for b in blocks:
-            fmt = (b.get("code_format") or "text").lower()
-            ext = "txt" if fmt == "text" else fmt
-            z.writestr(f"{b.get('id','block')}.{ext}", b.get("code", ""))
-            # Also include a markdown wrapper for easy paste into docs
-            z.writestr(f"{b.get('id','block')}.md", f"```{fmt}\n{b.get('code','')}\n```")
-    st.download_button("📦 Export all blocks (ZIP)", buf.getvalue(), "devforge_blocks.zip")
+if total:
+    # Built on click (and cached on disk until the next save/delete), not on every render
+    with_cards = st.checkbox("Include PNG cards", help="Adds cards/<id>.png for every block (slower on first build).")
+    st.download_button(
+        "📦 Export all blocks (ZIP)",
+        partial(archive_bytes, STORE, EXPORT_DIR, with_png=with_cards, date_str=today),
+        download_name(with_cards),
+        "application/zip",
+        on_click="ignore",
+    )
 else:
-    st.info("No blocks yet. Create your first block above.")
\ No newline at end of file
+    st.info("No blocks yet. Create your first block above.")
@@ -2,13 +2,17 @@
 from __future__ import annotations
 
 import io
-import textwrap
+import sys
 from datetime import date
 from pathlib import Path
 from typing import Dict, Tuple, List
 
 import streamlit as st
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw
+
+# Fonts / wrapping shared with Code_Library (render_kit/; module caches survive reruns)
+sys.path.insert(0, str(Path(__file__).resolve().with_name("render_kit")))
+from text_render import draw_rows, get_font, wrap_line  # noqa: E402
 
 
 # ============================================================
@@ -139,21 +143,6 @@ lesson = st.session_state["piluso_lesson"]
 # ============================================================
 # IMAGE EXPORT HELPERS
 # ============================================================
-def _load_font(size: int, bold: bool = False):
-    candidates = []
-    if bold:
-        candidates = ["DejaVuSans-Bold.ttf", "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf"]
-    else:
-        candidates = ["DejaVuSans.ttf", "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"]
-
-    for path in candidates:
-        try:
-            return ImageFont.truetype(path, size)
-        except Exception:
-            continue
-    return ImageFont.load_default()
-
-
 def safe_val(x: str) -> str:
     x = (x or "").strip()
     return x if x else "N/a"
@@ -173,19 +162,18 @@ def generate_sci_block_jpeg(
     pad_y = 48
     header_h = 120
 
-    font_body = _load_font(34, bold=False)
-    font_bold = _load_font(36, bold=True)
-    font_header = _load_font(44, bold=True)
+    font_body = ("sans", 34)
+    font_bold = ("sans-bold", 36)
+    font_header = get_font("sans-bold", 44)
 
     wrap_width_chars = 52
-    wrapper = textwrap.TextWrapper(width=wrap_width_chars, break_long_words=False, replace_whitespace=False)
 
     wrapped: list[tuple[str, bool]] = []
     for txt, is_bold in lines:
         if txt.strip() == "":
             wrapped.append(("", is_bold))
             continue
-        for wline in wrapper.wrap(txt):
+        for wline in wrap_line(txt, wrap_width_chars, break_long_words=False, replace_whitespace=False):
             wrapped.append((wline, is_bold))
 
     line_h = 46
@@ -198,11 +186,8 @@ def generate_sci_block_jpeg(
     draw.rectangle([0, 0, width, header_h], fill=header_bg)
     draw.text((pad_x, 30), title, fill=header_text, font=font_header)
 
-    y = header_h + pad_y
-    for txt, is_bold in wrapped:
-        font = font_bold if is_bold else font_body
-        draw.text((pad_x, y), txt, fill=body_text, font=font)
-        y += line_h
+    rows = [(txt, font_bold if is_bold else font_body, body_text) for txt, is_bold in wrapped]
+    draw_rows(draw, pad_x, header_h + pad_y, rows, line_h)
 
     buf = io.BytesIO()
     img.save(buf, format="JPEG", quality=95)
@@ -0,0 +1,131 @@
+# python_hubs/Dev_Forge/pages/code_library/block_archive.py
+# ============================================================
+# DevForge Blocks — "Export all blocks (ZIP)"
+# - Built only when someone clicks download (deferred download_button data)
+# - Built straight into exports/ block by block (deflated), never assembled
+#   in a BytesIO -> building stays flat in memory however big the library is.
+#   Serving is not: Streamlit takes the finished file as one bytes object.
+# - Cached on disk under the store's version stamp: unchanged library =
+#   the same file is handed out again; any save/delete = new version.
+#   Blocks + version come from one store snapshot, so a save mid-build
+#   can't end up in an archive named for the older version.
+# - Only the current archives are kept (older versions, older card dates pruned)
+# - Optional PNG cards, drawn in small batches on a thread pool (reuses the
+#   block_render cache, so pre-rendered cards cost nothing)
+# ============================================================
+
+from __future__ import annotations
+
+import os
+import re
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List
+
+from block_render import PRERENDER_WORKERS, export_image, now_utc_date
+from block_store import BlockStore
+
+ARCHIVE_STEM = "devforge_blocks"
+# cards per pool batch: bounds how many PNGs are held in memory at once
+PNG_BATCH = PRERENDER_WORKERS * 4
+
+_ARCHIVE_RE = re.compile(rf"^{ARCHIVE_STEM}_v(\d+)(?:_cards_([\d-]+))?\.zip$")
+
+_LOCKS: Dict[str, threading.Lock] = {}
+_LOCKS_GUARD = threading.Lock()
+
+
+def _lock_for(path: Path) -> threading.Lock:
+    with _LOCKS_GUARD:
+        return _LOCKS.setdefault(str(path), threading.Lock())
+
+
+def code_ext(code_format: str) -> str:
+    fmt = (code_format or "text").lower()
+    return "txt" if fmt == "text" else fmt
+
+
+def archive_path(export_dir: str | Path, version: int, with_png: bool = False, date_str: str = "") -> Path:
+    # cards carry the export date in their banner, so they are dated too
+    suffix = f"_cards_{date_str or now_utc_date()}" if with_png else ""
+    return Path(export_dir) / f"{ARCHIVE_STEM}_v{version}{suffix}.zip"
+
+
+def download_name(with_png: bool = False) -> str:
+    return f"{ARCHIVE_STEM}_cards.zip" if with_png else f"{ARCHIVE_STEM}.zip"
+
+
+def _write_cards(z: zipfile.ZipFile, pool: ThreadPoolExecutor, batch: List[Dict[str, Any]], date_str: str) -> None:
+    pngs = pool.map(lambda b: export_image(b, "PNG", date_str), batch)
+    for b, png in zip(batch, pngs):
+        # PNG is already compressed
+        z.writestr(f"cards/{b.get('id', 'block')}.png", png, compress_type=zipfile.ZIP_STORED)
+
+
+def _prune(export_dir: Path, keep: Path, version: int, date_str: str) -> None:
+    """Removes archives of older library versions and card archives dated other than date_str."""
+    for p in export_dir.glob(f"{ARCHIVE_STEM}_v*.zip"):
+        m = _ARCHIVE_RE.match(p.name)
+        if not m or p.name == keep.name:
+            continue
+        if int(m.group(1)) < version or (m.group(2) and m.group(2) != date_str):
+            try:
+                p.unlink()
+            except OSError:
+                pass
+
+
+def _write_archive(dest: Path, blocks: Iterable[Dict[str, Any]], with_png: bool, date_str: str) -> None:
+    pool = ThreadPoolExecutor(max_workers=PRERENDER_WORKERS, thread_name_prefix="block_archive") if with_png else None
+    try:
+        with zipfile.ZipFile(dest, "w", compression=zipfile.ZIP_DEFLATED) as z:
+            batch: List[Dict[str, Any]] = []
+            for b in blocks:
+                block_id = b.get("id", "block")
+                fmt = (b.get("code_format") or "text").lower()
+                z.writestr(f"{block_id}.{code_ext(fmt)}", b.get("code", ""))
+                # Also include a markdown wrapper for easy paste into docs
+                z.writestr(f"{block_id}.md", f"```{fmt}\n{b.get('code', '')}\n```")
+                if pool is not None:
+                    batch.append(b)
+                    if len(batch) >= PNG_BATCH:
+                        _write_cards(z, pool, batch, date_str)
+                        batch = []
+            if pool is not None and batch:
+                _write_cards(z, pool, batch, date_str)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+
+def build_archive(store: BlockStore, export_dir: str | Path, *, with_png: bool = False, date_str: str = "") -> Path:
+    """
+    Path of the ZIP for the store's current version (built on first request).
+    Per block: <id>.<ext> raw code + <id>.md fenced copy; with_png adds cards/<id>.png.
+    """
+    export_dir = Path(export_dir)
+    export_dir.mkdir(parents=True, exist_ok=True)
+    date_str = date_str or now_utc_date()
+
+    with store.snapshot() as (version, blocks):
+        path = archive_path(export_dir, version, with_png, date_str)
+        with _lock_for(path):
+            if path.exists():
+                return path
+            tmp = path.with_name(path.name + ".tmp")
+            try:
+                _write_archive(tmp, blocks, with_png, date_str)
+            except BaseException:
+                tmp.unlink(missing_ok=True)
+                raise
+            os.replace(tmp, path)
+
+    _prune(export_dir, path, version, date_str)
+    return path
+
+
+def archive_bytes(store: BlockStore, export_dir: str | Path, *, with_png: bool = False, date_str: str = "") -> bytes:
+    """download_button data callable: only runs on click (the finished ZIP is read into memory for Streamlit)."""
+    return build_archive(store, export_dir, with_png=with_png, date_str=date_str).read_bytes()
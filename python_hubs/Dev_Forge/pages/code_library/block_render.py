@@ -0,0 +1,327 @@
+# python_hubs/Dev_Forge/pages/code_library/block_render.py
+# ============================================================
+# DevForge Blocks — Bannered card export (JPEG / PNG / SVG)
+# - block_to_image() moved here from Code_Library.py; code is syntax
+#   highlighted (render_kit/highlight.py, token cache by content hash)
+# - block_to_svg(): same card as a small vector file
+# - export_image(): bytes cached by (block id, code hash, role colour,
+#   format, date, renderer version) -> a block is drawn at most once per format
+# - Code_Library hands download buttons a callable, so nothing is drawn
+#   until someone actually clicks
+# - prerender(): optional background warm-up on a small thread pool
+# Lives in code_library/ (not pages/) so Streamlit doesn't list it as a page
+# and the cache survives reruns of the page script.
+# ============================================================
+
+from __future__ import annotations
+
+import datetime
+import hashlib
+import io
+import json
+import math
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from PIL import Image, ImageDraw
+
+# Fonts / metrics / wrapping shared with Ms_Piluso_Science (render_kit/)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "render_kit"))
+from highlight import THEME, draw_runs, highlight_rows, runs_to_svg_text, xml_escape  # noqa: E402
+from text_render import draw_rows, get_font, line_height, max_width, mono_advance, wrap_text  # noqa: E402
+
+# bump when block_to_image() output changes for the same inputs
+RENDERER_VERSION = "6"
+
+CACHE_MAX_BYTES = 48 * 1024 * 1024
+PRERENDER_WORKERS = 2
+
+EXPORT_FORMATS = {
+    "JPEG": ("jpg", "image/jpeg"),
+    "PNG": ("png", "image/png"),
+    "SVG": ("svg", "image/svg+xml"),
+}
+
+# card layout shared by the raster and SVG renderers
+PADDING = 28
+CODE_FONT_SIZE = 20
+CODE_WRAP = 92
+BANNER_H = 88
+STRIPE_H = 10
+META_W = 240
+BANNER_BG = "#F8FAFC"
+BORDER = "#D1D5DB"
+
+
+def now_utc_date() -> str:
+    return datetime.datetime.utcnow().strftime("%Y-%m-%d")
+
+
+# -----------------------------
+# 1) Renderer
+# -----------------------------
+def block_to_image(
+    code: str,
+    *,
+    title: str = "DevForge Block",
+    role_color: str = "#E5E7EB",
+    code_format: str = "text",
+    date_str: str = "",
+    fmt: str = "JPEG",
+    bg: str = "#FFFFFF",
+    fg: str = "#111827",
+    highlight: bool = True,
+):
+    """
+    Produces a bannered image:
+    - Top banner: title (left) + meta box (right: date + format)
+    - Colored role stripe under banner
+    - Code body (syntax highlighted unless highlight=False)
+    """
+    padding = PADDING
+    font_size = CODE_FONT_SIZE
+    wrap = CODE_WRAP
+
+    if not date_str:
+        date_str = now_utc_date()
+
+    # Wrap code (memoised per source line); highlighted rows come from the token cache
+    if highlight:
+        rows = highlight_rows(code, code_format, wrap)
+        # wrapped runs keep whitespace at the break; measure like the plain rows (stripped)
+        lines = ["".join(t for _, t in row).rstrip() for row in rows]
+    else:
+        lines = wrap_text(code, wrap)
+
+    ui = get_font("sans", 18)
+    ui_bold = get_font("sans", 22)
+
+    # Measure line height + code width (cached metrics, no per-line textbbox)
+    lh = line_height("mono", font_size, 7)
+    code_w = math.ceil(max_width("mono", font_size, lines))
+
+    # Banner sizing
+    banner_h = BANNER_H
+    stripe_h = STRIPE_H
+    meta_w = META_W
+
+    # Total image size
+    w = max(code_w + padding * 2, 920)
+    w = w + meta_w  # space for meta box on right without squeezing title
+    h = banner_h + stripe_h + (lh * max(1, len(lines))) + padding * 2 + 10
+
+    img = Image.new("RGB", (w, h), bg)
+    draw = ImageDraw.Draw(img)
+
+    # Banner background
+    banner_bg = BANNER_BG
+    banner_border = BORDER
+    draw.rounded_rectangle((14, 14, w - 14, 14 + banner_h), radius=18, fill=banner_bg, outline=banner_border, width=2)
+
+    # Title text (left)
+    title_x = 34
+    title_y = 24
+    draw.text((title_x, title_y), title, font=ui_bold, fill="#111827")
+    draw.text((title_x, title_y + 34), "DevForge • Bannered Export", font=ui, fill="#6B7280")
+
+    # Meta box (right)
+    box_x2 = w - 34
+    box_x1 = box_x2 - meta_w
+    box_y1 = 26
+    box_y2 = 14 + banner_h - 12
+    draw.rounded_rectangle((box_x1, box_y1, box_x2, box_y2), radius=16, fill="#FFFFFF", outline=banner_border, width=2)
+
+    # Meta contents
+    draw.text((box_x1 + 16, box_y1 + 10), f"DATE: {date_str}", font=ui, fill="#111827")
+    draw.text((box_x1 + 16, box_y1 + 34), f"FORMAT: {code_format.lower()}", font=ui, fill="#111827")
+    draw.text((box_x1 + 16, box_y1 + 58), f"EXPORT: {fmt.upper()}", font=ui, fill="#6B7280")
+
+    # Role stripe
+    stripe_y1 = 14 + banner_h + 8
+    draw.rounded_rectangle((14, stripe_y1, w - 14, stripe_y1 + stripe_h), radius=10, fill=role_color, outline=None)
+
+    # Code area background
+    code_top = stripe_y1 + stripe_h + 16
+    code_left = 14
+    code_right = w - 14
+    code_bottom = h - 14
+    draw.rounded_rectangle((code_left, code_top, code_right, code_bottom), radius=18, fill="#FFFFFF", outline=banner_border, width=2)
+
+    # Code text (highlighted: one draw call per colour)
+    if highlight:
+        draw_runs(draw, code_left + 22, code_top + 18, rows, ("mono", font_size), lh, {**THEME, "plain": fg})
+    else:
+        draw_rows(draw, code_left + 22, code_top + 18, [(l, ("mono", font_size), fg) for l in lines], lh)
+
+    buf = io.BytesIO()
+    img.save(buf, format=fmt, quality=95)
+    return buf.getvalue()
+
+
+def block_to_svg(
+    code: str,
+    *,
+    title: str = "DevForge Block",
+    role_color: str = "#E5E7EB",
+    code_format: str = "text",
+    date_str: str = "",
+    fg: str = "#111827",
+) -> bytes:
+    """Same card as block_to_image() as SVG: text stays text (small, sharp, selectable)."""
+    if not date_str:
+        date_str = now_utc_date()
+
+    rows = highlight_rows(code, code_format, CODE_WRAP)
+    lh = line_height("mono", CODE_FONT_SIZE, 7)
+    advance = mono_advance("mono", CODE_FONT_SIZE) or CODE_FONT_SIZE * 0.6
+    code_w = math.ceil(advance * max((len("".join(t for _, t in row).rstrip()) for row in rows), default=0))
+
+    w = max(code_w + PADDING * 2, 920) + META_W
+    h = BANNER_H + STRIPE_H + (lh * max(1, len(rows))) + PADDING * 2 + 10
+    stripe_y1 = 14 + BANNER_H + 8
+    code_top = stripe_y1 + STRIPE_H + 16
+    box_x1 = w - 34 - META_W
+    sans = "DejaVu Sans, Helvetica, Arial, sans-serif"
+    mono = "DejaVu Sans Mono, Menlo, Consolas, monospace"
+    # SVG y is the text baseline: shift each row down by roughly one ascent
+    baseline = code_top + 18 + round(CODE_FONT_SIZE * 0.8)
+
+    svg = f"""<svg xmlns="http://www.w3.org/2000/svg" width="{w}" height="{h}" viewBox="0 0 {w} {h}">
+<rect width="{w}" height="{h}" fill="#FFFFFF"/>
+<rect x="14" y="14" width="{w - 28}" height="{BANNER_H}" rx="18" fill="{BANNER_BG}" stroke="{BORDER}" stroke-width="2"/>
+<text x="34" y="42" font-family="{sans}" font-size="22" font-weight="bold" fill="#111827">{xml_escape(title)}</text>
+<text x="34" y="73" font-family="{sans}" font-size="18" fill="#6B7280">DevForge • Bannered Export</text>
+<rect x="{box_x1}" y="26" width="{META_W}" height="{BANNER_H - 24}" rx="16" fill="#FFFFFF" stroke="{BORDER}" stroke-width="2"/>
+<g font-family="{sans}" font-size="18">
+<text x="{box_x1 + 16}" y="52" fill="#111827">DATE: {xml_escape(date_str)}</text>
+<text x="{box_x1 + 16}" y="76" fill="#111827">FORMAT: {xml_escape(code_format.lower())}</text>
+<text x="{box_x1 + 16}" y="100" fill="#6B7280">EXPORT: SVG</text>
+</g>
+<rect x="14" y="{stripe_y1}" width="{w - 28}" height="{STRIPE_H}" rx="5" fill="{xml_escape(role_color)}"/>
+<rect x="14" y="{code_top}" width="{w - 28}" height="{h - 14 - code_top}" rx="18" fill="#FFFFFF" stroke="{BORDER}" stroke-width="2"/>
+<g font-family="{mono}" font-size="{CODE_FONT_SIZE}" fill="{fg}" xml:space="preserve">
+{runs_to_svg_text(rows, 36, baseline, lh, {**THEME, "plain": fg})}
+</g>
+</svg>
+"""
+    return svg.encode("utf-8")
+
+
+# -----------------------------
+# 2) Export cache (LRU, bounded by bytes)
+# -----------------------------
+_LOCK = threading.Lock()
+_CACHE: "OrderedDict[Tuple[str, ...], bytes]" = OrderedDict()
+_PENDING: Dict[Tuple[str, ...], Future] = {}
+_STATE = {"bytes": 0, "hits": 0, "misses": 0}
+_POOL: Optional[ThreadPoolExecutor] = None
+
+
+def _block_params(block: Dict[str, Any]) -> Tuple[str, str, str, str]:
+    return (
+        block.get("code") or "",
+        block.get("title") or "DevForge Block",
+        block.get("role_hex") or "#E5E7EB",
+        (block.get("code_format") or "text").lower(),
+    )
+
+
+def export_key(block: Dict[str, Any], fmt: str, date_str: str) -> Tuple[str, ...]:
+    code, title, role_color, code_format = _block_params(block)
+    content = hashlib.sha256(json.dumps([title, code], ensure_ascii=False).encode("utf-8")).hexdigest()
+    return (block.get("id", "block"), content, role_color, code_format, fmt.upper(), date_str, RENDERER_VERSION)
+
+
+def _cache_put(key: Tuple[str, ...], data: bytes) -> None:
+    if len(data) > CACHE_MAX_BYTES:
+        return
+    old = _CACHE.pop(key, None)
+    if old is not None:
+        _STATE["bytes"] -= len(old)
+    _CACHE[key] = data
+    _STATE["bytes"] += len(data)
+    while _STATE["bytes"] > CACHE_MAX_BYTES:
+        _, evicted = _CACHE.popitem(last=False)
+        _STATE["bytes"] -= len(evicted)
+
+
+def _render(block: Dict[str, Any], fmt: str, date_str: str) -> bytes:
+    code, title, role_color, code_format = _block_params(block)
+    if fmt.upper() == "SVG":
+        return block_to_svg(code, title=title, role_color=role_color, code_format=code_format, date_str=date_str)
+    return block_to_image(code, title=title, role_color=role_color, code_format=code_format, date_str=date_str, fmt=fmt)
+
+
+def export_image(block: Dict[str, Any], fmt: str = "PNG", date_str: str = "") -> bytes:
+    """Image bytes for one block; drawn only on a cache miss (waits for an in-flight pre-render)."""
+    date_str = date_str or now_utc_date()
+    key = export_key(block, fmt, date_str)
+    with _LOCK:
+        data = _CACHE.get(key)
+        if data is not None:
+            _CACHE.move_to_end(key)
+            _STATE["hits"] += 1
+            return data
+        pending = _PENDING.get(key)
+    if pending is not None:
+        return pending.result()
+    with _LOCK:
+        _STATE["misses"] += 1
+    data = _render(block, fmt, date_str)
+    with _LOCK:
+        _cache_put(key, data)
+    return data
+
+
+def export_name(block: Dict[str, Any], fmt: str) -> Tuple[str, str]:
+    """(file name, mime) for a block's image download."""
+    ext, mime = EXPORT_FORMATS[fmt.upper()]
+    return f"{block.get('id', 'block')}.{ext}", mime
+
+
+# -----------------------------
+# 3) Background pre-render
+# -----------------------------
+def _prerender_one(key: Tuple[str, ...], block: Dict[str, Any], fmt: str, date_str: str) -> bytes:
+    try:
+        data = _render(block, fmt, date_str)
+        with _LOCK:
+            _cache_put(key, data)
+        return data
+    finally:
+        with _LOCK:
+            _PENDING.pop(key, None)
+
+
+def prerender(blocks: Iterable[Dict[str, Any]], fmts: Iterable[str] = ("JPEG", "PNG"), date_str: str = "") -> int:
+    """Queues every (block, format) not cached or already queued. Returns how many were queued."""
+    global _POOL
+    date_str = date_str or now_utc_date()
+    fmts = [f.upper() for f in fmts]
+    queued = 0
+    with _LOCK:
+        if _POOL is None:
+            _POOL = ThreadPoolExecutor(max_workers=PRERENDER_WORKERS, thread_name_prefix="block_render")
+        for block in blocks:
+            for fmt in fmts:
+                key = export_key(block, fmt, date_str)
+                if key in _CACHE or key in _PENDING:
+                    continue
+                _PENDING[key] = _POOL.submit(_prerender_one, key, dict(block), fmt, date_str)
+                queued += 1
+    return queued
+
+
+def cache_stats() -> Dict[str, Any]:
+    with _LOCK:
+        return {
+            "entries": len(_CACHE),
+            "bytes": _STATE["bytes"],
+            "pending": len(_PENDING),
+            "hits": _STATE["hits"],
+            "misses": _STATE["misses"],
+        }
@@ -0,0 +1,339 @@
+# python_hubs/Dev_Forge/pages/code_library/block_store.py
+# ============================================================
+# DevForge Blocks — Indexed block store (SQLite + FTS5)
+# - Replaces globbing + parsing blocks/*.json on every rerun
+# - blocks + block_tags tables; blocks_fts kept in sync by triggers
+#   -> save/delete are single-row updates, nothing is re-read
+# - Ranked search (bm25, title > tags > role/format > code), prefix terms
+# - Role / tag facet counts for the current result set
+# - One-time migration: existing blocks/*.json are imported on first open
+#   (the JSON files are left in place as a backup)
+# - version(): stamp bumped by every save/delete (cache key for exports);
+#   snapshot() reads version + blocks from one consistent read transaction
+# ============================================================
+
+from __future__ import annotations
+
+import json
+import re
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+DB_NAME = "blocks.sqlite"
+
+# Bump when SCHEMA_SQL changes; stored in PRAGMA user_version.
+SCHEMA_VERSION = 1
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS blocks (
+  n INTEGER PRIMARY KEY,
+  id TEXT NOT NULL UNIQUE,
+  title TEXT NOT NULL,
+  tags TEXT NOT NULL DEFAULT '',
+  code TEXT NOT NULL DEFAULT '',
+  role_name TEXT NOT NULL DEFAULT '',
+  role_key TEXT NOT NULL DEFAULT '',
+  role_hex TEXT NOT NULL DEFAULT '',
+  code_format TEXT NOT NULL DEFAULT 'text',
+  created TEXT NOT NULL DEFAULT ''
+);
+
+CREATE TABLE IF NOT EXISTS block_tags (
+  tag TEXT NOT NULL,
+  block_n INTEGER NOT NULL REFERENCES blocks(n) ON DELETE CASCADE,
+  PRIMARY KEY (tag, block_n)
+);
+
+CREATE TABLE IF NOT EXISTS meta (
+  key TEXT PRIMARY KEY,
+  value TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_blocks_created ON blocks(created);
+CREATE INDEX IF NOT EXISTS idx_blocks_role ON blocks(role_name);
+CREATE INDEX IF NOT EXISTS idx_block_tags_n ON block_tags(block_n);
+
+-- tags column holds the tags joined by ", " (display + FTS)
+CREATE VIRTUAL TABLE IF NOT EXISTS blocks_fts
+USING fts5(
+  title,
+  tags,
+  role_name,
+  code_format,
+  code,
+  content='blocks',
+  content_rowid='n',
+  prefix='2 3'
+);
+
+CREATE TRIGGER IF NOT EXISTS blocks_ai AFTER INSERT ON blocks BEGIN
+  INSERT INTO blocks_fts(rowid, title, tags, role_name, code_format, code)
+  VALUES (new.n, new.title, new.tags, new.role_name, new.code_format, new.code);
+END;
+
+CREATE TRIGGER IF NOT EXISTS blocks_au AFTER UPDATE ON blocks BEGIN
+  INSERT INTO blocks_fts(blocks_fts, rowid, title, tags, role_name, code_format, code)
+  VALUES ('delete', old.n, old.title, old.tags, old.role_name, old.code_format, old.code);
+  INSERT INTO blocks_fts(rowid, title, tags, role_name, code_format, code)
+  VALUES (new.n, new.title, new.tags, new.role_name, new.code_format, new.code);
+END;
+
+CREATE TRIGGER IF NOT EXISTS blocks_ad AFTER DELETE ON blocks BEGIN
+  INSERT INTO blocks_fts(blocks_fts, rowid, title, tags, role_name, code_format, code)
+  VALUES ('delete', old.n, old.title, old.tags, old.role_name, old.code_format, old.code);
+END;
+"""
+
+CONNECTION_PRAGMAS = (
+    "PRAGMA foreign_keys = ON;",
+    "PRAGMA journal_mode = WAL;",
+    "PRAGMA synchronous = NORMAL;",
+    "PRAGMA temp_store = MEMORY;",
+)
+
+# FTS column order: title, tags, role_name, code_format, code
+# (lower bm25 = better; weights scale each column's contribution)
+BM25_WEIGHTS = (10.0, 6.0, 2.0, 2.0, 1.0)
+
+BLOCK_FIELDS = ("id", "title", "tags", "code", "role_name", "role_key", "role_hex", "code_format", "created")
+
+_FTS_TERM_RE = re.compile(r"\w+")
+
+
+def build_fts_query(q: str) -> str:
+    """
+    Raw search text -> safe FTS5 MATCH expression.
+    Every word quoted and used as a prefix ("upl" finds "upload"), words ANDed.
+    Returns "" if nothing searchable is left.
+    """
+    return " ".join('"' + tok.replace('"', '""') + '"*' for tok in _FTS_TERM_RE.findall(q or ""))
+
+
+def _row_to_block(row: sqlite3.Row) -> Dict[str, Any]:
+    block = {k: row[k] for k in BLOCK_FIELDS}
+    block["tags"] = [t for t in block["tags"].split(", ") if t]
+    return block
+
+
+# -----------------------------
+# Store
+# -----------------------------
+class BlockStore:
+    """One SQLite file per blocks folder. Safe to share across Streamlit reruns/sessions."""
+
+    def __init__(self, db_path: str | Path, json_dir: str | Path | None = None) -> None:
+        self.db_path = Path(db_path)
+        self._lock = threading.RLock()
+        self.con = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self.con.row_factory = sqlite3.Row
+        for pragma in CONNECTION_PRAGMAS:
+            self.con.execute(pragma)
+        if int(self.con.execute("PRAGMA user_version;").fetchone()[0]) < SCHEMA_VERSION:
+            with self._lock:
+                self.con.executescript(SCHEMA_SQL)
+                self.con.execute(f"PRAGMA user_version = {SCHEMA_VERSION};")
+                self.con.commit()
+        if json_dir is not None and self._meta("json_migrated") is None:
+            self.migrate_json(json_dir)
+
+    # ---- meta ----
+    def _meta(self, key: str) -> Optional[str]:
+        row = self.con.execute("SELECT value FROM meta WHERE key = ?;", (key,)).fetchone()
+        return row["value"] if row else None
+
+    def _set_meta(self, key: str, value: str) -> None:
+        self.con.execute("INSERT OR REPLACE INTO meta(key, value) VALUES (?, ?);", (key, value))
+
+    def _bump_version(self) -> None:
+        self.con.execute(
+            """INSERT INTO meta(key, value) VALUES ('version', '1')
+               ON CONFLICT(key) DO UPDATE SET value = CAST(value AS INTEGER) + 1;"""
+        )
+
+    def version(self) -> int:
+        """Library version stamp; changes whenever a block is saved or deleted."""
+        with self._lock:
+            return int(self._meta("version") or 0)
+
+    # ---- writes ----
+    def _upsert(self, block: Dict[str, Any]) -> None:
+        tags = [t.strip() for t in block.get("tags") or [] if str(t).strip()]
+        values = {k: block.get(k) or "" for k in BLOCK_FIELDS}
+        values["tags"] = ", ".join(tags)
+        values["code_format"] = (values["code_format"] or "text").lower()
+        self.con.execute(
+            f"""INSERT INTO blocks ({", ".join(BLOCK_FIELDS)})
+                VALUES ({", ".join("?" * len(BLOCK_FIELDS))})
+                ON CONFLICT(id) DO UPDATE SET
+                {", ".join(f"{k}=excluded.{k}" for k in BLOCK_FIELDS if k != "id")};""",
+            [values[k] for k in BLOCK_FIELDS],
+        )
+        n = self.con.execute("SELECT n FROM blocks WHERE id = ?;", (values["id"],)).fetchone()["n"]
+        self.con.execute("DELETE FROM block_tags WHERE block_n = ?;", (n,))
+        self.con.executemany("INSERT OR IGNORE INTO block_tags(tag, block_n) VALUES (?, ?);", [(t, n) for t in tags])
+
+    def save(self, block: Dict[str, Any]) -> None:
+        """Insert or replace one block (same id = overwrite, like the JSON file did)."""
+        self.save_many([block])
+
+    def save_many(self, blocks: Iterable[Dict[str, Any]]) -> int:
+        count = 0
+        with self._lock:
+            try:
+                for block in blocks:
+                    self._upsert(block)
+                    count += 1
+                if count:
+                    self._bump_version()
+                self.con.commit()
+            except BaseException:
+                self.con.rollback()
+                raise
+        return count
+
+    def delete(self, block_id: str) -> bool:
+        with self._lock:
+            cur = self.con.execute("DELETE FROM blocks WHERE id = ?;", (block_id,))
+            if cur.rowcount:
+                self._bump_version()
+            self.con.commit()
+            return cur.rowcount > 0
+
+    def migrate_json(self, json_dir: str | Path) -> int:
+        """One-time import of <id>.json files (malformed files skipped). Returns blocks imported."""
+        blocks = []
+        for p in Path(json_dir).glob("*.json"):
+            try:
+                data = json.loads(p.read_text(encoding="utf-8"))
+            except Exception:
+                continue
+            if isinstance(data, dict) and data.get("id"):
+                blocks.append(data)
+        with self._lock:
+            count = self.save_many(blocks)
+            self._set_meta("json_migrated", str(count))
+            self.con.commit()
+        return count
+
+    # ---- reads ----
+    def _filters(
+        self,
+        q: str,
+        role_name: Optional[str],
+        code_format: Optional[str],
+        tags: Sequence[str],
+    ) -> Tuple[str, str, List[Any], bool]:
+        """(FROM, WHERE, params, ranked) shared by search() and facets()."""
+        match = build_fts_query(q)
+        params: List[Any] = []
+        where: List[str] = []
+        if match:
+            weights = ", ".join(str(w) for w in BM25_WEIGHTS)
+            source = f"""(
+                SELECT rowid AS n, bm25(blocks_fts, {weights}) AS rank
+                FROM blocks_fts WHERE blocks_fts MATCH ?
+            ) h JOIN blocks b ON b.n = h.n"""
+            params.append(match)
+        else:
+            source = "blocks b"
+        if role_name:
+            where.append("b.role_name = ?")
+            params.append(role_name)
+        if code_format:
+            where.append("b.code_format = ?")
+            params.append(code_format.lower())
+        if tags:
+            where.append(
+                f"""b.n IN (SELECT block_n FROM block_tags WHERE tag IN ({",".join("?" * len(tags))})
+                    GROUP BY block_n HAVING COUNT(DISTINCT tag) = ?)"""
+            )
+            params.extend([*tags, len(tags)])
+        where_sql = ("WHERE " + " AND ".join(where)) if where else ""
+        return source, where_sql, params, bool(match)
+
+    def search(
+        self,
+        q: str = "",
+        *,
+        role_name: Optional[str] = None,
+        code_format: Optional[str] = None,
+        tags: Sequence[str] = (),
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Matching blocks: best match first with a search term, else newest first."""
+        source, where_sql, params, ranked = self._filters(q, role_name, code_format, tags)
+        order = "h.rank ASC, b.created DESC" if ranked else "b.created DESC"
+        sql = f"SELECT b.* FROM {source} {where_sql} ORDER BY {order}"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+        with self._lock:
+            rows = self.con.execute(sql + ";", params).fetchall()
+        return [_row_to_block(r) for r in rows]
+
+    def facets(
+        self,
+        q: str = "",
+        *,
+        role_name: Optional[str] = None,
+        code_format: Optional[str] = None,
+        tags: Sequence[str] = (),
+    ) -> Dict[str, Dict[str, int]]:
+        """{"role": {role_name: n}, "tag": {tag: n}} over the blocks matching these filters."""
+        source, where_sql, params, _ = self._filters(q, role_name, code_format, tags)
+        matching = f"SELECT b.n FROM {source} {where_sql}"
+        with self._lock:
+            roles = self.con.execute(
+                f"SELECT role_name AS v, COUNT(*) AS c FROM blocks WHERE n IN ({matching}) GROUP BY role_name;",
+                params,
+            ).fetchall()
+            tag_rows = self.con.execute(
+                f"""SELECT tag AS v, COUNT(*) AS c FROM block_tags WHERE block_n IN ({matching})
+                    GROUP BY tag ORDER BY c DESC, tag;""",
+                params,
+            ).fetchall()
+        return {"role": {r["v"]: r["c"] for r in roles}, "tag": {r["v"]: r["c"] for r in tag_rows}}
+
+    @contextmanager
+    def snapshot(self) -> Iterator[Tuple[int, Iterator[Dict[str, Any]]]]:
+        """
+        (version, blocks) from one read transaction on a separate read-only connection:
+        saves/deletes made while the caller iterates are not seen, so the blocks
+        always match the version. Rows are streamed from the cursor.
+        """
+        con = sqlite3.connect(self.db_path.resolve().as_uri() + "?mode=ro", uri=True, isolation_level=None)
+        con.row_factory = sqlite3.Row
+        try:
+            con.execute("BEGIN;")
+            row = con.execute("SELECT value FROM meta WHERE key = 'version';").fetchone()
+            version = int(row["value"]) if row else 0
+            yield version, (_row_to_block(r) for r in con.execute("SELECT * FROM blocks ORDER BY n;"))
+        finally:
+            con.close()
+
+    def all_tags(self) -> List[str]:
+        with self._lock:
+            return [r["tag"] for r in self.con.execute("SELECT DISTINCT tag FROM block_tags ORDER BY tag;")]
+
+    def count(self) -> int:
+        with self._lock:
+            return int(self.con.execute("SELECT COUNT(*) FROM blocks;").fetchone()[0])
+
+
+_STORES: Dict[str, BlockStore] = {}
+_STORES_LOCK = threading.Lock()
+
+
+def get_store(blocks_dir: str | Path) -> BlockStore:
+    """One BlockStore per blocks folder per process (module state survives Streamlit reruns)."""
+    blocks_dir = Path(blocks_dir).resolve()
+    key = str(blocks_dir)
+    with _STORES_LOCK:
+        store = _STORES.get(key)
+        if store is None:
+            blocks_dir.mkdir(parents=True, exist_ok=True)
+            store = _STORES[key] = BlockStore(blocks_dir / DB_NAME, json_dir=blocks_dir)
+        return store
@@ -0,0 +1,56 @@
+# python_hubs/Dev_Forge/pages/ngss_db/test_vault_db.py
+# Upgrading a vault made by the baseline app (data, user_version 0) keeps search working.
+
+import sqlite3
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import vault_db  # noqa: E402
+
+# standards + standards_fts exactly as the baseline app created them (no user_version)
+BASELINE_SCHEMA = """
+CREATE TABLE standards (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  pe_code TEXT NOT NULL UNIQUE,
+  grade_band TEXT NOT NULL DEFAULT 'MS',
+  topic_area TEXT,
+  domain_code TEXT,
+  domain_title TEXT,
+  pe_statement TEXT,
+  clarification_statement TEXT,
+  assessment_boundary TEXT,
+  connections TEXT,
+  source_url TEXT
+);
+CREATE VIRTUAL TABLE standards_fts USING fts5(
+  pe_code, domain_title, pe_statement, clarification_statement, assessment_boundary, connections,
+  content='standards', content_rowid='id'
+);
+CREATE TRIGGER standards_ai AFTER INSERT ON standards BEGIN
+  INSERT INTO standards_fts(rowid, pe_code, domain_title, pe_statement, clarification_statement, assessment_boundary, connections)
+  VALUES (new.id, new.pe_code, new.domain_title, new.pe_statement, new.clarification_statement, new.assessment_boundary, new.connections);
+END;
+"""
+
+
+def test_baseline_vault_upgrade_keeps_search(tmp_path):
+    db = tmp_path / "baseline.db"
+    con = sqlite3.connect(db)
+    con.executescript(BASELINE_SCHEMA)
+    con.execute(
+        "INSERT INTO standards (pe_code, domain_title, pe_statement) VALUES (?, ?, ?);",
+        ("MS-PS1-1", "Matter and Its Interactions", "Develop models to describe the atomic composition of molecules."),
+    )
+    con.commit()
+    con.close()
+
+    up = vault_db.db_connect(db)
+    try:
+        assert vault_db.db_init(up)
+        assert vault_db.db_schema_version(up) == vault_db.SCHEMA_VERSION
+        for q in ("atomic", "molec*", "MS-PS1"):
+            page = vault_db.search_standards(up, q=q, tag_ids=[])
+            assert [r["pe_code"] for r in page.rows] == ["MS-PS1-1"], q
+    finally:
+        up.close()
@@ -0,0 +1,811 @@
+# python_hubs/Dev_Forge/pages/ngss_db/vault_db.py
+# ============================================================
+# NGSS MS Research Vault — DB module
+# - Schema + seed + queries used by ngss_ms_research_vault_app.py
+# - ONE shared connection per DB file per process (kept across reruns)
+# - WAL + tuned pragmas; schema script only runs on first open / version bump
+# Lives in ngss_db/ (not pages/) so Streamlit doesn't list it as a page and
+# module state survives reruns of the page script.
+# ============================================================
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import sqlite3
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+
+# -----------------------------
+# 1) Schema (extends the original with demo_activities)
+# -----------------------------
+# Bump when SCHEMA_SQL changes; stored in PRAGMA user_version.
+SCHEMA_VERSION = 2
+
+# Run BEFORE SCHEMA_SQL when upgrading past that version.
+# v2: standards_fts gains prefix indexes -> drop it; rebuilt from standards below.
+SCHEMA_MIGRATIONS: Dict[int, str] = {
+    2: "DROP TABLE IF EXISTS standards_fts;",
+}
+
+SCHEMA_SQL = """
+PRAGMA foreign_keys = ON;
+
+CREATE TABLE IF NOT EXISTS standards (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  pe_code TEXT NOT NULL UNIQUE,
+  grade_band TEXT NOT NULL DEFAULT 'MS',
+  topic_area TEXT,
+  domain_code TEXT,
+  domain_title TEXT,
+  pe_statement TEXT,
+  clarification_statement TEXT,
+  assessment_boundary TEXT,
+  connections TEXT,
+  source_url TEXT
+);
+
+CREATE TABLE IF NOT EXISTS tags (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  tag_type TEXT NOT NULL,
+  code TEXT,
+  label TEXT NOT NULL,
+  UNIQUE(tag_type, label),
+  UNIQUE(tag_type, code)
+);
+
+CREATE TABLE IF NOT EXISTS standard_tags (
+  standard_id INTEGER NOT NULL,
+  tag_id INTEGER NOT NULL,
+  excerpt TEXT,
+  PRIMARY KEY (standard_id, tag_id),
+  FOREIGN KEY (standard_id) REFERENCES standards(id) ON DELETE CASCADE,
+  FOREIGN KEY (tag_id) REFERENCES tags(id) ON DELETE CASCADE
+);
+
+-- DEMO activity variables
+CREATE TABLE IF NOT EXISTS demo_activities (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  standard_id INTEGER NOT NULL,
+  phase TEXT NOT NULL,
+  activity_title TEXT NOT NULL,
+  activity_text TEXT NOT NULL,
+  materials TEXT,
+  accommodations TEXT,
+  sentence_starters TEXT,
+  links TEXT,
+  FOREIGN KEY (standard_id) REFERENCES standards(id) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS idx_standards_pe ON standards(pe_code);
+CREATE INDEX IF NOT EXISTS idx_tags_type_label ON tags(tag_type, label);
+CREATE INDEX IF NOT EXISTS idx_join_tag ON standard_tags(tag_id);
+CREATE INDEX IF NOT EXISTS idx_join_std ON standard_tags(standard_id);
+CREATE INDEX IF NOT EXISTS idx_demo_std ON demo_activities(standard_id);
+CREATE INDEX IF NOT EXISTS idx_demo_phase ON demo_activities(phase);
+
+-- Optional FTS (if FTS5 exists)
+CREATE VIRTUAL TABLE IF NOT EXISTS standards_fts
+USING fts5(
+  pe_code,
+  domain_title,
+  pe_statement,
+  clarification_statement,
+  assessment_boundary,
+  connections,
+  content='standards',
+  content_rowid='id',
+  prefix='2 3 4'
+);
+"""
+
+# Keep standards_fts in sync with standards. Bulk loads drop these and
+# rebuild the index once instead (see vault_import.py).
+FTS_TRIGGERS: Dict[str, str] = {
+    "standards_ai": """
+CREATE TRIGGER IF NOT EXISTS standards_ai AFTER INSERT ON standards BEGIN
+  INSERT INTO standards_fts(rowid, pe_code, domain_title, pe_statement, clarification_statement, assessment_boundary, connections)
+  VALUES (new.id, new.pe_code, new.domain_title, new.pe_statement, new.clarification_statement, new.assessment_boundary, new.connections);
+END;
+""",
+    "standards_au": """
+CREATE TRIGGER IF NOT EXISTS standards_au AFTER UPDATE ON standards BEGIN
+  UPDATE standards_fts SET
+    pe_code=new.pe_code,
+    domain_title=new.domain_title,
+    pe_statement=new.pe_statement,
+    clarification_statement=new.clarification_statement,
+    assessment_boundary=new.assessment_boundary,
+    connections=new.connections
+  WHERE rowid=new.id;
+END;
+""",
+    "standards_ad": """
+CREATE TRIGGER IF NOT EXISTS standards_ad AFTER DELETE ON standards BEGIN
+  DELETE FROM standards_fts WHERE rowid=old.id;
+END;
+""",
+}
+
+SCHEMA_SQL += "\n".join(FTS_TRIGGERS.values())
+
+# -----------------------------
+# 2) Connection manager
+# -----------------------------
+# Applied to every connection we open (per-connection settings).
+CONNECTION_PRAGMAS = (
+    "PRAGMA foreign_keys = ON;",
+    "PRAGMA journal_mode = WAL;",
+    "PRAGMA synchronous = NORMAL;",
+    "PRAGMA temp_store = MEMORY;",
+    "PRAGMA cache_size = -16000;",  # ~16 MB page cache
+    "PRAGMA mmap_size = 268435456;",  # 256 MB memory-mapped reads
+)
+
+# sqlite3 keeps this many compiled (prepared) statements per connection.
+STATEMENT_CACHE_SIZE = 128
+
+_CONNECTIONS: Dict[str, Tuple[sqlite3.Connection, Tuple[int, int] | None]] = {}
+_CONNECTION_PATHS: Dict[int, str] = {}
+_CONNECTIONS_LOCK = threading.Lock()
+_WRITE_LOCK = threading.RLock()
+
+
+def _db_key(db_path: str | os.PathLike) -> str:
+    return str(Path(db_path).expanduser().resolve())
+
+
+def _file_identity(path: str) -> Tuple[int, int] | None:
+    try:
+        stt = os.stat(path)
+    except OSError:
+        return None
+    return (stt.st_dev, stt.st_ino)
+
+
+def db_connect(db_path: str | os.PathLike) -> sqlite3.Connection:
+    """Open a NEW tuned connection. Prefer get_connection() in the app."""
+    con = sqlite3.connect(
+        str(db_path),
+        check_same_thread=False,
+        cached_statements=STATEMENT_CACHE_SIZE,
+    )
+    con.row_factory = sqlite3.Row
+    for pragma in CONNECTION_PRAGMAS:
+        con.execute(pragma)
+    return con
+
+
+def db_schema_version(con: sqlite3.Connection) -> int:
+    return int(con.execute("PRAGMA user_version;").fetchone()[0])
+
+
+def db_init(con: sqlite3.Connection) -> bool:
+    """
+    Runs SCHEMA_SQL only if the file is older than SCHEMA_VERSION.
+    Returns True if the schema script ran.
+    """
+    current = db_schema_version(con)
+    if current >= SCHEMA_VERSION:
+        return False
+    with _WRITE_LOCK:
+        pending = [v for v in sorted(SCHEMA_MIGRATIONS) if current < v <= SCHEMA_VERSION]
+        for v in pending:
+            con.executescript(SCHEMA_MIGRATIONS[v])
+        con.executescript(SCHEMA_SQL)
+        if pending:
+            # a migration dropped standards_fts: re-index whatever is already in standards
+            # (baseline vaults have data at user_version 0)
+            con.execute("INSERT INTO standards_fts(standards_fts) VALUES ('rebuild');")
+        con.execute(f"PRAGMA user_version = {int(SCHEMA_VERSION)};")
+        con.commit()
+    return True
+
+
+def get_connection(db_path: str | os.PathLike) -> sqlite3.Connection:
+    """
+    Shared connection for db_path (one per file per process).
+    Connect + pragmas + schema check are paid once; later calls cost one stat().
+    If the file was deleted/replaced (e.g. to re-seed), a fresh one is opened.
+    """
+    key = _db_key(db_path)
+    with _CONNECTIONS_LOCK:
+        cached = _CONNECTIONS.get(key)
+        if cached is not None:
+            con, ident = cached
+            if ident is not None and ident == _file_identity(key):
+                return con
+            _CONNECTIONS.pop(key, None)
+            _FACETS.pop(id(con), None)
+            _CONNECTION_PATHS.pop(id(con), None)
+            con.close()
+
+        con = db_connect(key)
+        db_init(con)
+        _CONNECTIONS[key] = (con, _file_identity(key))
+        _CONNECTION_PATHS[id(con)] = key
+        return con
+
+
+def close_connections() -> None:
+    with _CONNECTIONS_LOCK:
+        for con, _ in _CONNECTIONS.values():
+            con.close()
+        _CONNECTIONS.clear()
+        _CONNECTION_PATHS.clear()
+        _FACETS.clear()
+        _BUNDLES.clear()
+
+
+@contextmanager
+def write_transaction(con: sqlite3.Connection) -> Iterator[sqlite3.Connection]:
+    """
+    Serialises writers sharing the cached connection (Streamlit sessions are threads).
+    Commits on success, rolls back on error.
+    """
+    with _WRITE_LOCK:
+        try:
+            yield con
+            con.commit()
+        except BaseException:
+            con.rollback()
+            raise
+
+
+# -----------------------------
+# 3) Seed + queries
+# -----------------------------
+def db_has_data(con: sqlite3.Connection) -> bool:
+    return con.execute("SELECT 1 FROM standards LIMIT 1;").fetchone() is not None
+
+
+def _upsert_tag(con: sqlite3.Connection, tag_type: str, code: str | None, label: str) -> int:
+    con.execute(
+        "INSERT OR IGNORE INTO tags(tag_type, code, label) VALUES (?,?,?)",
+        (tag_type, code, label),
+    )
+    row = con.execute(
+        "SELECT id FROM tags WHERE tag_type=? AND label=?",
+        (tag_type, label),
+    ).fetchone()
+    return int(row["id"])
+
+
+def _attach_tag(con: sqlite3.Connection, pe_code: str, tag_id: int, excerpt: str | None = None) -> None:
+    sid = con.execute("SELECT id FROM standards WHERE pe_code=?", (pe_code,)).fetchone()
+    if not sid:
+        return
+    con.execute(
+        "INSERT OR IGNORE INTO standard_tags(standard_id, tag_id, excerpt) VALUES (?,?,?)",
+        (int(sid["id"]), int(tag_id), excerpt),
+    )
+    facets_attach(con, [(int(sid["id"]), int(tag_id))])
+
+
+def _insert_demo_activity(
+    con: sqlite3.Connection,
+    pe_code: str,
+    phase: str,
+    title: str,
+    text: str,
+    materials: str = "",
+    accommodations: str = "",
+    sentence_starters: str = "",
+    links: str = "",
+) -> None:
+    sid = con.execute("SELECT id FROM standards WHERE pe_code=?", (pe_code,)).fetchone()
+    if not sid:
+        return
+    con.execute(
+        """
+        INSERT INTO demo_activities(standard_id, phase, activity_title, activity_text, materials, accommodations, sentence_starters, links)
+        VALUES (?,?,?,?,?,?,?,?)
+        """,
+        (int(sid["id"]), phase, title, text, materials, accommodations, sentence_starters, links),
+    )
+
+
+def db_seed_demo_if_empty(con: sqlite3.Connection) -> bool:
+    """
+    Seeds exactly 2 standards + demo activities if DB is empty.
+    Returns True if seeded.
+    """
+    if db_has_data(con):
+        return False
+    with write_transaction(con):
+        if db_has_data(con):  # another session seeded first
+            return False
+        _seed_demo(con)
+    return True
+
+
+def _seed_demo(con: sqlite3.Connection) -> None:
+    # ---- Standards (lightweight demo seed based on NGSS page wording)
+    con.execute(
+        """
+        INSERT INTO standards(pe_code, grade_band, topic_area, domain_code, domain_title,
+                              pe_statement, clarification_statement, assessment_boundary, connections, source_url)
+        VALUES (?,?,?,?,?,?,?,?,?,?)
+        """,
+        (
+            "MS-LS1-1",
+            "MS",
+            "Life Science",
+            "MS-LS1",
+            "From Molecules to Organisms: Structures and Processes",
+            "Conduct an investigation to provide evidence that living things are made of cells; either one cell or many different numbers and types of cells.",
+            "Emphasis is on developing evidence that living things are made of cells, distinguishing between living and non-living things, and understanding that living things may be made of one cell or many and varied cells.",
+            None,
+            "Connections to engineering/technology and CCSS are available on the NGSS page.",
+            "https://www.nextgenscience.org/pe/ms-ls1-1-molecules-organisms-structures-and-processes",
+        ),
+    )
+
+    con.execute(
+        """
+        INSERT INTO standards(pe_code, grade_band, topic_area, domain_code, domain_title,
+                              pe_statement, clarification_statement, assessment_boundary, connections, source_url)
+        VALUES (?,?,?,?,?,?,?,?,?,?)
+        """,
+        (
+            "MS-ESS1-1",
+            "MS",
+            "Earth & Space Science",
+            "MS-ESS1",
+            "Earth's Place in the Universe",
+            "Develop and use a model of the Earth-sun-moon system to describe the cyclic patterns of lunar phases, eclipses of the sun and moon, and seasons.",
+            "Examples of models can be physical, graphical, or conceptual.",
+            None,
+            "Connections to other DCIs and CCSS are available on the NGSS page.",
+            "https://www.nextgenscience.org/pe/ms-ess1-1-earths-place-universe",
+        ),
+    )
+
+    # ---- Minimal tags (so filters work)
+    sep_models = _upsert_tag(con, "SEP", "SEP-MODEL", "Developing and Using Models")
+    sep_invest = _upsert_tag(con, "SEP", "SEP-INV", "Planning and Carrying Out Investigations")
+    ccc_patterns = _upsert_tag(con, "CCC", "CCC-PAT", "Patterns")
+    ccc_scale = _upsert_tag(con, "CCC", "CCC-SCALE", "Scale, Proportion, and Quantity")
+    dci_ls1a = _upsert_tag(con, "DCI", "LS1.A", "LS1.A: Structure and Function")
+    dci_ess1b = _upsert_tag(con, "DCI", "ESS1.B", "ESS1.B: Earth and the Solar System")
+
+    _attach_tag(con, "MS-LS1-1", sep_invest)
+    _attach_tag(con, "MS-LS1-1", ccc_scale)
+    _attach_tag(con, "MS-LS1-1", dci_ls1a)
+
+    _attach_tag(con, "MS-ESS1-1", sep_models)
+    _attach_tag(con, "MS-ESS1-1", ccc_patterns)
+    _attach_tag(con, "MS-ESS1-1", dci_ess1b)
+
+    # ---- Demo activity variables (5E) — short, practical
+    # MS-LS1-1
+    _insert_demo_activity(
+        con, "MS-LS1-1", "Engage",
+        "Living vs Nonliving Evidence Sort",
+        "Show 6 images (plant, rock, mushroom, flame, bacteria, robot). Students sort living/nonliving and give one piece of evidence.",
+        materials="Image set, sticky notes/whiteboards.",
+        accommodations="2-choice cards; allow oral response; sentence starters.",
+        sentence_starters="I think it is living because ____. / My evidence is ____.",
+    )
+    _insert_demo_activity(
+        con, "MS-LS1-1", "Explore",
+        "Cell Hunt Station Lab",
+        "Stations: microscope slides OR photo cards. Students record 3 observations per station to support the claim living things are made of cells.",
+        materials="Slides/photos, microscopes OR station cards, lab sheet.",
+        accommodations="Pre-labeled diagrams; reduced stations; partner roles.",
+        sentence_starters="I observed ____. This supports the claim because ____.",
+    )
+    _insert_demo_activity(
+        con, "MS-LS1-1", "Explain",
+        "CER Mini-Write",
+        "Students write a short CER: Claim (cells), Evidence (observations), Reasoning (why evidence supports claim).",
+        materials="CER template + word bank.",
+        accommodations="Fill-in-the-blank CER; bullets; speech-to-text.",
+        sentence_starters="Claim: ____. Evidence: ____. Reasoning: ____.",
+    )
+
+    # MS-ESS1-1
+    _insert_demo_activity(
+        con, "MS-ESS1-1", "Engage",
+        "Moon Photo Pattern Notice",
+        "Show a montage of moon photos across a month. Students predict what causes the repeating pattern.",
+        materials="Moon photo set (slides).",
+        accommodations="Word bank (shape/position/brightness).",
+        sentence_starters="I notice ____. The pattern might be caused by ____.",
+    )
+    _insert_demo_activity(
+        con, "MS-ESS1-1", "Explore",
+        "Lamp + Ball Model",
+        "Model Sun (lamp), Earth (ball), Moon (ping pong). Students generate a phase sequence and sketch 4 positions as ‘data.’",
+        materials="Lamp, balls, ping pong, dark space, lab sheet.",
+        accommodations="Labeled diagram frames; assigned roles.",
+        sentence_starters="When the Moon is here, we see ____. This happens because ____.",
+    )
+    _insert_demo_activity(
+        con, "MS-ESS1-1", "Explain",
+        "Model-to-Claim (Phases + Seasons)",
+        "Students use model data to write claims about phases and seasons (tilt + sunlight). Add one diagram per claim.",
+        materials="Claim/diagram template, vocab bank (orbit, tilt, axis).",
+        accommodations="Sentence frames; diagram arrows/stickers.",
+        sentence_starters="My claim is ____. My model shows ____. Therefore ____.",
+    )
+
+
+def list_tags(con: sqlite3.Connection, tag_type: str) -> List[Tuple[int, str]]:
+    cur = con.execute(
+        "SELECT id, label FROM tags WHERE tag_type=? ORDER BY label COLLATE NOCASE;",
+        (tag_type,),
+    )
+    return [(int(r["id"]), str(r["label"])) for r in cur.fetchall()]
+
+
+# FTS column order: pe_code, domain_title, pe_statement,
+#                  clarification_statement, assessment_boundary, connections
+# (lower bm25 = better; weights scale each column's contribution)
+BM25_WEIGHTS = (10.0, 4.0, 5.0, 2.0, 1.0, 0.5)
+
+SNIPPET_TOKENS = 16
+
+_FTS_TERM_RE = re.compile(r"[^\W_](?:[\w.'\-]*[^\W_])?\*?|\S\*")
+
+
+def build_fts_query(q: str) -> str:
+    """
+    Turns raw user text into a safe FTS5 MATCH expression.
+    - every term is quoted (no FTS syntax errors from ", :, (, NEAR, OR ...)
+    - 'cell*' stays a prefix query
+    - terms are ANDed
+    Returns "" if nothing searchable is left.
+    """
+    terms: List[str] = []
+    for tok in _FTS_TERM_RE.findall(q or ""):
+        prefix = tok.endswith("*")
+        word = tok.rstrip("*")
+        if not word or not any(ch.isalnum() for ch in word):
+            continue
+        quoted = '"' + word.replace('"', '""') + '"'
+        terms.append(quoted + ("*" if prefix else ""))
+    return " ".join(terms)
+
+
+@dataclass(frozen=True)
+class SearchPage:
+    rows: List[sqlite3.Row]
+    ranked: bool
+    next_after: Tuple[Any, ...] | None  # pass back as after= for the next page
+
+
+def _tag_filter_sql(tag_ids: List[int]) -> Tuple[str, List[Any]]:
+    placeholders = ",".join(["?"] * len(tag_ids))
+    sql = f"""s.id IN (
+        SELECT st.standard_id
+        FROM standard_tags st
+        WHERE st.tag_id IN ({placeholders})
+        GROUP BY st.standard_id
+        HAVING COUNT(DISTINCT st.tag_id) = ?
+    )"""
+    return sql, [*tag_ids, len(tag_ids)]
+
+
+def search_standards(
+    con: sqlite3.Connection,
+    *,
+    q: str,
+    tag_ids: List[int],
+    limit: int = 50,
+    after: Tuple[Any, ...] | None = None,
+    facets: FacetIndex | None = None,
+) -> SearchPage:
+    """
+    One page of results (keyset pagination via after=).
+    - with a search term: bm25-ranked, rows carry rank + snippet
+    - without: ordered by pe_code, rank/snippet are NULL
+    - facets=: tag AND-filter comes from the in-memory bitsets instead of GROUP BY
+    """
+    match = build_fts_query(q)
+    limit = max(1, int(limit))
+    params: List[Any] = []
+    where: List[str] = []
+
+    if match:
+        weights = ", ".join(str(w) for w in BM25_WEIGHTS)
+        source = f"""
+        (
+          SELECT rowid AS id,
+                 bm25(standards_fts, {weights}) AS rank,
+                 snippet(standards_fts, -1, '**', '**', '…', {SNIPPET_TOKENS}) AS snippet
+          FROM standards_fts
+          WHERE standards_fts MATCH ?
+        ) h
+        JOIN standards s ON s.id = h.id
+        """
+        params.append(match)
+        select = "s.*, h.rank AS rank, h.snippet AS snippet"
+        order = "h.rank ASC, s.id ASC"
+        if after is not None:
+            where.append("(h.rank > ? OR (h.rank = ? AND s.id > ?))")
+            params.extend([after[0], after[0], after[1]])
+    else:
+        source = "standards s"
+        select = "s.*, NULL AS rank, NULL AS snippet"
+        order = "s.pe_code ASC"
+        if after is not None:
+            where.append("s.pe_code > ?")
+            params.append(after[0])
+
+    if tag_ids and facets is not None:
+        ids = facets.ids(facets.match(tag_ids))
+        if not ids:
+            return SearchPage(rows=[], ranked=bool(match), next_after=None)
+        where.append("s.id IN (SELECT value FROM json_each(?))")
+        params.append(json.dumps(ids))
+    elif tag_ids:
+        tag_sql, tag_params = _tag_filter_sql(tag_ids)
+        where.append(tag_sql)
+        params.extend(tag_params)
+
+    where_sql = ("WHERE " + " AND ".join(where)) if where else ""
+    sql = f"""
+    SELECT {select}
+    FROM {source}
+    {where_sql}
+    ORDER BY {order}
+    LIMIT ?;
+    """
+    params.append(limit + 1)  # one extra row tells us if there is a next page
+    rows = con.execute(sql, params).fetchall()
+
+    next_after: Tuple[Any, ...] | None = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_after = (last["rank"], int(last["id"])) if match else (last["pe_code"],)
+    return SearchPage(rows=rows, ranked=bool(match), next_after=next_after)
+
+
+def query_standards(
+    con: sqlite3.Connection,
+    *,
+    q: str,
+    tag_ids: List[int],
+    limit: int = 50,
+) -> List[sqlite3.Row]:
+    """First page only (kept for callers that just want rows)."""
+    return search_standards(con, q=q, tag_ids=tag_ids, limit=limit).rows
+
+
+def get_standard_tags(con: sqlite3.Connection, standard_id: int) -> List[sqlite3.Row]:
+    cur = con.execute(
+        """
+        SELECT t.tag_type, t.code, t.label, st.excerpt
+        FROM standard_tags st
+        JOIN tags t ON t.id = st.tag_id
+        WHERE st.standard_id=?
+        ORDER BY t.tag_type, t.label COLLATE NOCASE;
+        """,
+        (standard_id,),
+    )
+    return cur.fetchall()
+
+
+def get_demo_activities(con: sqlite3.Connection, standard_id: int) -> List[sqlite3.Row]:
+    cur = con.execute(
+        """
+        SELECT phase, activity_title, activity_text, materials, accommodations, sentence_starters, links
+        FROM demo_activities
+        WHERE standard_id=?
+        ORDER BY CASE phase
+          WHEN 'Engage' THEN 1
+          WHEN 'Explore' THEN 2
+          WHEN 'Explain' THEN 3
+          WHEN 'Elaborate' THEN 4
+          WHEN 'Evaluate' THEN 5
+          ELSE 99 END, activity_title COLLATE NOCASE;
+        """,
+        (standard_id,),
+    )
+    return cur.fetchall()
+
+
+# -----------------------------
+# 4) Facet index (tag -> bitset of standard ids)
+# -----------------------------
+def _bits_from_ids(ids: Iterable[int]) -> int:
+    ids = list(ids)
+    if not ids:
+        return 0
+    buf = bytearray(max(ids) // 8 + 1)
+    for i in ids:
+        buf[i >> 3] |= 1 << (i & 7)
+    return int.from_bytes(buf, "little")
+
+
+class FacetIndex:
+    """
+    In-memory tag facets for one DB, built once per process.
+    Each tag is a bitset (Python int, bit n = standard id n):
+    AND filtering is `&`, a "n matching" count is bit_count().
+    """
+
+    def __init__(self, data_version: int = -1) -> None:
+        self.bits: Dict[int, int] = {}
+        self.data_version = data_version
+        self._lock = threading.Lock()
+
+    @classmethod
+    def build(cls, con: sqlite3.Connection) -> "FacetIndex":
+        idx = cls(data_version=_data_version(con))
+        grouped: Dict[int, List[int]] = {}
+        for tag_id, standard_id in con.execute("SELECT tag_id, standard_id FROM standard_tags;"):
+            grouped.setdefault(int(tag_id), []).append(int(standard_id))
+        idx.bits = {tid: _bits_from_ids(sids) for tid, sids in grouped.items()}
+        return idx
+
+    def attach(self, pairs: Iterable[Tuple[int, int]]) -> None:
+        """Incremental update for (standard_id, tag_id) links."""
+        grouped: Dict[int, List[int]] = {}
+        for standard_id, tag_id in pairs:
+            grouped.setdefault(int(tag_id), []).append(int(standard_id))
+        with self._lock:
+            for tid, sids in grouped.items():
+                self.bits[tid] = self.bits.get(tid, 0) | _bits_from_ids(sids)
+
+    def match(self, tag_ids: Iterable[int], base: int | None = None) -> int | None:
+        """Bitset of standards having ALL tag_ids (and in base). None = unrestricted."""
+        out = base
+        for tid in tag_ids:
+            tb = self.bits.get(int(tid), 0)
+            out = tb if out is None else (out & tb)
+            if not out:
+                return 0
+        return out
+
+    def counts(self, tag_ids: Iterable[int], base: int | None = None) -> Dict[int, int]:
+        """{tag_id: how many standards in base also carry that tag}."""
+        if base is None:
+            return {int(t): self.bits.get(int(t), 0).bit_count() for t in tag_ids}
+        return {int(t): (self.bits.get(int(t), 0) & base).bit_count() for t in tag_ids}
+
+    @staticmethod
+    def ids(bits: int | None) -> List[int]:
+        """Sorted standard ids in a bitset."""
+        if not bits:
+            return []
+        raw = bits.to_bytes((bits.bit_length() + 7) // 8, "little")
+        out: List[int] = []
+        for byte_i, byte in enumerate(raw):
+            if byte:
+                base = byte_i << 3
+                out.extend(base + b for b in range(8) if byte >> b & 1)
+        return out
+
+
+_FACETS: Dict[int, FacetIndex] = {}
+
+
+def _data_version(con: sqlite3.Connection) -> int:
+    # changes only when ANOTHER connection (e.g. the CLI importer) commits
+    return int(con.execute("PRAGMA data_version;").fetchone()[0])
+
+
+def get_facet_index(con: sqlite3.Connection) -> FacetIndex:
+    """Cached facet index for con; rebuilt if another process changed the DB."""
+    idx = _FACETS.get(id(con))
+    if idx is None or idx.data_version != _data_version(con):
+        idx = FacetIndex.build(con)
+        _FACETS[id(con)] = idx
+    return idx
+
+
+def facets_attach(con: sqlite3.Connection, pairs: Iterable[Tuple[int, int]]) -> None:
+    """Keep an already-built index in step with our own writes (no-op otherwise)."""
+    idx = _FACETS.get(id(con))
+    if idx is not None:
+        idx.attach(pairs)
+
+
+def fts_bits(con: sqlite3.Connection, q: str) -> int | None:
+    """Bitset of ALL standards matching q (for facet counts). None = no search term."""
+    match = build_fts_query(q)
+    if not match:
+        return None
+    rows = con.execute("SELECT rowid FROM standards_fts WHERE standards_fts MATCH ?;", (match,))
+    return _bits_from_ids(int(r[0]) for r in rows)
+
+
+# -----------------------------
+# 5) Standard bundle (details pane): standard + tags + 5E activities, one query
+# -----------------------------
+BUNDLE_CACHE_SIZE = 256
+
+_BUNDLE_SQL = """
+SELECT s.*,
+  (
+    SELECT json_group_array(json_object('tag_type', x.tag_type, 'code', x.code, 'label', x.label, 'excerpt', x.excerpt))
+    FROM (
+      SELECT t.tag_type, t.code, t.label, st.excerpt
+      FROM standard_tags st
+      JOIN tags t ON t.id = st.tag_id
+      WHERE st.standard_id = s.id
+      ORDER BY t.tag_type, t.label COLLATE NOCASE
+    ) x
+  ) AS tags_json,
+  (
+    SELECT json_group_array(json_object(
+      'phase', a.phase, 'activity_title', a.activity_title, 'activity_text', a.activity_text,
+      'materials', a.materials, 'accommodations', a.accommodations,
+      'sentence_starters', a.sentence_starters, 'links', a.links))
+    FROM (
+      SELECT *
+      FROM demo_activities
+      WHERE standard_id = s.id
+      ORDER BY CASE phase
+        WHEN 'Engage' THEN 1
+        WHEN 'Explore' THEN 2
+        WHEN 'Explain' THEN 3
+        WHEN 'Elaborate' THEN 4
+        WHEN 'Evaluate' THEN 5
+        ELSE 99 END, activity_title COLLATE NOCASE
+    ) a
+  ) AS activities_json
+FROM standards s
+WHERE s.id = ?;
+"""
+
+_BUNDLES: "OrderedDict[Tuple[Any, ...], Dict[str, Any] | None]" = OrderedDict()
+_BUNDLES_LOCK = threading.Lock()
+
+
+def _db_stamp(con: sqlite3.Connection) -> Tuple[Any, ...]:
+    """
+    Changes whenever the DB content may have changed:
+    main file + WAL file (mtime, size) and this connection's own write count.
+    """
+    path = _CONNECTION_PATHS.get(id(con))
+    if path is None:
+        path = str(con.execute("PRAGMA database_list;").fetchone()["file"])
+    stamp: List[Any] = [path, con.total_changes]
+    for p in (path, path + "-wal"):
+        try:
+            stt = os.stat(p)
+            stamp.extend((stt.st_mtime_ns, stt.st_size))
+        except OSError:
+            stamp.extend((None, None))
+    return tuple(stamp)
+
+
+def load_standard_bundle(con: sqlite3.Connection, standard_id: int) -> Dict[str, Any] | None:
+    """
+    {"standard": {...}, "tags": [...], "activities": [...]} in ONE round trip.
+    None if the standard doesn't exist.
+    """
+    r = con.execute(_BUNDLE_SQL, (int(standard_id),)).fetchone()
+    if r is None:
+        return None
+    standard = {k: r[k] for k in r.keys() if k not in ("tags_json", "activities_json")}
+    return {
+        "standard": standard,
+        "tags": json.loads(r["tags_json"] or "[]"),
+        "activities": json.loads(r["activities_json"] or "[]"),
+    }
+
+
+def get_standard_bundle(con: sqlite3.Connection, standard_id: int) -> Dict[str, Any] | None:
+    """LRU-cached load_standard_bundle(), keyed by (db stamp, standard_id)."""
+    key = (_db_stamp(con), int(standard_id))
+    with _BUNDLES_LOCK:
+        if key in _BUNDLES:
+            _BUNDLES.move_to_end(key)
+            return _BUNDLES[key]
+    bundle = load_standard_bundle(con, standard_id)
+    with _BUNDLES_LOCK:
+        _BUNDLES[key] = bundle
+        while len(_BUNDLES) > BUNDLE_CACHE_SIZE:
+            _BUNDLES.popitem(last=False)
+    return bundle
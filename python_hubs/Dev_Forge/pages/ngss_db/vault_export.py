@@ -0,0 +1,228 @@
+# python_hubs/Dev_Forge/pages/ngss_db/vault_export.py
+# ============================================================
+# NGSS Vault — Streaming export (JSONL / CSV / optional Parquet)
+# - Walks the search result in keyset chunks (never the whole result in memory)
+# - Tags + 5E activities joined with ONE batched query per chunk (no N+1)
+# - Writers take any open stream/file, so memory stays flat while writing
+# - export_bytes(): download_button data callable (runs on click only); the
+#   finished file is read back as one bytes object for Streamlit
+# ============================================================
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+import sqlite3
+import tempfile
+from typing import IO, Any, Dict, Iterator, List
+
+from vault_db import FacetIndex, search_standards
+
+# --------------------------
+# Optional Parquet engine (pyarrow)
+# --------------------------
+PYARROW_OK = True
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except Exception:
+    PYARROW_OK = False
+
+
+EXPORT_FIELDS = (
+    "pe_code",
+    "domain_code",
+    "domain_title",
+    "topic_area",
+    "pe_statement",
+    "clarification_statement",
+    "assessment_boundary",
+    "connections",
+    "source_url",
+)
+
+EXPORT_FORMATS = {
+    "JSONL": ("ngss_results.jsonl", "application/x-ndjson"),
+    "CSV": ("ngss_results.csv", "text/csv"),
+    "Parquet": ("ngss_results.parquet", "application/vnd.apache.parquet"),
+}
+
+DEFAULT_CHUNK_SIZE = 500
+
+
+def _tags_for(con: sqlite3.Connection, ids_json: str) -> Dict[int, List[Dict[str, Any]]]:
+    out: Dict[int, List[Dict[str, Any]]] = {}
+    rows = con.execute(
+        """
+        SELECT st.standard_id, t.tag_type, t.code, t.label, st.excerpt
+        FROM standard_tags st
+        JOIN tags t ON t.id = st.tag_id
+        WHERE st.standard_id IN (SELECT value FROM json_each(?))
+        ORDER BY st.standard_id, t.tag_type, t.label COLLATE NOCASE;
+        """,
+        (ids_json,),
+    )
+    for r in rows:
+        out.setdefault(int(r["standard_id"]), []).append(
+            {"tag_type": r["tag_type"], "code": r["code"], "label": r["label"], "excerpt": r["excerpt"]}
+        )
+    return out
+
+
+def _activities_for(con: sqlite3.Connection, ids_json: str) -> Dict[int, List[Dict[str, Any]]]:
+    out: Dict[int, List[Dict[str, Any]]] = {}
+    rows = con.execute(
+        """
+        SELECT standard_id, phase, activity_title, activity_text, materials, accommodations, sentence_starters, links
+        FROM demo_activities
+        WHERE standard_id IN (SELECT value FROM json_each(?))
+        ORDER BY standard_id, CASE phase
+          WHEN 'Engage' THEN 1
+          WHEN 'Explore' THEN 2
+          WHEN 'Explain' THEN 3
+          WHEN 'Elaborate' THEN 4
+          WHEN 'Evaluate' THEN 5
+          ELSE 99 END, activity_title COLLATE NOCASE;
+        """,
+        (ids_json,),
+    )
+    for r in rows:
+        rec = dict(r)
+        out.setdefault(int(rec.pop("standard_id")), []).append(rec)
+    return out
+
+
+def iter_export_records(
+    con: sqlite3.Connection,
+    *,
+    q: str,
+    tag_ids: List[int],
+    facets: FacetIndex | None = None,
+    with_activities: bool = True,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[Dict[str, Any]]:
+    """Every matching standard (not just the visible page), in result order."""
+    after = None
+    while True:
+        page = search_standards(con, q=q, tag_ids=tag_ids, limit=chunk_size, after=after, facets=facets)
+        if not page.rows:
+            return
+        ids_json = json.dumps([int(r["id"]) for r in page.rows])
+        tags = _tags_for(con, ids_json)
+        acts = _activities_for(con, ids_json) if with_activities else {}
+        for r in page.rows:
+            sid = int(r["id"])
+            rec = {f: r[f] for f in EXPORT_FIELDS}
+            rec["tags"] = tags.get(sid, [])
+            if with_activities:
+                rec["activities"] = acts.get(sid, [])
+            yield rec
+        if page.next_after is None:
+            return
+        after = page.next_after
+
+
+# -----------------------------
+# Writers
+# -----------------------------
+def write_jsonl(records: Iterator[Dict[str, Any]], fp: IO[str]) -> int:
+    n = 0
+    for rec in records:
+        fp.write(json.dumps(rec, ensure_ascii=False))
+        fp.write("\n")
+        n += 1
+    return n
+
+
+def _flat_tags(tags: List[Dict[str, Any]]) -> str:
+    return "; ".join(f"{t['tag_type']}:{t['label']}" for t in tags)
+
+
+def write_csv(records: Iterator[Dict[str, Any]], fp: IO[str]) -> int:
+    """Tags flattened as 'TYPE:label; ...' (same shape vault_import reads back)."""
+    w = csv.writer(fp, quoting=csv.QUOTE_ALL)
+    header_done = False
+    n = 0
+    for rec in records:
+        extra = ["tags"] + (["activities"] if "activities" in rec else [])
+        if not header_done:
+            w.writerow([*EXPORT_FIELDS, *extra])
+            header_done = True
+        row = ["" if rec[f] is None else rec[f] for f in EXPORT_FIELDS]
+        row.append(_flat_tags(rec["tags"]))
+        if "activities" in rec:
+            row.append(json.dumps(rec["activities"], ensure_ascii=False) if rec["activities"] else "")
+        w.writerow(row)
+        n += 1
+    if not header_done:
+        w.writerow(EXPORT_FIELDS)
+    return n
+
+
+def write_parquet(records: Iterator[Dict[str, Any]], fp: IO[bytes], *, chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """One row group per chunk; tags/activities stored as JSON text columns."""
+    if not PYARROW_OK:
+        raise RuntimeError("Parquet export needs pyarrow (pip install pyarrow).")
+    names = [*EXPORT_FIELDS, "tags", "activities"]
+    schema = pa.schema([(name, pa.string()) for name in names])
+    n = 0
+    with pq.ParquetWriter(fp, schema) as writer:
+        cols: Dict[str, List[Any]] = {name: [] for name in names}
+
+        def flush() -> None:
+            if cols["pe_code"]:
+                writer.write_table(pa.table(cols, schema=schema))
+                for v in cols.values():
+                    v.clear()
+
+        for rec in records:
+            for f in EXPORT_FIELDS:
+                cols[f].append(rec[f])
+            cols["tags"].append(json.dumps(rec["tags"], ensure_ascii=False))
+            cols["activities"].append(json.dumps(rec.get("activities", []), ensure_ascii=False))
+            n += 1
+            if len(cols["pe_code"]) >= chunk_size:
+                flush()
+        flush()
+    return n
+
+
+def export_results(
+    con: sqlite3.Connection,
+    out: IO[bytes],
+    *,
+    fmt: str,
+    q: str,
+    tag_ids: List[int],
+    facets: FacetIndex | None = None,
+    with_activities: bool = True,
+) -> int:
+    """Streams the full result set into a BINARY stream/file. Returns rows written."""
+    records = iter_export_records(con, q=q, tag_ids=tag_ids, facets=facets, with_activities=with_activities)
+    if fmt == "Parquet":
+        return write_parquet(records, out)
+    if fmt not in ("JSONL", "CSV"):
+        raise ValueError(f"Unknown export format: {fmt}")
+    text = io.TextIOWrapper(out, encoding="utf-8", newline="")
+    try:
+        return write_jsonl(records, text) if fmt == "JSONL" else write_csv(records, text)
+    finally:
+        text.flush()
+        text.detach()
+
+
+def export_bytes(
+    con: sqlite3.Connection,
+    *,
+    fmt: str,
+    q: str,
+    tag_ids: List[int],
+    facets: FacetIndex | None = None,
+    with_activities: bool = True,
+) -> bytes:
+    """Streams the export into a temp file, then returns the finished file's bytes."""
+    with tempfile.TemporaryFile() as tmp:
+        export_results(con, tmp, fmt=fmt, q=q, tag_ids=tag_ids, facets=facets, with_activities=with_activities)
+        tmp.seek(0)
+        return tmp.read()
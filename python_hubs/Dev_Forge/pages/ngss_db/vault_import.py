@@ -0,0 +1,362 @@
+# python_hubs/Dev_Forge/pages/ngss_db/vault_import.py
+# ============================================================
+# NGSS Vault — Bulk importer (CLI + used by the vault page)
+# - Streams CSV / JSON / JSONL records (standards, tags, 5E activities)
+# - One transaction, executemany batches, tag ids from an in-memory map
+# - FTS triggers are dropped for the load; standards_fts is rebuilt ONCE at the end
+#
+# Record kinds (detected per record):
+#   standard  : pe_code + any of the standards columns
+#               optional "tags"       -> "SEP:Patterns; DCI:LS1.A: Structure and Function"
+#                                        or [{"tag_type","code","label","excerpt"}, ...]
+#               optional "activities" -> [{"phase","activity_title","activity_text",...}, ...]
+#   tag link  : pe_code + tag_type + label (+ code, excerpt)
+#   activity  : pe_code + phase + activity_title + activity_text (+ materials, ...)
+#
+# CLI:
+#   python vault_import.py standards.csv activities.jsonl --db ../ngss_ms_demo.db
+# ============================================================
+
+from __future__ import annotations
+
+import argparse
+import csv
+import io
+import json
+import sqlite3
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Any, Dict, Iterable, Iterator, List, Tuple
+
+from vault_db import FTS_TRIGGERS, facets_attach, get_connection, write_transaction
+
+DEFAULT_DB = Path(__file__).resolve().parent.parent / "ngss_ms_demo.db"
+DEFAULT_BATCH_SIZE = 500
+
+STANDARD_FIELDS = (
+    "pe_code",
+    "grade_band",
+    "topic_area",
+    "domain_code",
+    "domain_title",
+    "pe_statement",
+    "clarification_statement",
+    "assessment_boundary",
+    "connections",
+    "source_url",
+)
+
+ACTIVITY_FIELDS = (
+    "phase",
+    "activity_title",
+    "activity_text",
+    "materials",
+    "accommodations",
+    "sentence_starters",
+    "links",
+)
+
+_UPSERT_STANDARD_SQL = f"""
+INSERT INTO standards({", ".join(STANDARD_FIELDS)})
+VALUES ({", ".join("?" for _ in STANDARD_FIELDS)})
+ON CONFLICT(pe_code) DO UPDATE SET
+  {", ".join(f"{f}=excluded.{f}" for f in STANDARD_FIELDS if f != "pe_code")};
+"""
+
+
+@dataclass
+class ImportStats:
+    standards: int = 0
+    tags_created: int = 0
+    tag_links: int = 0
+    activities: int = 0
+    skipped: int = 0
+    seconds: float = 0.0
+
+    def summary(self) -> str:
+        return (
+            f"{self.standards} standard(s), {self.tag_links} tag link(s) "
+            f"({self.tags_created} new tag(s)), {self.activities} activit(ies), "
+            f"{self.skipped} skipped • {self.seconds:.2f}s"
+        )
+
+
+# -----------------------------
+# 1) Readers (streaming)
+# -----------------------------
+def _format_for(name: str) -> str:
+    suffix = Path(name).suffix.lower()
+    if suffix in (".jsonl", ".ndjson"):
+        return "jsonl"
+    if suffix == ".json":
+        return "json"
+    if suffix == ".csv":
+        return "csv"
+    raise ValueError(f"Unsupported file type: {name} (use .csv, .json or .jsonl)")
+
+
+def iter_records(fp: IO[str], fmt: str) -> Iterator[Dict[str, Any]]:
+    """Yields dict records from an open TEXT stream."""
+    if fmt == "csv":
+        for row in csv.DictReader(fp):
+            yield {k.strip(): v for k, v in row.items() if k}
+    elif fmt == "jsonl":
+        for line in fp:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+    elif fmt == "json":
+        # plain JSON has no record boundaries; a top-level list is loaded once
+        data = json.load(fp)
+        if isinstance(data, dict):
+            data = data.get("records") or data.get("standards") or [data]
+        yield from data
+    else:
+        raise ValueError(f"Unknown format: {fmt}")
+
+
+def iter_file_records(path: str | Path) -> Iterator[Dict[str, Any]]:
+    with open(path, "r", encoding="utf-8-sig", newline="") as fp:
+        yield from iter_records(fp, _format_for(str(path)))
+
+
+def iter_upload_records(name: str, raw: IO[bytes]) -> Iterator[Dict[str, Any]]:
+    """For Streamlit UploadedFile (binary, file-like)."""
+    text = io.TextIOWrapper(raw, encoding="utf-8-sig", newline="")
+    try:
+        yield from iter_records(text, _format_for(name))
+    finally:
+        text.detach()
+
+
+def _clean(v: Any) -> Any:
+    if isinstance(v, str):
+        v = v.strip()
+        return v or None
+    return v
+
+
+def _parse_tags(value: Any) -> List[Dict[str, Any]]:
+    """'SEP:Patterns; CCC:Scale' or a list of dicts/strings -> tag dicts."""
+    if not value:
+        return []
+    items = value if isinstance(value, list) else str(value).split(";")
+    out: List[Dict[str, Any]] = []
+    for item in items:
+        if isinstance(item, dict):
+            out.append(item)
+            continue
+        tag_type, sep, label = str(item).partition(":")
+        if sep and label.strip():
+            out.append({"tag_type": tag_type.strip().upper(), "label": label.strip()})
+    return out
+
+
+# -----------------------------
+# 2) Loader
+# -----------------------------
+class _BulkLoader:
+    def __init__(self, con: sqlite3.Connection, batch_size: int, stats: ImportStats):
+        self.con = con
+        self.batch_size = max(1, int(batch_size))
+        self.stats = stats
+        self.std_ids: Dict[str, int] = {
+            str(r["pe_code"]): int(r["id"]) for r in con.execute("SELECT id, pe_code FROM standards;")
+        }
+        self.tag_ids: Dict[Tuple[str, str], int] = {
+            (str(r["tag_type"]), str(r["label"])): int(r["id"])
+            for r in con.execute("SELECT id, tag_type, label FROM tags;")
+        }
+        self.std_batch: List[Tuple[Any, ...]] = []
+        self.link_batch: List[Tuple[str, Dict[str, Any]]] = []
+        self.act_batch: List[Tuple[str, Dict[str, Any]]] = []
+        self.attached: List[Tuple[int, int]] = []  # (standard_id, tag_id) for the facet index
+
+    # --- record routing
+    def add(self, rec: Dict[str, Any]) -> None:
+        rec = {k: _clean(v) for k, v in rec.items()}
+        pe_code = rec.get("pe_code")
+        if not pe_code:
+            self.stats.skipped += 1
+            return
+        pe_code = str(pe_code)
+
+        if rec.get("phase") and rec.get("activity_title") and not rec.get("pe_statement"):
+            self._queue(self.act_batch, (pe_code, rec))
+            return
+        if rec.get("tag_type") and rec.get("label") and not rec.get("pe_statement"):
+            self._queue(self.link_batch, (pe_code, rec))
+            return
+
+        if not rec.get("grade_band"):
+            rec["grade_band"] = pe_code.split("-", 1)[0] if "-" in pe_code else "MS"
+        self.std_batch.append(tuple(rec.get(f) for f in STANDARD_FIELDS))
+        for tag in _parse_tags(rec.get("tags")):
+            self._queue(self.link_batch, (pe_code, {k: _clean(v) for k, v in tag.items()}))
+        acts = rec.get("activities") or []
+        if isinstance(acts, str):  # CSV cell holding a JSON list (vault_export writes this)
+            acts = json.loads(acts)
+        for act in acts:
+            self._queue(self.act_batch, (pe_code, {k: _clean(v) for k, v in act.items()}))
+        if len(self.std_batch) >= self.batch_size:
+            self.flush_standards()
+
+    def _queue(self, batch: List[Tuple[str, Dict[str, Any]]], item: Tuple[str, Dict[str, Any]]) -> None:
+        batch.append(item)
+        if len(batch) >= self.batch_size:
+            self.flush()
+
+    # --- flushing
+    def flush_standards(self) -> None:
+        if not self.std_batch:
+            return
+        self.con.executemany(_UPSERT_STANDARD_SQL, self.std_batch)
+        codes = [row[0] for row in self.std_batch]
+        placeholders = ",".join("?" for _ in codes)
+        for r in self.con.execute(f"SELECT id, pe_code FROM standards WHERE pe_code IN ({placeholders});", codes):
+            self.std_ids[str(r["pe_code"])] = int(r["id"])
+        self.stats.standards += len(self.std_batch)
+        self.std_batch.clear()
+
+    def _tag_id(self, tag: Dict[str, Any]) -> int | None:
+        tag_type = str(tag.get("tag_type") or "").upper()
+        label = tag.get("label")
+        if not tag_type or not label:
+            return None
+        key = (tag_type, str(label))
+        tid = self.tag_ids.get(key)
+        if tid is not None:
+            return tid
+        cur = self.con.execute(
+            "INSERT OR IGNORE INTO tags(tag_type, code, label) VALUES (?,?,?);",
+            (tag_type, tag.get("code"), str(label)),
+        )
+        if cur.rowcount == 1:
+            tid = int(cur.lastrowid)
+            self.stats.tags_created += 1
+        else:  # same (tag_type, code) already exists under another label
+            row = self.con.execute(
+                "SELECT id FROM tags WHERE tag_type=? AND (label=? OR code=?);",
+                (tag_type, str(label), tag.get("code")),
+            ).fetchone()
+            if not row:
+                return None
+            tid = int(row["id"])
+        self.tag_ids[key] = tid
+        return tid
+
+    def flush(self) -> None:
+        # standards first so links/activities in the same batch can resolve ids
+        self.flush_standards()
+
+        links: List[Tuple[int, int, Any]] = []
+        for pe_code, tag in self.link_batch:
+            sid = self.std_ids.get(pe_code)
+            tid = self._tag_id(tag)
+            if sid is None or tid is None:
+                self.stats.skipped += 1
+                continue
+            links.append((sid, tid, tag.get("excerpt")))
+        if links:
+            cur = self.con.executemany(
+                "INSERT OR IGNORE INTO standard_tags(standard_id, tag_id, excerpt) VALUES (?,?,?);",
+                links,
+            )
+            self.stats.tag_links += max(cur.rowcount, 0)
+            self.attached.extend((sid, tid) for sid, tid, _ in links)
+        self.link_batch.clear()
+
+        acts: List[Tuple[Any, ...]] = []
+        for pe_code, act in self.act_batch:
+            sid = self.std_ids.get(pe_code)
+            if sid is None or not act.get("phase") or not act.get("activity_title"):
+                self.stats.skipped += 1
+                continue
+            acts.append((sid, *(act.get(f) or ("" if f == "activity_text" else None) for f in ACTIVITY_FIELDS)))
+        if acts:
+            # re-importing the same (standard, phase, title) replaces it instead of duplicating
+            self.con.executemany(
+                # idx_demo_phase is far less selective; without stats the planner may pick it
+                "DELETE FROM demo_activities INDEXED BY idx_demo_std "
+                "WHERE standard_id=? AND phase=? AND activity_title=?;",
+                [a[:3] for a in acts],
+            )
+            self.con.executemany(
+                f"""
+                INSERT INTO demo_activities(standard_id, {", ".join(ACTIVITY_FIELDS)})
+                VALUES (?{",?" * len(ACTIVITY_FIELDS)});
+                """,
+                acts,
+            )
+            self.stats.activities += len(acts)
+        self.act_batch.clear()
+
+
+def bulk_import(
+    con: sqlite3.Connection,
+    records: Iterable[Dict[str, Any]],
+    *,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> ImportStats:
+    """
+    Loads records in ONE transaction (all-or-nothing).
+    FTS triggers are dropped for the load and restored before commit;
+    standards_fts is rebuilt once.
+    """
+    stats = ImportStats()
+    t0 = time.perf_counter()
+    with write_transaction(con):
+        # explicit BEGIN so the trigger DDL is part of the transaction too
+        if not con.in_transaction:
+            con.execute("BEGIN;")
+        for name in FTS_TRIGGERS:
+            con.execute(f"DROP TRIGGER IF EXISTS {name};")
+
+        loader = _BulkLoader(con, batch_size, stats)
+        for rec in records:
+            if isinstance(rec, dict):
+                loader.add(rec)
+            else:
+                stats.skipped += 1
+        loader.flush()
+
+        con.execute("INSERT INTO standards_fts(standards_fts) VALUES ('rebuild');")
+        for sql in FTS_TRIGGERS.values():
+            con.execute(sql)
+    facets_attach(con, loader.attached)  # only after commit, so a rollback can't leak links
+    con.execute("PRAGMA optimize;")  # refresh planner stats after a big load
+    stats.seconds = time.perf_counter() - t0
+    return stats
+
+
+def import_files(
+    db_path: str | Path,
+    paths: Iterable[str | Path],
+    *,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> ImportStats:
+    def records() -> Iterator[Dict[str, Any]]:
+        for p in paths:
+            yield from iter_file_records(p)
+
+    return bulk_import(get_connection(db_path), records(), batch_size=batch_size)
+
+
+# -----------------------------
+# 3) CLI
+# -----------------------------
+def main(argv: List[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description="Bulk-load NGSS standards / tags / 5E activities into the vault DB.")
+    ap.add_argument("files", nargs="+", help=".csv, .json or .jsonl files (loaded in order)")
+    ap.add_argument("--db", default=str(DEFAULT_DB), help=f"SQLite file (default: {DEFAULT_DB})")
+    ap.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    args = ap.parse_args(argv)
+
+    stats = import_files(args.db, args.files, batch_size=args.batch_size)
+    print(f"Imported into {args.db}: {stats.summary()}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
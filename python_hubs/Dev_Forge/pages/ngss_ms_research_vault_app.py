@@ -13,13 +13,28 @@
 
 from __future__ import annotations
 
-import json
 import sqlite3
-from typing import Any, Dict, List, Tuple
+import sys
+from functools import partial
+from typing import Dict, List, Tuple
 
 from pathlib import Path
 import streamlit as st
 
+# DB layer lives in ngss_db/vault_db.py (imported module => connection cache survives reruns)
+sys.path.insert(0, str(Path(__file__).resolve().with_name("ngss_db")))
+from vault_db import (  # noqa: E402
+    db_seed_demo_if_empty,
+    fts_bits,
+    get_connection,
+    get_facet_index,
+    get_standard_bundle,
+    list_tags,
+    search_standards,
+)
+from vault_export import EXPORT_FORMATS, PYARROW_OK, export_bytes  # noqa: E402
+from vault_import import bulk_import, iter_upload_records  # noqa: E402
+
 
 # -----------------------------
 # 0) Signature Theme Injector (condensed) — KEEP
@@ -103,363 +118,8 @@ def apply_signature_theme(
 
 
 # -----------------------------
-# 1) DB: schema (extends your original with demo_activities)
+# 1) DB: schema + queries moved to ngss_db/vault_db.py
 # -----------------------------
-SCHEMA_SQL = """
-PRAGMA foreign_keys = ON;
-
-CREATE TABLE IF NOT EXISTS standards (
-  id INTEGER PRIMARY KEY AUTOINCREMENT,
-  pe_code TEXT NOT NULL UNIQUE,
-  grade_band TEXT NOT NULL DEFAULT 'MS',
-  topic_area TEXT,
-  domain_code TEXT,
-  domain_title TEXT,
-  pe_statement TEXT,
-  clarification_statement TEXT,
-  assessment_boundary TEXT,
-  connections TEXT,
-  source_url TEXT
-);
-
-CREATE TABLE IF NOT EXISTS tags (
-  id INTEGER PRIMARY KEY AUTOINCREMENT,
-  tag_type TEXT NOT NULL,
-  code TEXT,
-  label TEXT NOT NULL,
-  UNIQUE(tag_type, label),
-  UNIQUE(tag_type, code)
-);
-
-CREATE TABLE IF NOT EXISTS standard_tags (
-  standard_id INTEGER NOT NULL,
-  tag_id INTEGER NOT NULL,
-  excerpt TEXT,
-  PRIMARY KEY (standard_id, tag_id),
-  FOREIGN KEY (standard_id) REFERENCES standards(id) ON DELETE CASCADE,
-  FOREIGN KEY (tag_id) REFERENCES tags(id) ON DELETE CASCADE
-);
-
--- DEMO activity variables
-CREATE TABLE IF NOT EXISTS demo_activities (
-  id INTEGER PRIMARY KEY AUTOINCREMENT,
-  standard_id INTEGER NOT NULL,
-  phase TEXT NOT NULL,
-  activity_title TEXT NOT NULL,
-  activity_text TEXT NOT NULL,
-  materials TEXT,
-  accommodations TEXT,
-  sentence_starters TEXT,
-  links TEXT,
-  FOREIGN KEY (standard_id) REFERENCES standards(id) ON DELETE CASCADE
-);
-
-CREATE INDEX IF NOT EXISTS idx_standards_pe ON standards(pe_code);
-CREATE INDEX IF NOT EXISTS idx_tags_type_label ON tags(tag_type, label);
-CREATE INDEX IF NOT EXISTS idx_join_tag ON standard_tags(tag_id);
-CREATE INDEX IF NOT EXISTS idx_join_std ON standard_tags(standard_id);
-CREATE INDEX IF NOT EXISTS idx_demo_std ON demo_activities(standard_id);
-CREATE INDEX IF NOT EXISTS idx_demo_phase ON demo_activities(phase);
-
--- Optional FTS (if FTS5 exists)
-CREATE VIRTUAL TABLE IF NOT EXISTS standards_fts
-USING fts5(
-  pe_code,
-  domain_title,
-  pe_statement,
-  clarification_statement,
-  assessment_boundary,
-  connections,
-  content='standards',
-  content_rowid='id'
-);
-
-CREATE TRIGGER IF NOT EXISTS standards_ai AFTER INSERT ON standards BEGIN
-  INSERT INTO standards_fts(rowid, pe_code, domain_title, pe_statement, clarification_statement, assessment_boundary, connections)
-  VALUES (new.id, new.pe_code, new.domain_title, new.pe_statement, new.clarification_statement, new.assessment_boundary, new.connections);
-END;
-
-CREATE TRIGGER IF NOT EXISTS standards_au AFTER UPDATE ON standards BEGIN
-  UPDATE standards_fts SET
-    pe_code=new.pe_code,
-    domain_title=new.domain_title,
-    pe_statement=new.pe_statement,
-    clarification_statement=new.clarification_statement,
-    assessment_boundary=new.assessment_boundary,
-    connections=new.connections
-  WHERE rowid=new.id;
-END;
-
-CREATE TRIGGER IF NOT EXISTS standards_ad AFTER DELETE ON standards BEGIN
-  DELETE FROM standards_fts WHERE rowid=old.id;
-END;
-"""
-
-
-def db_connect(db_path: str) -> sqlite3.Connection:
-    con = sqlite3.connect(db_path, check_same_thread=False)
-    con.row_factory = sqlite3.Row
-    return con
-
-
-def db_init(con: sqlite3.Connection) -> None:
-    con.executescript(SCHEMA_SQL)
-    con.commit()
-
-
-def db_has_data(con: sqlite3.Connection) -> bool:
-    cur = con.execute("SELECT COUNT(*) AS n FROM standards;")
-    return int(cur.fetchone()["n"]) > 0
-
-
-def _upsert_tag(con: sqlite3.Connection, tag_type: str, code: str | None, label: str) -> int:
-    con.execute(
-        "INSERT OR IGNORE INTO tags(tag_type, code, label) VALUES (?,?,?)",
-        (tag_type, code, label),
-    )
-    row = con.execute(
-        "SELECT id FROM tags WHERE tag_type=? AND label=?",
-        (tag_type, label),
-    ).fetchone()
-    return int(row["id"])
-
-
-def _attach_tag(con: sqlite3.Connection, pe_code: str, tag_id: int, excerpt: str | None = None) -> None:
-    sid = con.execute("SELECT id FROM standards WHERE pe_code=?", (pe_code,)).fetchone()
-    if not sid:
-        return
-    con.execute(
-        "INSERT OR IGNORE INTO standard_tags(standard_id, tag_id, excerpt) VALUES (?,?,?)",
-        (int(sid["id"]), int(tag_id), excerpt),
-    )
-
-
-def _insert_demo_activity(
-    con: sqlite3.Connection,
-    pe_code: str,
-    phase: str,
-    title: str,
-    text: str,
-    materials: str = "",
-    accommodations: str = "",
-    sentence_starters: str = "",
-    links: str = "",
-) -> None:
-    sid = con.execute("SELECT id FROM standards WHERE pe_code=?", (pe_code,)).fetchone()
-    if not sid:
-        return
-    con.execute(
-        """
-        INSERT INTO demo_activities(standard_id, phase, activity_title, activity_text, materials, accommodations, sentence_starters, links)
-        VALUES (?,?,?,?,?,?,?,?)
-        """,
-        (int(sid["id"]), phase, title, text, materials, accommodations, sentence_starters, links),
-    )
-
-
-def db_seed_demo_if_empty(con: sqlite3.Connection) -> bool:
-    """
-    Seeds exactly 2 standards + demo activities if DB is empty.
-    Returns True if seeded.
-    """
-    if db_has_data(con):
-        return False
-
-    # ---- Standards (lightweight demo seed based on NGSS page wording)
-    con.execute(
-        """
-        INSERT INTO standards(pe_code, grade_band, topic_area, domain_code, domain_title,
-                              pe_statement, clarification_statement, assessment_boundary, connections, source_url)
-        VALUES (?,?,?,?,?,?,?,?,?,?)
-        """,
-        (
-            "MS-LS1-1",
-            "MS",
-            "Life Science",
-            "MS-LS1",
-            "From Molecules to Organisms: Structures and Processes",
-            "Conduct an investigation to provide evidence that living things are made of cells; either one cell or many different numbers and types of cells.",
-            "Emphasis is on developing evidence that living things are made of cells, distinguishing between living and non-living things, and understanding that living things may be made of one cell or many and varied cells.",
-            None,
-            "Connections to engineering/technology and CCSS are available on the NGSS page.",
-            "https://www.nextgenscience.org/pe/ms-ls1-1-molecules-organisms-structures-and-processes",
-        ),
-    )
-
-    con.execute(
-        """
-        INSERT INTO standards(pe_code, grade_band, topic_area, domain_code, domain_title,
-                              pe_statement, clarification_statement, assessment_boundary, connections, source_url)
-        VALUES (?,?,?,?,?,?,?,?,?,?)
-        """,
-        (
-            "MS-ESS1-1",
-            "MS",
-            "Earth & Space Science",
-            "MS-ESS1",
-            "Earth's Place in the Universe",
-            "Develop and use a model of the Earth-sun-moon system to describe the cyclic patterns of lunar phases, eclipses of the sun and moon, and seasons.",
-            "Examples of models can be physical, graphical, or conceptual.",
-            None,
-            "Connections to other DCIs and CCSS are available on the NGSS page.",
-            "https://www.nextgenscience.org/pe/ms-ess1-1-earths-place-universe",
-        ),
-    )
-
-    # ---- Minimal tags (so filters work)
-    sep_models = _upsert_tag(con, "SEP", "SEP-MODEL", "Developing and Using Models")
-    sep_invest = _upsert_tag(con, "SEP", "SEP-INV", "Planning and Carrying Out Investigations")
-    ccc_patterns = _upsert_tag(con, "CCC", "CCC-PAT", "Patterns")
-    ccc_scale = _upsert_tag(con, "CCC", "CCC-SCALE", "Scale, Proportion, and Quantity")
-    dci_ls1a = _upsert_tag(con, "DCI", "LS1.A", "LS1.A: Structure and Function")
-    dci_ess1b = _upsert_tag(con, "DCI", "ESS1.B", "ESS1.B: Earth and the Solar System")
-
-    _attach_tag(con, "MS-LS1-1", sep_invest)
-    _attach_tag(con, "MS-LS1-1", ccc_scale)
-    _attach_tag(con, "MS-LS1-1", dci_ls1a)
-
-    _attach_tag(con, "MS-ESS1-1", sep_models)
-    _attach_tag(con, "MS-ESS1-1", ccc_patterns)
-    _attach_tag(con, "MS-ESS1-1", dci_ess1b)
-
-    # ---- Demo activity variables (5E) — short, practical
-    # MS-LS1-1
-    _insert_demo_activity(
-        con, "MS-LS1-1", "Engage",
-        "Living vs Nonliving Evidence Sort",
-        "Show 6 images (plant, rock, mushroom, flame, bacteria, robot). Students sort living/nonliving and give one piece of evidence.",
-        materials="Image set, sticky notes/whiteboards.",
-        accommodations="2-choice cards; allow oral response; sentence starters.",
-        sentence_starters="I think it is living because ____. / My evidence is ____.",
-    )
-    _insert_demo_activity(
-        con, "MS-LS1-1", "Explore",
-        "Cell Hunt Station Lab",
-        "Stations: microscope slides OR photo cards. Students record 3 observations per station to support the claim living things are made of cells.",
-        materials="Slides/photos, microscopes OR station cards, lab sheet.",
-        accommodations="Pre-labeled diagrams; reduced stations; partner roles.",
-        sentence_starters="I observed ____. This supports the claim because ____.",
-    )
-    _insert_demo_activity(
-        con, "MS-LS1-1", "Explain",
-        "CER Mini-Write",
-        "Students write a short CER: Claim (cells), Evidence (observations), Reasoning (why evidence supports claim).",
-        materials="CER template + word bank.",
-        accommodations="Fill-in-the-blank CER; bullets; speech-to-text.",
-        sentence_starters="Claim: ____. Evidence: ____. Reasoning: ____.",
-    )
-
-    # MS-ESS1-1
-    _insert_demo_activity(
-        con, "MS-ESS1-1", "Engage",
-        "Moon Photo Pattern Notice",
-        "Show a montage of moon photos across a month. Students predict what causes the repeating pattern.",
-        materials="Moon photo set (slides).",
-        accommodations="Word bank (shape/position/brightness).",
-        sentence_starters="I notice ____. The pattern might be caused by ____.",
-    )
-    _insert_demo_activity(
-        con, "MS-ESS1-1", "Explore",
-        "Lamp + Ball Model",
-        "Model Sun (lamp), Earth (ball), Moon (ping pong). Students generate a phase sequence and sketch 4 positions as ‘data.’",
-        materials="Lamp, balls, ping pong, dark space, lab sheet.",
-        accommodations="Labeled diagram frames; assigned roles.",
-        sentence_starters="When the Moon is here, we see ____. This happens because ____.",
-    )
-    _insert_demo_activity(
-        con, "MS-ESS1-1", "Explain",
-        "Model-to-Claim (Phases + Seasons)",
-        "Students use model data to write claims about phases and seasons (tilt + sunlight). Add one diagram per claim.",
-        materials="Claim/diagram template, vocab bank (orbit, tilt, axis).",
-        accommodations="Sentence frames; diagram arrows/stickers.",
-        sentence_starters="My claim is ____. My model shows ____. Therefore ____.",
-    )
-
-    con.commit()
-    return True
-
-
-def list_tags(con: sqlite3.Connection, tag_type: str) -> List[Tuple[int, str]]:
-    cur = con.execute(
-        "SELECT id, label FROM tags WHERE tag_type=? ORDER BY label COLLATE NOCASE;",
-        (tag_type,),
-    )
-    return [(int(r["id"]), str(r["label"])) for r in cur.fetchall()]
-
-
-def query_standards(
-    con: sqlite3.Connection,
-    *,
-    q: str,
-    tag_ids: List[int],
-    limit: int = 50,
-) -> List[sqlite3.Row]:
-    params: List[Any] = []
-    where: List[str] = []
-
-    use_fts = bool(q.strip())
-    if use_fts:
-        where.append("s.id IN (SELECT rowid FROM standards_fts WHERE standards_fts MATCH ?)")
-        params.append(q.strip())
-
-    if tag_ids:
-        placeholders = ",".join(["?"] * len(tag_ids))
-        where.append(
-            f"""s.id IN (
-                SELECT st.standard_id
-                FROM standard_tags st
-                WHERE st.tag_id IN ({placeholders})
-                GROUP BY st.standard_id
-                HAVING COUNT(DISTINCT st.tag_id) = ?
-            )"""
-        )
-        params.extend(tag_ids)
-        params.append(len(tag_ids))
-
-    where_sql = ("WHERE " + " AND ".join(where)) if where else ""
-    sql = f"""
-    SELECT s.*
-    FROM standards s
-    {where_sql}
-    ORDER BY s.pe_code ASC
-    LIMIT ?;
-    """
-    params.append(int(limit))
-    cur = con.execute(sql, params)
-    return cur.fetchall()
-
-
-def get_standard_tags(con: sqlite3.Connection, standard_id: int) -> List[sqlite3.Row]:
-    cur = con.execute(
-        """
-        SELECT t.tag_type, t.code, t.label, st.excerpt
-        FROM standard_tags st
-        JOIN tags t ON t.id = st.tag_id
-        WHERE st.standard_id=?
-        ORDER BY t.tag_type, t.label COLLATE NOCASE;
-        """,
-        (standard_id,),
-    )
-    return cur.fetchall()
-
-
-def get_demo_activities(con: sqlite3.Connection, standard_id: int) -> List[sqlite3.Row]:
-    cur = con.execute(
-        """
-        SELECT phase, activity_title, activity_text, materials, accommodations, sentence_starters, links
-        FROM demo_activities
-        WHERE standard_id=?
-        ORDER BY CASE phase
-          WHEN 'Engage' THEN 1
-          WHEN 'Explore' THEN 2
-          WHEN 'Explain' THEN 3
-          WHEN 'Elaborate' THEN 4
-          WHEN 'Evaluate' THEN 5
-          ELSE 99 END, activity_title COLLATE NOCASE;
-        """,
-        (standard_id,),
-    )
-    return cur.fetchall()
 
 
 # -----------------------------
@@ -477,6 +137,8 @@ def refresh_view(prefix: str = "vault") -> None:
         f"{prefix}_sel_ela",
         f"{prefix}_sel_math",
         f"{prefix}_phase_pick",
+        f"{prefix}_page_stack",
+        f"{prefix}_page_sig",
     ]
     for k in wipe:
         if k in st.session_state:
@@ -527,18 +189,44 @@ with st.sidebar:
             refresh_view(prefix="vault")
             st.rerun()
     with colB:
-        limit = st.number_input("Limit", min_value=10, max_value=500, value=50, step=10, key="vault_limit")
+        limit = st.number_input("Page size", min_value=10, max_value=500, value=50, step=10, key="vault_limit")
 
-    st.caption("Search uses FTS when available. Tag filters require ALL selected tags (AND).")
+    st.caption(
+        "Search is ranked by relevance (code + statement weigh most). End a word with * for prefix search (cell*). "
+        "Tag filters require ALL selected tags (AND)."
+    )
 
-# Connect + init + seed
-con = db_connect(db_path)
-db_init(con)
+# Shared connection (opened + schema-checked once per DB file per process)
+con = get_connection(db_path)
 
 seeded = db_seed_demo_if_empty(con)
 if seeded:
     st.success("Seeded demo database with 2 standards + demo activities.")
 
+with st.sidebar:
+    with st.expander("📥 Bulk import (CSV / JSON / JSONL)"):
+        st.caption(
+            "Standards (pe_code + columns, optional tags like 'SEP:Patterns; CCC:Scale'), "
+            "tag links (pe_code, tag_type, label) or 5E activities (pe_code, phase, activity_title, activity_text)."
+        )
+        uploads = st.file_uploader(
+            "Files",
+            type=["csv", "json", "jsonl"],
+            accept_multiple_files=True,
+            key=f"vault_import_files_{st.session_state.get('vault_nonce', 0)}",
+        )
+        if st.button("Import", disabled=not uploads, key="vault_import_go"):
+            def _records():
+                for up in uploads:
+                    yield from iter_upload_records(up.name, up)
+
+            try:
+                stats = bulk_import(con, _records())
+            except (ValueError, KeyError, TypeError, sqlite3.Error) as e:
+                st.error(f"Import failed (nothing was changed): {e}")
+            else:
+                st.success(f"Imported {stats.summary()}")
+
 # Load tags (may be empty except demo)
 seps = list_tags(con, "SEP")
 dcis = list_tags(con, "DCI")
@@ -556,31 +244,68 @@ with left:
     q = st.text_input("Keyword search (FTS)", value=st.session_state.get("vault_q", ""), key="vault_q")
     st.caption("Tip: try MS-ESS1-1 or MS-LS1-1, or search 'cells' / 'moon' / 'seasons'.")
 
-    sel_sep = st.multiselect("SEPs", options=seps, format_func=lambda x: x[1], key="vault_sel_sep")
-    sel_dci = st.multiselect("DCIs", options=dcis, format_func=lambda x: x[1], key="vault_sel_dci")
-    sel_ccc = st.multiselect("CCCs", options=cccs, format_func=lambda x: x[1], key="vault_sel_ccc")
+    # Live "n matching" counts from the in-memory facet index (selection + search)
+    facets = get_facet_index(con)
+    picked = [
+        int(t[0])
+        for k in ("vault_sel_sep", "vault_sel_dci", "vault_sel_ccc", "vault_sel_conn", "vault_sel_ela", "vault_sel_math")
+        for t in st.session_state.get(k, [])
+    ]
+    facet_base = facets.match(picked, base=fts_bits(con, q))
+    facet_counts = facets.counts([t[0] for t in (*seps, *dcis, *cccs, *conns, *elas, *maths)], base=facet_base)
+
+    def fmt_tag(x: Tuple[int, str]) -> str:
+        return f"{x[1]} ({facet_counts.get(int(x[0]), 0)} matching)"
+
+    sel_sep = st.multiselect("SEPs", options=seps, format_func=fmt_tag, key="vault_sel_sep")
+    sel_dci = st.multiselect("DCIs", options=dcis, format_func=fmt_tag, key="vault_sel_dci")
+    sel_ccc = st.multiselect("CCCs", options=cccs, format_func=fmt_tag, key="vault_sel_ccc")
 
     with st.expander("More filters"):
-        sel_conn = st.multiselect("Connections", options=conns, format_func=lambda x: x[1], key="vault_sel_conn")
-        sel_ela = st.multiselect("ELA", options=elas, format_func=lambda x: x[1], key="vault_sel_ela")
-        sel_math = st.multiselect("Math", options=maths, format_func=lambda x: x[1], key="vault_sel_math")
+        sel_conn = st.multiselect("Connections", options=conns, format_func=fmt_tag, key="vault_sel_conn")
+        sel_ela = st.multiselect("ELA", options=elas, format_func=fmt_tag, key="vault_sel_ela")
+        sel_math = st.multiselect("Math", options=maths, format_func=fmt_tag, key="vault_sel_math")
 
     tag_ids: List[int] = []
     for group in (sel_sep, sel_dci, sel_ccc, sel_conn, sel_ela, sel_math):
         tag_ids.extend([int(t[0]) for t in group])
 
-    rows = query_standards(con, q=q, tag_ids=tag_ids, limit=int(limit))
+    # Keyset paging: stack of "after" cursors, reset whenever the search changes
+    page_sig = (q.strip(), tuple(sorted(tag_ids)), int(limit))
+    if st.session_state.get("vault_page_sig") != page_sig:
+        st.session_state["vault_page_sig"] = page_sig
+        st.session_state["vault_page_stack"] = [None]
+    page_stack = st.session_state["vault_page_stack"]
+
+    page = search_standards(con, q=q, tag_ids=tag_ids, limit=int(limit), after=page_stack[-1], facets=facets)
+    rows = page.rows
 
     st.markdown(
         f"<div class='overlay-card'><div class='overlay-text'>RESEARCH</div>"
         f"<div style='font-weight:900;'>Results</div>"
-        f"<div class='muted' style='margin-top:4px;'>{len(rows)} match(es)</div></div>",
+        f"<div class='muted' style='margin-top:4px;'>"
+        f"{len(rows)} match(es) • page {len(page_stack)}{' • ranked' if page.ranked else ''}</div></div>",
         unsafe_allow_html=True,
     )
 
+    colP, colN = st.columns(2)
+    with colP:
+        if st.button("⬅️ Previous", disabled=len(page_stack) <= 1, key="vault_prev_page"):
+            page_stack.pop()
+            st.rerun()
+    with colN:
+        if st.button("Next ➡️", disabled=page.next_after is None, key="vault_next_page"):
+            page_stack.append(page.next_after)
+            st.rerun()
+
     if not rows:
         st.info("No matches. Clear tags or search term.")
     else:
+        if page.ranked:
+            with st.expander("Top hits", expanded=True):
+                for r in rows[:10]:
+                    st.markdown(f"**{r['pe_code']}** — {r['snippet'] or ''}")
+
         options = [(int(r["id"]), f'{r["pe_code"]} — {r["domain_title"] or ""}'.strip(" —")) for r in rows]
         selected = st.selectbox(
             "Select a standard",
@@ -590,43 +315,22 @@ with left:
         )
         st.session_state["vault_sel_standard_id"] = int(selected[0])
 
-        export_rows = [
-            {
-                "pe_code": r["pe_code"],
-                "domain_code": r["domain_code"],
-                "domain_title": r["domain_title"],
-                "topic_area": r["topic_area"],
-                "pe_statement": r["pe_statement"],
-                "clarification_statement": r["clarification_statement"],
-                "assessment_boundary": r["assessment_boundary"],
-                "connections": r["connections"],
-                "source_url": r["source_url"],
-            }
-            for r in rows
-        ]
-
-        export_json = json.dumps(export_rows, indent=2, ensure_ascii=False)
-        st.download_button(
-            "⬇️ Export results (JSON)",
-            data=export_json,
-            file_name="ngss_results.json",
-            mime="application/json",
-        )
-
-        if export_rows:
-            headers = list(export_rows[0].keys())
-            csv_lines = [",".join(headers)]
-            for rr in export_rows:
-                row = []
-                for h in headers:
-                    val = "" if rr[h] is None else str(rr[h]).replace('"', '""')
-                    row.append(f'"{val}"')
-                csv_lines.append(",".join(row))
+        with st.expander("⬇️ Export results (all pages)"):
+            export_formats = [f for f in EXPORT_FORMATS if f != "Parquet" or PYARROW_OK]
+            exp_fmt = st.radio("Format", export_formats, horizontal=True, key="vault_export_fmt")
+            with_acts = st.checkbox("Include tags + 5E activities", value=True, key="vault_export_acts")
+            # built on click only (deferred data): rows streamed in chunks to a temp file,
+            # the finished file is then handed to Streamlit as bytes
+            file_name, mime = EXPORT_FORMATS[exp_fmt]
             st.download_button(
-                "⬇️ Export results (CSV)",
-                data="\n".join(csv_lines),
-                file_name="ngss_results.csv",
-                mime="text/csv",
+                f"⬇️ Download results ({exp_fmt})",
+                data=partial(
+                    export_bytes, con, fmt=exp_fmt, q=q, tag_ids=list(tag_ids), facets=facets, with_activities=with_acts
+                ),
+                file_name=file_name,
+                mime=mime,
+                key="vault_export_go",
+                on_click="ignore",
             )
 
 with right:
@@ -636,10 +340,12 @@ with right:
     if sid <= 0:
         st.info("Select a standard on the left.")
     else:
-        r = con.execute("SELECT * FROM standards WHERE id=?", (sid,)).fetchone()
-        if not r:
+        # standard + tags + 5E activities in one round trip (LRU-cached per DB state)
+        bundle = get_standard_bundle(con, sid)
+        if not bundle:
             st.error("Selected item not found.")
         else:
+            r = bundle["standard"]
             st.markdown(
                 f"""
                 <div class="card">
@@ -683,7 +389,7 @@ with right:
                 st.markdown("#### 5E activity variables (demo)")
                 st.caption("Pick a phase → copy/paste into Ms. Piluso Science or your lesson doc.")
 
-                acts = get_demo_activities(con, int(r["id"]))
+                acts = bundle["activities"]
                 if not acts:
                     st.info("No demo activities for this standard.")
                 else:
@@ -721,7 +427,7 @@ with right:
 
             with tabs[2]:
                 st.markdown("#### Tags")
-                tags_rows = get_standard_tags(con, int(r["id"]))
+                tags_rows = bundle["tags"]
                 if not tags_rows:
                     st.caption("No tags attached yet (demo is minimal).")
                 else:
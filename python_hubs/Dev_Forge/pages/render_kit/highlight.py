@@ -0,0 +1,311 @@
+# python_hubs/Dev_Forge/pages/render_kit/highlight.py
+# ============================================================
+# DevForge — Syntax highlighting for code cards (image / HTML / SVG)
+# Used by Code_Library (code_library/block_render.py) and BlockForge.
+# - Small regex lexers per code_format (python, html, css, javascript,
+#   json, markdown; anything else = plain) -> no extra dependency
+# - Token stream cached by (sha256 of code, code_format): a block is
+#   tokenized once, every export/rerun after that reuses the runs
+# - Runs are word-wrapped like the plain renderer (whitespace kept at the
+#   break so the runs still line up)
+# - Images: one draw call per colour (rows of other colours masked out),
+#   not one per span
+# Lives in render_kit/ (not pages/) so Streamlit doesn't list it as a page
+# and the caches survive reruns.
+# ============================================================
+
+from __future__ import annotations
+
+import hashlib
+import html
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from PIL import ImageDraw
+
+from text_render import get_font, mono_advance, text_width, wrap_line
+
+# bump when a lexer changes (cached token streams are keyed by it)
+LEXER_VERSION = "2"
+
+TAB_SIZE = 4
+TOKEN_CACHE_MAX = 1024
+
+# token kind -> colour on the white card body
+THEME = {
+    "plain": "#111827",
+    "kw": "#CF222E",
+    "builtin": "#8250DF",
+    "deco": "#8250DF",
+    "str": "#0A3069",
+    "num": "#0550AE",
+    "com": "#6E7781",
+    "tag": "#116329",
+    "attr": "#953800",
+    "prop": "#0550AE",
+    "key": "#0550AE",
+    "head": "#0550AE",
+    "code": "#953800",
+}
+
+# (kind, text)
+Run = Tuple[str, str]
+# one visual row of runs
+RunRow = Tuple[Run, ...]
+
+_PY_KW = (
+    "False None True and as assert async await break class continue def del elif else except "
+    "finally for from global if import in is lambda nonlocal not or pass raise return try while with yield"
+)
+_PY_BUILTIN = "print len range dict list set tuple str int float bool open enumerate zip isinstance super self cls st"
+_JS_KW = (
+    "break case catch class const continue debugger default delete do else export extends false finally "
+    "for function if import in instanceof let new null return super switch this throw true try typeof "
+    "undefined var void while with yield async await of"
+)
+
+# XML 1.0 can't carry C0 controls other than tab/newline/CR (nor U+FFFE/U+FFFF)
+_XML_INVALID_RE = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]")
+
+_NUM = r"\b(?:0[xX][0-9a-fA-F_]+|\d[\d_]*(?:\.\d*)?(?:[eE][+-]?\d+)?j?)\b"
+_DQ = r'"(?:[^"\\\n]|\\.)*"?'
+_SQ = r"'(?:[^'\\\n]|\\.)*'?"
+
+
+def _words(words: str) -> str:
+    return r"\b(?:" + "|".join(words.split()) + r")\b"
+
+
+def _lexer(*groups: Tuple[str, str], flags: int = 0) -> "re.Pattern[str]":
+    return re.compile("|".join(f"(?P<{kind}>{pattern})" for kind, pattern in groups), flags)
+
+
+LEXERS: Dict[str, "re.Pattern[str]"] = {
+    "python": _lexer(
+        ("com", r"#[^\n]*"),
+        ("str", r"(?i:[rbfu]{0,2})(?:\"\"\"[\s\S]*?(?:\"\"\"|\Z)|'''[\s\S]*?(?:'''|\Z)|" + _DQ + "|" + _SQ + ")"),
+        ("deco", r"^[ \t]*@[\w.]+"),
+        ("kw", _words(_PY_KW)),
+        ("builtin", _words(_PY_BUILTIN)),
+        ("num", _NUM),
+        flags=re.MULTILINE,
+    ),
+    "javascript": _lexer(
+        ("com", r"//[^\n]*|/\*[\s\S]*?(?:\*/|\Z)"),
+        ("str", _DQ + "|" + _SQ + r"|`(?:[^`\\]|\\.)*`?"),
+        ("kw", _words(_JS_KW)),
+        ("num", _NUM),
+        flags=re.MULTILINE,
+    ),
+    "css": _lexer(
+        ("com", r"/\*[\s\S]*?(?:\*/|\Z)"),
+        ("str", _DQ + "|" + _SQ),
+        ("kw", r"@[\w-]+|!important"),
+        ("prop", r"[\w-]+(?=\s*:[^:{]*[;}\n])"),
+        ("num", r"#[0-9a-fA-F]{3,8}\b|-?\b\d+(?:\.\d+)?(?:px|em|rem|%|vh|vw|s|ms|deg)?"),
+        flags=re.MULTILINE,
+    ),
+    "html": _lexer(
+        ("com", r"<!--[\s\S]*?(?:-->|\Z)"),
+        ("tag", r"</?[\w-]+|/?>"),
+        ("attr", r"[\w:-]+(?==)"),
+        ("str", _DQ + "|" + _SQ),
+        flags=re.MULTILINE,
+    ),
+    "json": _lexer(
+        ("key", _DQ + r"(?=\s*:)"),
+        ("str", _DQ),
+        ("kw", r"\b(?:true|false|null)\b"),
+        ("num", r"-?" + _NUM),
+    ),
+    "markdown": _lexer(
+        ("code", r"```[\s\S]*?(?:```|\Z)|`[^`\n]+`"),
+        ("head", r"^#{1,6}[^\n]*"),
+        ("kw", r"^[ \t]*(?:[-*+]|\d+\.)(?=\s)|\*\*[^*\n]+\*\*"),
+        ("attr", r"\[[^\]\n]*\]\([^)\n]*\)"),
+        flags=re.MULTILINE,
+    ),
+}
+LEXERS["js"] = LEXERS["javascript"]
+
+
+# -----------------------------
+# 1) Tokenize (cached by content hash)
+# -----------------------------
+_LOCK = threading.Lock()
+_TOKENS: "OrderedDict[Tuple[str, str, str], Tuple[Tuple[Run, ...], ...]]" = OrderedDict()
+_STATE = {"hits": 0, "misses": 0}
+
+
+def _lex(code: str, lexer: Optional["re.Pattern[str]"]) -> Tuple[Tuple[Run, ...], ...]:
+    runs: List[Run] = []
+    if lexer is None:
+        runs.append(("plain", code))
+    else:
+        pos = 0
+        for m in lexer.finditer(code):
+            if m.start() > pos:
+                runs.append(("plain", code[pos : m.start()]))
+            if m.end() > m.start():
+                runs.append((m.lastgroup or "plain", m.group()))
+            pos = m.end()
+        runs.append(("plain", code[pos:]))
+
+    # split on newlines, merge neighbours of the same kind
+    lines: List[List[Run]] = [[]]
+    for kind, text in runs:
+        for i, part in enumerate(text.split("\n")):
+            if i:
+                lines.append([])
+            if not part:
+                continue
+            row = lines[-1]
+            if row and row[-1][0] == kind:
+                row[-1] = (kind, row[-1][1] + part)
+            else:
+                row.append((kind, part))
+    return tuple(tuple(row) for row in lines)
+
+
+def tokenize(code: str, code_format: str = "text") -> Tuple[Tuple[Run, ...], ...]:
+    """Source lines as (kind, text) runs. Tabs expanded; one lexer pass per distinct (code, format)."""
+    fmt = (code_format or "text").lower()
+    key = (hashlib.sha256(code.encode("utf-8")).hexdigest(), fmt, LEXER_VERSION)
+    with _LOCK:
+        lines = _TOKENS.get(key)
+        if lines is not None:
+            _TOKENS.move_to_end(key)
+            _STATE["hits"] += 1
+            return lines
+    # line breaks as str.splitlines() sees them (\r, \f, \u2028 ...), like the plain renderer
+    source = code.splitlines()
+    lines = _lex("\n".join(line.expandtabs(TAB_SIZE) for line in source), LEXERS.get(fmt)) if source else ()
+    with _LOCK:
+        _STATE["misses"] += 1
+        _TOKENS[key] = lines
+        while len(_TOKENS) > TOKEN_CACHE_MAX:
+            _TOKENS.popitem(last=False)
+    return lines
+
+
+def token_cache_stats() -> Dict[str, int]:
+    with _LOCK:
+        return {"entries": len(_TOKENS), **_STATE}
+
+
+# -----------------------------
+# 2) Wrap runs into rows
+# -----------------------------
+def _split_runs(runs: Sequence[Run], lengths: Sequence[int]) -> List[RunRow]:
+    rows: List[RunRow] = []
+    queue = list(runs)
+    for length in lengths:
+        row: List[Run] = []
+        while length > 0 and queue:
+            kind, text = queue.pop(0)
+            if len(text) > length:
+                queue.insert(0, (kind, text[length:]))
+                text = text[:length]
+            row.append((kind, text))
+            length -= len(text)
+        rows.append(tuple(row))
+    return rows
+
+
+def wrap_runs(lines: Sequence[Sequence[Run]], width: int) -> List[RunRow]:
+    """Word-wraps each line to `width` characters, splitting runs at the breaks."""
+    rows: List[RunRow] = []
+    for runs in lines:
+        text = "".join(t for _, t in runs)
+        if len(text) <= width:
+            rows.append(tuple(runs))
+            continue
+        # keep whitespace so the pieces add back up to the source line
+        pieces = wrap_line(text, width, True, False, False)
+        if "".join(pieces) != text:
+            pieces = tuple(text[i : i + width] for i in range(0, len(text), width))
+        rows.extend(_split_runs(runs, [len(p) for p in pieces]))
+    return rows
+
+
+def highlight_rows(code: str, code_format: str, width: int) -> List[RunRow]:
+    return wrap_runs(tokenize(code, code_format), width)
+
+
+# -----------------------------
+# 3) Output: image layers, HTML, SVG
+# -----------------------------
+def draw_runs(
+    draw: ImageDraw.ImageDraw,
+    x: int,
+    y: int,
+    rows: Sequence[RunRow],
+    font: Tuple[str, int],
+    line_h: int,
+    theme: Dict[str, str] = THEME,
+) -> int:
+    """Draws highlighted rows; returns the y below the last row."""
+    family, size = font
+    pil_font = get_font(family, size)
+    advance = mono_advance(family, size)
+    if advance is not None and all(t.isascii() for row in rows for _, t in row):
+        # Monospace: one multiline draw per colour, other colours masked as spaces
+        layers: Dict[str, List[str]] = {}
+        for r, row in enumerate(rows):
+            col = 0
+            for kind, text in row:
+                fill = theme.get(kind, theme["plain"])
+                layer = layers.setdefault(fill, [""] * len(rows))
+                layer[r] += " " * (col - len(layer[r])) + text
+                col += len(text)
+        spacing = line_h - pil_font.getbbox("A")[3]
+        for fill, layer in layers.items():
+            block = "\n".join(line.rstrip() for line in layer)
+            if block.strip():
+                draw.multiline_text((x, y), block, font=pil_font, fill=fill, spacing=spacing)
+    else:
+        # Proportional / non-ASCII: span by span at measured offsets
+        for r, row in enumerate(rows):
+            cx = x
+            for kind, text in row:
+                draw.text((cx, y + r * line_h), text, font=pil_font, fill=theme.get(kind, theme["plain"]))
+                cx += text_width(family, size, text)
+    return y + line_h * len(rows)
+
+
+def runs_to_html(rows: Sequence[RunRow], theme: Dict[str, str] = THEME) -> str:
+    """Escaped rows joined by newlines, coloured spans (put inside a white-space:pre element)."""
+    out = []
+    for row in rows:
+        out.append(
+            "".join(
+                html.escape(t) if k == "plain" else f"<span style='color:{theme.get(k, theme['plain'])}'>{html.escape(t)}</span>"
+                for k, t in row
+            )
+        )
+    return "\n".join(out)
+
+
+def highlight_html(code: str, code_format: str = "text", theme: Dict[str, str] = THEME) -> str:
+    return runs_to_html(tokenize(code, code_format), theme)
+
+
+def xml_escape(text: str, quote: bool = True) -> str:
+    """html.escape() for SVG: characters XML forbids become U+FFFD (one for one, columns keep lining up)."""
+    return html.escape(_XML_INVALID_RE.sub("\ufffd", text), quote=quote)
+
+
+def runs_to_svg_text(rows: Sequence[RunRow], x: float, y: float, line_h: float, theme: Dict[str, str] = THEME) -> str:
+    """<text> element per row with a <tspan> per coloured run (baseline y of the first row)."""
+    out = []
+    for r, row in enumerate(rows):
+        if not row:
+            continue
+        spans = "".join(
+            xml_escape(t, quote=False) if k == "plain" else f'<tspan fill="{theme.get(k, theme["plain"])}">{xml_escape(t, quote=False)}</tspan>'
+            for k, t in row
+        )
+        out.append(f'<text x="{x}" y="{y + r * line_h:.1f}">{spans}</text>')
+    return "\n".join(out)
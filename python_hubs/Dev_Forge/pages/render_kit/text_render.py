@@ -0,0 +1,126 @@
+# python_hubs/Dev_Forge/pages/render_kit/text_render.py
+# ============================================================
+# DevForge — Shared text rendering for image exports
+# Used by Code_Library (code_library/block_render.py) and Ms_Piluso_Science.
+# - Fonts loaded ONCE per (family, size) per process
+# - Monospace fonts measured by advance x length (no per-line textbbox)
+# - Line heights and wrapped lines memoised
+# - draw_rows(): one drawing path for every card renderer
+# Lives in render_kit/ (not pages/) so Streamlit doesn't list it as a page
+# and the caches survive reruns.
+# ============================================================
+
+from __future__ import annotations
+
+import textwrap
+from functools import lru_cache
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from PIL import Image, ImageDraw, ImageFont
+
+# family -> candidate font files (bare names are searched in the system font dirs)
+FAMILIES = {
+    "mono": ("DejaVuSansMono.ttf", "/usr/share/fonts/truetype/dejavu/DejaVuSansMono.ttf"),
+    "sans": ("DejaVuSans.ttf", "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"),
+    "sans-bold": ("DejaVuSans-Bold.ttf", "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf"),
+}
+
+# (family, size)
+FontSpec = Tuple[str, int]
+# (text, font, fill colour)
+Row = Tuple[str, FontSpec, str]
+
+_MEASURE = ImageDraw.Draw(Image.new("RGB", (1, 1)))
+_MONO_PROBE = "iW .m@"
+
+
+# -----------------------------
+# 1) Fonts + metrics
+# -----------------------------
+@lru_cache(maxsize=None)
+def get_font(family: str, size: int):
+    for path in FAMILIES.get(family, (family,)):
+        try:
+            return ImageFont.truetype(path, size)
+        except Exception:
+            continue
+    return ImageFont.load_default()
+
+
+@lru_cache(maxsize=None)
+def mono_advance(family: str, size: int) -> Optional[float]:
+    """Shared glyph advance when the font is monospaced, else None."""
+    font = get_font(family, size)
+    try:
+        widths = {font.getlength(ch) for ch in _MONO_PROBE}
+    except AttributeError:
+        return None
+    return widths.pop() if len(widths) == 1 else None
+
+
+@lru_cache(maxsize=None)
+def line_height(family: str, size: int, extra: int = 0) -> int:
+    """Height of 'Ag' (ascender to descender) plus `extra` leading."""
+    return _MEASURE.textbbox((0, 0), "Ag", font=get_font(family, size))[3] + extra
+
+
+@lru_cache(maxsize=16384)
+def _measured_width(family: str, size: int, text: str) -> float:
+    return _MEASURE.textlength(text, font=get_font(family, size))
+
+
+def text_width(family: str, size: int, text: str) -> float:
+    advance = mono_advance(family, size)
+    if advance is not None and text.isascii() and "\t" not in text:
+        return advance * len(text)
+    return _measured_width(family, size, text)
+
+
+def max_width(family: str, size: int, lines: Iterable[str]) -> float:
+    advance = mono_advance(family, size)
+    if advance is not None:
+        lines = list(lines)
+        if all(l.isascii() and "\t" not in l for l in lines):
+            return advance * max((len(l) for l in lines), default=0)
+    return max((text_width(family, size, l) for l in lines), default=0)
+
+
+# -----------------------------
+# 2) Wrapping (by characters, memoised per source line)
+# -----------------------------
+@lru_cache(maxsize=16384)
+def wrap_line(
+    line: str,
+    width: int,
+    break_long_words: bool = True,
+    replace_whitespace: bool = True,
+    drop_whitespace: bool = True,
+) -> Tuple[str, ...]:
+    wrapped = textwrap.wrap(
+        line,
+        width,
+        break_long_words=break_long_words,
+        replace_whitespace=replace_whitespace,
+        drop_whitespace=drop_whitespace,
+    )
+    return tuple(wrapped) or ("",)
+
+
+def wrap_text(text: str, width: int, **kw) -> List[str]:
+    """Every source line wrapped to `width` characters; blank lines kept."""
+    lines: List[str] = []
+    for line in text.splitlines():
+        lines.extend(wrap_line(line, width, **kw))
+    return lines
+
+
+# -----------------------------
+# 3) Drawing
+# -----------------------------
+def draw_rows(draw: ImageDraw.ImageDraw, x: int, y: int, rows: Sequence[Row], line_h: int) -> int:
+    """Draws rows top to bottom at a fixed pitch; returns the y below the last row."""
+    for text, (family, size), fill in rows:
+        if text:
+            draw.text((x, y), text, font=get_font(family, size), fill=fill)
+        y += line_h
+    return y
@@ -2,11 +2,10 @@
 # KQ Logic — READ-ONLY DB HOOK (RINGS)
 # Purpose: prove DB access works without writing anything
 
-from kq_db import get_rings, DB_PATH
+# All DB access goes through kq_db (shared read-only connection + cached reads)
+from kq_db import get_rings
 
 import streamlit as st
-import sqlite3
-from pathlib import Path
 
 # -----------------------------
 # PAGE CONFIG
@@ -17,39 +16,6 @@ st.set_page_config(
     layout="wide",
 )
 
-# -----------------------------
-# DB PATH (read-only)
-# -----------------------------
-HERE = Path(__file__).resolve().parent
-DB_PATH = HERE / "kq_logic.db"  # runtime-created later, ignored by git
-
-def get_conn() -> sqlite3.Connection:
-    conn = sqlite3.connect(str(DB_PATH))
-    conn.row_factory = sqlite3.Row
-    return conn
-
-def get_rings() -> list[dict]:
-    """
-    READ-ONLY access.
-    Assumes table exists later.
-    Safe: returns [] if DB or table not present.
-    """
-    if not DB_PATH.exists():
-        return []
-
-    try:
-        with get_conn() as conn:
-            rows = conn.execute(
-                """
-                SELECT ring_id, name, sort_order, description
-                FROM kq_rings
-                ORDER BY sort_order ASC;
-                """
-            ).fetchall()
-        return [dict(r) for r in rows]
-    except sqlite3.Error:
-        return []
-
 # -----------------------------
 # UI
 # -----------------------------
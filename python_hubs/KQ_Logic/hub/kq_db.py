@@ -1,47 +1,123 @@
 # python_hubs/KQ_Logic/hub/kq_db.py
 # KQ Logic — DB module (read-only)
 # Purpose: centralize DB path + safe reads. No writes.
+# - ONE read-only connection per process (SQLite URI mode=ro, immutable=1 when safe)
+# - sqlite_master lookup cached
+# - get_rings() memoised on the (mtime, size) of the DB file and its -wal / -journal
+#   sidecars -> refreshes only when one of them changes
 
 import sqlite3
+import threading
 from pathlib import Path
 
 HERE = Path(__file__).resolve().parent
 DB_PATH = HERE / "kq_logic.db"  # runtime only (ignored by git)
 
-def conn() -> sqlite3.Connection:
-    c = sqlite3.connect(str(DB_PATH))
+# immutable=1 skips all locking/change checks. Only used when neither a -wal nor a
+# (possibly hot) -journal file is next to the DB. In WAL mode commits land in -wal and
+# leave the main file untouched, so the signature covers the sidecars too: a new or
+# growing -wal reopens the connection (without immutable) and drops the cached reads.
+ALLOW_IMMUTABLE = True
+
+# files whose (mtime, size) make up the cache signature
+_SIDECARS = ("", "-wal", "-journal")
+
+_LOCK = threading.Lock()
+_STATE = {
+    "sig": None,  # (mtime_ns, size) per _SIDECARS file the cached items belong to
+    "conn": None,
+    "tables": None,  # set of table names from sqlite_master
+    "rings": None,
+}
+
+
+def _stat(path: Path):
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _file_sig():
+    """None if the DB is missing, else (mtime, size) of the DB, -wal and -journal (None if absent)."""
+    sig = tuple(_stat(DB_PATH.with_name(DB_PATH.name + suffix)) for suffix in _SIDECARS)
+    return None if sig[0] is None else sig
+
+
+def _open_ro() -> sqlite3.Connection:
+    uri = DB_PATH.resolve().as_uri() + "?mode=ro"
+    sidecars = [DB_PATH.with_name(DB_PATH.name + suffix) for suffix in _SIDECARS[1:]]
+    if ALLOW_IMMUTABLE and not any(p.exists() for p in sidecars):
+        uri += "&immutable=1"
+    c = sqlite3.connect(uri, uri=True, check_same_thread=False)
     c.row_factory = sqlite3.Row
     return c
 
+
+def _reset(sig) -> None:
+    if _STATE["conn"] is not None:
+        _STATE["conn"].close()
+    _STATE.update(sig=sig, conn=None, tables=None, rings=None)
+
+
+def _sync():
+    """Drops every cached item if the DB file or a sidecar changed (or vanished). Caller holds _LOCK."""
+    sig = _file_sig()
+    if sig != _STATE["sig"]:
+        _reset(sig)
+    return sig
+
+
+def _conn_locked() -> sqlite3.Connection:
+    if _sync() is None:
+        raise sqlite3.OperationalError(f"DB not found: {DB_PATH}")
+    if _STATE["conn"] is None:
+        _STATE["conn"] = _open_ro()
+    return _STATE["conn"]
+
+
+def _tables_locked() -> set:
+    c = _conn_locked()
+    if _STATE["tables"] is None:
+        rows = c.execute("SELECT name FROM sqlite_master WHERE type='table';").fetchall()
+        _STATE["tables"] = {r["name"] for r in rows}
+    return _STATE["tables"]
+
+
+def conn() -> sqlite3.Connection:
+    """Shared read-only connection. Raises sqlite3.OperationalError if the DB is missing."""
+    with _LOCK:
+        return _conn_locked()
+
+
 def table_exists(name: str) -> bool:
-    if not DB_PATH.exists():
-        return False
     try:
-        with conn() as c:
-            r = c.execute(
-                "SELECT 1 FROM sqlite_master WHERE type='table' AND name=? LIMIT 1;",
-                (name,),
-            ).fetchone()
-        return r is not None
+        with _LOCK:
+            return name in _tables_locked()
     except sqlite3.Error:
         return False
 
+
 def get_rings() -> list[dict]:
     """
     Read-only.
     Returns [] if DB/table missing.
+    Cached until the DB file's or its -wal/-journal's mtime/size changes.
     """
-    if not table_exists("kq_rings"):
-        return []
     try:
-        with conn() as c:
-            rows = c.execute(
-                """
-                SELECT ring_id, name, sort_order, description
-                FROM kq_rings
-                ORDER BY sort_order ASC;
-                """
-            ).fetchall()
-        return [dict(r) for r in rows]
+        with _LOCK:
+            if "kq_rings" not in _tables_locked():
+                return []
+            if _STATE["rings"] is None:
+                rows = _conn_locked().execute(
+                    """
+                    SELECT ring_id, name, sort_order, description
+                    FROM kq_rings
+                    ORDER BY sort_order ASC;
+                    """
+                ).fetchall()
+                _STATE["rings"] = [dict(r) for r in rows]
+            return [dict(r) for r in _STATE["rings"]]
     except sqlite3.Error:
-        return []
\ No newline at end of file
+        return []
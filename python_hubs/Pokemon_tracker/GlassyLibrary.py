@@ -1,7 +1,14 @@
 import streamlit as st
 from pathlib import Path
 import html
-import random
+import math
+import sys
+
+# Shared helpers live next to this app (Pokemon_tracker/)
+POKE_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(POKE_DIR))
+from poke_index import SORTS, get_index  # noqa: E402
+from poke_thumbs import entry_thumbnail, thumbnail_bytes  # noqa: E402
 
 # ═══════════════════════════════════════════════════════════════
 # 🪟 GLASSY LIBRARY - Ultra Clean Universal Gray Shell
@@ -18,6 +25,14 @@ st.set_page_config(
 APP_DIR = Path(__file__).parent
 ENTRIES_DIR = APP_DIR / "pokemon_entries"
 ENTRIES_DIR.mkdir(exist_ok=True)
+IMAGES_DIR = APP_DIR / "images"
+
+# Sidecar index (pokemon_entries/.poke_index.sqlite): paging + filters without reading entries
+LIBRARY_INDEX = get_index(ENTRIES_DIR)
+
+# Browse grid
+GRID_COLUMNS = 4
+PAGE_SIZES = [12, 24, 48]
 
 # Admin code
 ADMIN_CODE = "Bshapp"
@@ -39,10 +54,6 @@ TYPE_TINTS = {
 # HELPER FUNCTIONS
 # ═══════════════════════════════════════════════════════════════
 
-def list_pokemon_entries():
-    """List all Pokemon HTML files"""
-    return sorted([f for f in ENTRIES_DIR.glob("*.html")])
-
 def get_pokemon_name_from_path(path):
     """Extract Pokemon name from file path"""
     return path.stem.replace('_', ' ').title()
@@ -52,9 +63,26 @@ def delete_tool(name):
     path = ENTRIES_DIR / f"{name}.html"
     if path.exists():
         path.unlink()
+        LIBRARY_INDEX.note_deleted(path)
         st.session_state["current_tool"] = None
         st.success(f"🗑️ {name} deleted.")
 
+def render_card(path, metadata):
+    """One browse card: cached thumbnail, name, type/generation, View button"""
+    with st.container(border=True):
+        thumb = entry_thumbnail(path, IMAGES_DIR)
+        if thumb:
+            st.image(thumbnail_bytes(str(thumb)), use_container_width=True)
+        else:
+            st.markdown('<div style="font-size: 4rem; text-align: center; opacity: 0.6;">🪟</div>',
+                        unsafe_allow_html=True)
+        st.markdown(f"**{html.escape(get_pokemon_name_from_path(path))}**")
+        shiny = " • ✨" if metadata["shiny"] else ""
+        st.caption(f"{metadata['type']} • {metadata['generation']}{shiny}")
+        if st.button("View", key=f"view_{path.name}", use_container_width=True):
+            st.session_state["current_tool"] = path.name
+            st.rerun()
+
 # ═══════════════════════════════════════════════════════════════
 # SESSION STATE
 # ═══════════════════════════════════════════════════════════════
@@ -74,6 +102,10 @@ if "current_tool" not in st.session_state:
     st.session_state["current_tool"] = None
 if "preview_height" not in st.session_state:
     st.session_state.preview_height = 800
+if "browse_page" not in st.session_state:
+    st.session_state["browse_page"] = 0
+if "browse_filters" not in st.session_state:
+    st.session_state["browse_filters"] = None
 
 # ═══════════════════════════════════════════════════════════════
 # GLASSY UI THEME
@@ -247,46 +279,24 @@ with st.sidebar:
     
     st.markdown("---")
     
-    # Pokemon Selection
+    # Library (one directory scan; only new/changed entries are re-read)
     st.subheader("📋 Library")
     
-    all_entries = list_pokemon_entries()
+    LIBRARY_INDEX.sync()
+    card_count = LIBRARY_INDEX.total()
     
-    if all_entries:
-        pokemon_names = [get_pokemon_name_from_path(entry) for entry in all_entries]
-        
+    if card_count:
         # Random button
         if st.button("🎲 Random", use_container_width=True):
-            st.session_state["current_tool"] = random.choice(all_entries).name
+            st.session_state["current_tool"] = LIBRARY_INDEX.random_entry().name
             st.rerun()
         
-        # Dropdown
         if st.session_state["current_tool"]:
-            try:
-                # Find current index
-                current_path = ENTRIES_DIR / st.session_state["current_tool"]
-                if current_path.exists():
-                    current_name = get_pokemon_name_from_path(current_path)
-                    current_index = pokemon_names.index(current_name)
-                else:
-                    current_index = 0
-            except (ValueError, FileNotFoundError):
-                current_index = 0
-        else:
-            current_index = 0
-        
-        selected_pokemon = st.selectbox(
-            "Select Card",
-            pokemon_names,
-            index=current_index,
-            label_visibility="collapsed"
-        )
-        
-        # Update current tool
-        selected_index = pokemon_names.index(selected_pokemon)
-        st.session_state["current_tool"] = all_entries[selected_index].name
+            if st.button("🗂️ Browse All", use_container_width=True):
+                st.session_state["current_tool"] = None
+                st.rerun()
         
-        st.info(f"**{len(all_entries)}** cards")
+        st.info(f"**{card_count}** cards")
     else:
         st.warning("No cards found. Use Nacli app to create entries.")
     
@@ -299,6 +309,8 @@ with st.sidebar:
         "Preview Height",
         400, 1200, st.session_state.preview_height, 50
     )
+    
+    page_size = st.selectbox("Cards per page", PAGE_SIZES, index=1)
 
 # ═══════════════════════════════════════════════════════════════
 # MAIN CONTENT
@@ -374,6 +386,59 @@ if st.session_state["current_tool"] and (ENTRIES_DIR / st.session_state["current
     with st.expander("🔍 Debug: Raw HTML"):
         st.code(html_content, language="html")
 
+elif card_count:
+    # Browse: only the visible page is queried, read and thumbnailed
+    st.title("🪟 Glassy Library")
+    
+    col1, col2, col3, col4 = st.columns([2, 1, 1, 1])
+    with col1:
+        search = st.text_input("Search", placeholder="Name or evolution line...")
+    with col2:
+        type_filter = st.selectbox("Type", ["All Types"] + sorted(LIBRARY_INDEX.counts("type")))
+    with col3:
+        gen_filter = st.selectbox(
+            "Generation",
+            ["All Generations"] + sorted(LIBRARY_INDEX.counts("generation"), key=lambda g: (len(g), g))
+        )
+    with col4:
+        sort_by = st.selectbox("Sort", list(SORTS))
+    
+    # new filters start again at page 1
+    filters = (search.strip(), type_filter, gen_filter, sort_by, page_size)
+    if st.session_state["browse_filters"] != filters:
+        st.session_state["browse_filters"] = filters
+        st.session_state["browse_page"] = 0
+    
+    matches = LIBRARY_INDEX.total(type_filter, gen_filter, search=search.strip())
+    page_count = max(1, math.ceil(matches / page_size))
+    page = min(st.session_state["browse_page"], page_count - 1)
+    
+    entries = LIBRARY_INDEX.query(
+        type_filter, gen_filter, sort=sort_by, search=search.strip(),
+        limit=page_size, offset=page * page_size
+    )
+    
+    if not entries:
+        st.info("No cards match these filters.")
+    
+    for row_start in range(0, len(entries), GRID_COLUMNS):
+        columns = st.columns(GRID_COLUMNS)
+        for column, (path, metadata) in zip(columns, entries[row_start:row_start + GRID_COLUMNS]):
+            with column:
+                render_card(path, metadata)
+    
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col1:
+        if st.button("◀ Previous", use_container_width=True, disabled=page == 0):
+            st.session_state["browse_page"] = page - 1
+            st.rerun()
+    with col2:
+        st.caption(f"Page {page + 1} of {page_count} • {matches} cards")
+    with col3:
+        if st.button("Next ▶", use_container_width=True, disabled=page >= page_count - 1):
+            st.session_state["browse_page"] = page + 1
+            st.rerun()
+
 else:
     # Welcome screen
     st.title("🪟 Glassy Library")
@@ -404,7 +469,7 @@ else:
     
     ---
     
-    👈 **Select a card from the sidebar to get started!**
+    👈 **Cards appear here as soon as the library has entries.**
     
     **Note:** If you don't see any cards, use the Nacli Builder app to create your first entry.
     """)
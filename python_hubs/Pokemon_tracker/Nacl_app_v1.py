@@ -1,10 +1,10 @@
 import streamlit as st
 from pathlib import Path
-import base64
 import random
 import html
 from datetime import datetime
 import re
+import sys
 
 # ═══════════════════════════════════════════════════════════════
 # NACLI POKEAPP - Clarity and Steadfastness
@@ -27,6 +27,13 @@ SCREENSHOTS_DIR = APP_DIR / "screenshots"
 for directory in [ENTRIES_DIR, IMAGES_DIR, MUSIC_DIR, SCREENSHOTS_DIR]:
     directory.mkdir(exist_ok=True)
 
+# Sidecar metadata index (pokemon_entries/.poke_index.sqlite)
+sys.path.insert(0, str(APP_DIR))
+from poke_index import SORTS, get_index  # noqa: E402
+from poke_media import import_music, list_music, load_track  # noqa: E402
+
+LIBRARY_INDEX = get_index(ENTRIES_DIR)
+
 # ═══════════════════════════════════════════════════════════════
 # HELPER FUNCTIONS
 # ═══════════════════════════════════════════════════════════════
@@ -50,57 +57,14 @@ def next_available_path(stem):
             return new_path
         counter += 1
 
-def list_pokemon_entries():
-    """List all Pokemon HTML files"""
-    return sorted([f for f in ENTRIES_DIR.glob("*.html")])
-
-def parse_pokemon_metadata(html_content):
-    """Extract metadata from HTML comments"""
-    metadata = {
-        "type": "Normal",
-        "generation": "Gen 1",
-        "evolution_line": []
-    }
-    
-    type_match = re.search(r'<!-- TYPE:\s*(\w+)\s*-->', html_content)
-    gen_match = re.search(r'<!-- GENERATION:\s*(Gen\s*\d+)\s*-->', html_content)
-    evo_match = re.search(r'<!-- EVOLUTION_LINE:\s*(.+?)\s*-->', html_content)
-    
-    if type_match:
-        metadata["type"] = type_match.group(1)
-    if gen_match:
-        metadata["generation"] = gen_match.group(1)
-    if evo_match:
-        metadata["evolution_line"] = [e.strip() for e in evo_match.group(1).split(',')]
-    
-    return metadata
-
-def filter_pokemon(entries, type_filter, gen_filter):
-    """Filter Pokemon entries"""
-    filtered = []
-    for entry_path in entries:
-        content = entry_path.read_text()
-        metadata = parse_pokemon_metadata(content)
-        
-        type_match = (type_filter == "All Types" or metadata["type"] == type_filter)
-        gen_match = (gen_filter == "All Generations" or metadata["generation"] == gen_filter)
-        
-        if type_match and gen_match:
-            filtered.append((entry_path, metadata))
-    
-    return filtered
+def filter_pokemon(type_filter, gen_filter, sort="Name"):
+    """Filter Pokemon entries -> [(path, metadata)], served from the index"""
+    return LIBRARY_INDEX.query(type_filter, gen_filter, sort=sort)
 
 def get_pokemon_name_from_path(path):
     """Extract Pokemon name from file path"""
     return path.stem.replace('_', ' ').title()
 
-def get_audio_base64(audio_path):
-    """Convert audio file to base64"""
-    if audio_path.exists():
-        with open(audio_path, "rb") as f:
-            return base64.b64encode(f.read()).decode()
-    return None
-
 def save_uploaded_image(uploaded_file):
     """Save uploaded image to images folder"""
     if uploaded_file is not None:
@@ -231,7 +195,7 @@ with st.sidebar:
     
     # Music Player
     st.subheader("🎵 Background Music")
-    music_files = list(MUSIC_DIR.glob("*.mp3")) + list(MUSIC_DIR.glob("*.wav"))
+    music_files = list_music(MUSIC_DIR)
     
     if music_files:
         selected_music = st.selectbox(
@@ -241,17 +205,24 @@ with st.sidebar:
         )
         
         if selected_music != "None":
-            music_path = MUSIC_DIR / selected_music
-            audio_base64 = get_audio_base64(music_path)
-            if audio_base64:
-                st.markdown(f"""
-                    <audio controls autoplay loop style="width: 100%;">
-                        <source src="data:audio/mp3;base64,{audio_base64}" type="audio/mp3">
-                    </audio>
-                """, unsafe_allow_html=True)
+            # cached bytes served by st.audio (no base64 through the websocket)
+            track_bytes, track_mime = load_track(MUSIC_DIR / selected_music)
+            st.audio(track_bytes, format=track_mime, loop=True, autoplay=True)
     else:
         st.info("Add .mp3/.wav files to music/ folder")
     
+    with st.expander("➕ Add track"):
+        track_upload = st.file_uploader(
+            "MP3 / M4A / OGG / WAV",
+            type=['mp3', 'm4a', 'ogg', 'wav'],
+            key="track_upload",
+            label_visibility="collapsed"
+        )
+        if track_upload and st.button("💾 Save Track", use_container_width=True):
+            saved_track = import_music(track_upload, MUSIC_DIR)
+            st.success(f"Saved: {saved_track.name}")
+            st.rerun()
+    
     st.markdown("---")
     
     # Filters
@@ -264,18 +235,28 @@ with st.sidebar:
     ]
     GENERATIONS = ["All Generations"] + [f"Gen {i}" for i in range(1, 10)]
     
+    # only entries added/changed since the last run are re-read
+    LIBRARY_INDEX.sync()
+    type_counts = LIBRARY_INDEX.counts("type")
+    gen_counts = LIBRARY_INDEX.counts("generation")
+    
     type_filter = st.selectbox("Type", POKEMON_TYPES)
     gen_filter = st.selectbox("Generation", GENERATIONS)
+    sort_by = st.selectbox("Sort", list(SORTS))
+    
+    if type_counts:
+        st.caption(" · ".join(f"{t} {n}" for t, n in sorted(type_counts.items())))
+        st.caption(" · ".join(f"{g} {n}" for g, n in sorted(gen_counts.items())))
     
     st.markdown("---")
     
     # Pokemon Selection
     st.subheader("📋 Select Pokémon")
     
-    all_entries = list_pokemon_entries()
+    total_entries = LIBRARY_INDEX.total()
     
-    if all_entries:
-        filtered_entries = filter_pokemon(all_entries, type_filter, gen_filter)
+    if total_entries:
+        filtered_entries = filter_pokemon(type_filter, gen_filter, sort_by)
         
         if filtered_entries:
             pokemon_names = [get_pokemon_name_from_path(entry[0]) for entry in filtered_entries]
@@ -306,7 +287,7 @@ with st.sidebar:
             selected_index = pokemon_names.index(selected_pokemon)
             st.session_state.current_pokemon = filtered_entries[selected_index][0]
             
-            st.info(f"**{len(filtered_entries)}** of **{len(all_entries)}** Pokémon")
+            st.info(f"**{len(filtered_entries)}** of **{total_entries}** Pokémon")
         else:
             st.warning("No Pokémon match filters")
     else:
@@ -398,6 +379,7 @@ with st.sidebar:
                 filename = safe_stem(new_name)
                 file_path = next_available_path(filename)
                 file_path.write_text(html_content)
+                LIBRARY_INDEX.note_saved(file_path)
                 
                 st.success(f"Created: {file_path.name}")
                 st.session_state.current_pokemon = file_path
@@ -483,6 +465,7 @@ if st.session_state.current_pokemon and st.session_state.current_pokemon.exists(
         with col1:
             if st.button("💾 Save Changes", use_container_width=True):
                 st.session_state.current_pokemon.write_text(edited_html)
+                LIBRARY_INDEX.note_saved(st.session_state.current_pokemon)
                 st.success("Saved!")
                 st.session_state.show_html_editor = False
                 st.rerun()
@@ -530,6 +513,7 @@ if st.session_state.current_pokemon and st.session_state.current_pokemon.exists(
         with col1:
             if st.button("✅ Yes, Delete", use_container_width=True):
                 st.session_state.current_pokemon.unlink()
+                LIBRARY_INDEX.note_deleted(st.session_state.current_pokemon)
                 st.session_state.current_pokemon = None
                 st.session_state.confirm_delete = False
                 st.success(f"Deleted {pokemon_name}")
@@ -1,12 +1,36 @@
 import streamlit as st
 from pathlib import Path
-import base64
-import random
+import math
 import html
-from datetime import datetime, date
-import re
-import io
-from PIL import Image
+from datetime import date
+import sys
+
+# Shared helpers live next to this app (Pokemon_tracker/)
+POKE_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(POKE_DIR))
+from poke_media import (  # noqa: E402
+    DEFAULT_QUALITY,
+    ENTRY_BUDGET_BYTES,
+    FORMATS,
+    asset_refs,
+    bundle_html,
+    entry_image_bytes,
+    format_bytes,
+    image_src,
+    import_music,
+    ingest_image,
+    list_music,
+    load_track,
+)
+from poke_import import (  # noqa: E402
+    NameReserver,
+    bulk_import,
+    entry_stem,
+    iter_upload_records,
+    write_entry,
+)
+from poke_index import get_index  # noqa: E402
+from poke_template import render_entry  # noqa: E402
 
 # ═══════════════════════════════════════════════════════════════
 # NACLI POKÉAPP V2 - Builder Edition
@@ -29,556 +53,21 @@ MUSIC_DIR = APP_DIR / "music"
 for directory in [ENTRIES_DIR, IMAGES_DIR, SCREENSHOTS_DIR, MUSIC_DIR]:
     directory.mkdir(exist_ok=True)
 
+# Sidecar index: the picker pages through it instead of globbing every entry
+LIBRARY_INDEX = get_index(ENTRIES_DIR)
+PICKER_PAGE_SIZE = 50
+
 # ═══════════════════════════════════════════════════════════════
 # HELPER FUNCTIONS
 # ═══════════════════════════════════════════════════════════════
 
-def safe_stem(name):
-    """Clean name for filesystem"""
-    cleaned = re.sub(r'[^\w\s-]', '', name.lower())
-    cleaned = re.sub(r'[\s]+', '_', cleaned)
-    return cleaned[:50]
-
-def image_to_base64(image_file):
-    """Convert uploaded image to base64 string"""
-    if image_file is None:
-        return None
-    
-    # Read image
-    image = Image.open(image_file)
-    
-    # Convert to RGB if necessary
-    if image.mode in ('RGBA', 'LA', 'P'):
-        background = Image.new('RGB', image.size, (255, 255, 255))
-        if image.mode == 'P':
-            image = image.convert('RGBA')
-        background.paste(image, mask=image.split()[-1] if image.mode == 'RGBA' else None)
-        image = background
-    
-    # Save to bytes
-    buffered = io.BytesIO()
-    image.save(buffered, format="PNG")
-    img_bytes = buffered.getvalue()
-    
-    # Encode to base64
-    b64_string = base64.b64encode(img_bytes).decode()
-    
-    return b64_string
-
-def create_hero_image_tag(b64_string, alt_text="Pokemon"):
-    """Create hero image HTML tag"""
-    if not b64_string:
-        return '<div class="hero-placeholder">⛏️</div>'
-    return f'<img src="data:image/png;base64,{b64_string}" alt="{alt_text}" class="hero-image">'
-
-def create_gallery_image_tag(b64_string, caption=""):
-    """Create gallery image HTML tag"""
-    if not b64_string:
-        return ""
-    
-    caption_html = f'<div class="gallery-caption">{caption}</div>' if caption else ''
-    return f'''<div class="gallery-item">
-    <img src="data:image/png;base64,{b64_string}" alt="{caption}">
-    {caption_html}
-</div>'''
-
-def list_pokemon_entries():
-    """List all Pokemon HTML files"""
-    return sorted([f for f in ENTRIES_DIR.glob("*.html")])
-
 def get_pokemon_name_from_path(path):
     """Extract Pokemon name from file path"""
     return path.stem.replace('_', ' ').title()
 
-def get_audio_base64(audio_path):
-    """Convert audio to base64"""
-    if audio_path.exists():
-        with open(audio_path, "rb") as f:
-            return base64.b64encode(f.read()).decode()
-    return None
-
-# ═══════════════════════════════════════════════════════════════
-# HTML TEMPLATE
-# ═══════════════════════════════════════════════════════════════
-
 def generate_pokemon_html(data):
-    """Generate complete Pokemon HTML entry"""
-    
-    # Determine shiny styling
-    shiny_class = "shiny" if data['is_shiny'] else ""
-    shiny_bookend = "✨ " if data['is_shiny'] else ""
-    shiny_bookend_end = " ✨" if data['is_shiny'] else ""
-    
-    # Hero image
-    hero_html = create_hero_image_tag(data.get('hero_image_b64'), data['name'])
-    
-    # Gallery images
-    gallery_html = ""
-    for item in data.get('gallery_items', []):
-        if item['b64']:
-            gallery_html += create_gallery_image_tag(item['b64'], item['caption'])
-    
-    if not gallery_html:
-        gallery_html = '<p style="text-align: center; opacity: 0.6;">No images in gallery</p>'
-    
-    # Moves HTML
-    moves_html = ""
-    for move in data.get('moves', []):
-        if move:
-            moves_html += f'<div class="move-item">{move}</div>\n'
-    
-    if not moves_html:
-        moves_html = '<p style="opacity: 0.6;">No moves listed</p>'
-    
-    # Traits HTML
-    traits_html = ""
-    for trait in data.get('traits', []):
-        if trait['name']:
-            traits_html += f'''<div class="trait-box">
-    <div class="trait-label">{trait['label']}</div>
-    <div class="trait-name">{trait['name']}</div>
-    <div class="trait-desc">{trait['description']}</div>
-</div>\n'''
-    
-    if not traits_html:
-        traits_html = '<p style="opacity: 0.6;">No traits listed</p>'
-    
-    # Stats
-    stats = data.get('stats', {})
-    
-    # Build HTML
-    html_content = f'''<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="UTF-8">
-    <title>{data['name']}</title>
-    <!-- TYPE: {data['type']} -->
-    <!-- GENERATION: {data['generation']} -->
-    <!-- EVOLUTION_LINE: {data['evolution_line']} -->
-    <!-- VARIANT: {data['variant']} -->
-    <!-- SELF_CONTAINED: true -->
-    <style>
-        * {{
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }}
-        
-        body {{
-            font-family: 'Inter', -apple-system, sans-serif;
-            background: linear-gradient(135deg, #0f172a 0%, #1e293b 50%, #334155 100%);
-            color: white;
-            min-height: 100vh;
-            padding: 2rem;
-        }}
-        
-        body.shiny {{
-            background: linear-gradient(135deg, #1e1b4b 0%, #312e81 50%, #4338ca 100%);
-            animation: shimmer 3s ease-in-out infinite;
-        }}
-        
-        @keyframes shimmer {{
-            0%, 100% {{ filter: brightness(1) saturate(1); }}
-            50% {{ filter: brightness(1.2) saturate(1.3); }}
-        }}
-        
-        .container {{
-            max-width: 1200px;
-            margin: 0 auto;
-        }}
-        
-        .header {{
-            text-align: center;
-            margin-bottom: 2rem;
-        }}
-        
-        .header h1 {{
-            font-size: 4rem;
-            font-weight: 800;
-            margin-bottom: 0.5rem;
-            text-shadow: 3px 3px 6px rgba(0, 0, 0, 0.5);
-        }}
-        
-        body.shiny .header h1 {{
-            animation: sparkle 2s ease-in-out infinite;
-        }}
-        
-        @keyframes sparkle {{
-            0%, 100% {{ text-shadow: 0 0 20px #fbbf24, 3px 3px 6px rgba(0, 0, 0, 0.5); }}
-            50% {{ text-shadow: 0 0 40px #f59e0b, 0 0 60px #fbbf24, 3px 3px 6px rgba(0, 0, 0, 0.5); }}
-        }}
-        
-        .subtitle {{
-            font-size: 1.2rem;
-            opacity: 0.8;
-            margin-bottom: 1rem;
-        }}
-        
-        .tabs {{
-            display: flex;
-            gap: 1rem;
-            margin-bottom: 2rem;
-            border-bottom: 2px solid rgba(255, 255, 255, 0.2);
-        }}
-        
-        .tab-button {{
-            background: none;
-            border: none;
-            color: white;
-            padding: 1rem 2rem;
-            font-size: 1.1rem;
-            cursor: pointer;
-            border-bottom: 3px solid transparent;
-            transition: all 0.3s ease;
-        }}
-        
-        .tab-button:hover {{
-            background: rgba(255, 255, 255, 0.1);
-        }}
-        
-        .tab-button.active {{
-            border-bottom-color: #fbbf24;
-            background: rgba(255, 255, 255, 0.05);
-        }}
-        
-        .tab-content {{
-            display: none;
-            animation: fadeIn 0.3s ease-in-out;
-        }}
-        
-        .tab-content.active {{
-            display: block;
-        }}
-        
-        @keyframes fadeIn {{
-            from {{ opacity: 0; transform: translateY(10px); }}
-            to {{ opacity: 1; transform: translateY(0); }}
-        }}
-        
-        /* Tab A: Card View */
-        .card-view {{
-            background: rgba(255, 255, 255, 0.1);
-            backdrop-filter: blur(10px);
-            border-radius: 24px;
-            padding: 3rem;
-            border: 3px solid rgba(251, 191, 36, 0.3);
-        }}
-        
-        body.shiny .card-view {{
-            border-color: rgba(251, 191, 36, 0.6);
-            box-shadow: 0 0 40px rgba(251, 191, 36, 0.3);
-        }}
-        
-        .hero-image {{
-            max-width: 400px;
-            width: 100%;
-            height: auto;
-            display: block;
-            margin: 2rem auto;
-            border-radius: 16px;
-        }}
-        
-        .hero-placeholder {{
-            width: 400px;
-            height: 400px;
-            margin: 2rem auto;
-            background: rgba(251, 191, 36, 0.2);
-            border-radius: 50%;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            font-size: 10rem;
-        }}
-        
-        .info-grid {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
-            gap: 1rem;
-            margin-top: 2rem;
-        }}
-        
-        .info-item {{
-            background: rgba(255, 255, 255, 0.1);
-            padding: 1rem;
-            border-radius: 8px;
-            border-left: 4px solid #fbbf24;
-        }}
-        
-        .info-item strong {{
-            color: #fef3c7;
-            display: block;
-            margin-bottom: 0.5rem;
-        }}
-        
-        /* Tab B: Stats & Moves */
-        .stats-section {{
-            background: rgba(255, 255, 255, 0.1);
-            backdrop-filter: blur(10px);
-            border-radius: 24px;
-            padding: 3rem;
-            border: 3px solid rgba(251, 191, 36, 0.3);
-            margin-bottom: 2rem;
-        }}
-        
-        .stats-grid {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(150px, 1fr));
-            gap: 1.5rem;
-            margin-bottom: 2rem;
-        }}
-        
-        .stat-box {{
-            background: rgba(251, 191, 36, 0.1);
-            padding: 1.5rem;
-            border-radius: 12px;
-            text-align: center;
-            border: 2px solid rgba(251, 191, 36, 0.3);
-        }}
-        
-        .stat-label {{
-            font-size: 0.9rem;
-            opacity: 0.8;
-            margin-bottom: 0.5rem;
-        }}
-        
-        .stat-value {{
-            font-size: 2rem;
-            font-weight: 700;
-            color: #fbbf24;
-        }}
-        
-        .moves-section {{
-            margin-top: 2rem;
-        }}
-        
-        .moves-section h3 {{
-            margin-bottom: 1rem;
-            font-size: 1.5rem;
-        }}
-        
-        .move-item {{
-            background: rgba(255, 255, 255, 0.1);
-            padding: 1rem;
-            border-radius: 8px;
-            margin-bottom: 0.5rem;
-            border-left: 4px solid #fbbf24;
-        }}
-        
-        .traits-section {{
-            margin-top: 2rem;
-        }}
-        
-        .traits-section h3 {{
-            margin-bottom: 1rem;
-            font-size: 1.5rem;
-        }}
-        
-        .trait-box {{
-            background: rgba(255, 255, 255, 0.1);
-            padding: 1.5rem;
-            border-radius: 12px;
-            margin-bottom: 1rem;
-            border: 2px solid rgba(251, 191, 36, 0.3);
-        }}
-        
-        .trait-label {{
-            font-size: 0.8rem;
-            text-transform: uppercase;
-            letter-spacing: 0.1em;
-            color: #fbbf24;
-            margin-bottom: 0.5rem;
-        }}
-        
-        .trait-name {{
-            font-size: 1.3rem;
-            font-weight: 700;
-            margin-bottom: 0.5rem;
-        }}
-        
-        .trait-desc {{
-            opacity: 0.9;
-            line-height: 1.6;
-        }}
-        
-        /* Tab C: Gallery */
-        .gallery-grid {{
-            display: grid;
-            grid-template-columns: repeat(auto-fill, minmax(300px, 1fr));
-            gap: 2rem;
-        }}
-        
-        .gallery-item {{
-            background: rgba(255, 255, 255, 0.1);
-            backdrop-filter: blur(10px);
-            border-radius: 16px;
-            padding: 1rem;
-            border: 2px solid rgba(251, 191, 36, 0.3);
-            transition: transform 0.3s ease;
-        }}
-        
-        .gallery-item:hover {{
-            transform: translateY(-5px);
-            border-color: #fbbf24;
-        }}
-        
-        .gallery-item img {{
-            width: 100%;
-            height: auto;
-            border-radius: 12px;
-            margin-bottom: 0.5rem;
-        }}
-        
-        .gallery-caption {{
-            text-align: center;
-            font-size: 0.9rem;
-            opacity: 0.9;
-        }}
-        
-        /* Fallback for no-script */
-        .no-script-warning {{
-            background: rgba(251, 191, 36, 0.2);
-            padding: 1rem;
-            border-radius: 8px;
-            margin-bottom: 2rem;
-            border-left: 4px solid #fbbf24;
-        }}
-    </style>
-</head>
-<body class="{shiny_class}">
-    <div class="container">
-        <div class="header">
-            <h1>{shiny_bookend}{data['name']}{shiny_bookend_end}</h1>
-            <div class="subtitle">
-                {data['type']} Type • {data['generation']} • {data['variant']}
-            </div>
-        </div>
-        
-        <noscript>
-            <div class="no-script-warning">
-                ⚠️ Tabs require JavaScript. Content is displayed below in order: Card → Stats → Gallery
-            </div>
-        </noscript>
-        
-        <div class="tabs">
-            <button class="tab-button active" onclick="showTab('card')">⛏️ Card</button>
-            <button class="tab-button" onclick="showTab('stats')">📊 Stats</button>
-            <button class="tab-button" onclick="showTab('gallery')">🖼️ Gallery</button>
-        </div>
-        
-        <!-- Tab A: Card View -->
-        <div id="tab-card" class="tab-content active">
-            <div class="card-view">
-                {hero_html}
-                
-                <div class="info-grid">
-                    <div class="info-item">
-                        <strong>Type:</strong> {data['type']}
-                    </div>
-                    <div class="info-item">
-                        <strong>Generation:</strong> {data['generation']}
-                    </div>
-                    <div class="info-item">
-                        <strong>Evolution Line:</strong><br>{data['evolution_line']}
-                    </div>
-                    <div class="info-item">
-                        <strong>OT:</strong> {data.get('ot', 'N/A')}
-                    </div>
-                    <div class="info-item">
-                        <strong>ID No.:</strong> {data.get('id_no', 'N/A')}
-                    </div>
-                    <div class="info-item">
-                        <strong>First Met:</strong><br>{data.get('first_met_location', 'Unknown')}
-                    </div>
-                    <div class="info-item">
-                        <strong>First Met Date:</strong><br>{data.get('first_met_date', 'Unknown')}
-                    </div>
-                    <div class="info-item">
-                        <strong>Nature:</strong> {data.get('nature', 'N/A')}
-                    </div>
-                    <div class="info-item">
-                        <strong>Ability:</strong> {data.get('ability', 'N/A')}
-                    </div>
-                    <div class="info-item">
-                        <strong>Characteristic:</strong><br>{data.get('characteristic', 'N/A')}
-                    </div>
-                </div>
-            </div>
-        </div>
-        
-        <!-- Tab B: Stats & Moves -->
-        <div id="tab-stats" class="tab-content">
-            <div class="stats-section">
-                <h2>Base Stats</h2>
-                <div class="stats-grid">
-                    <div class="stat-box">
-                        <div class="stat-label">HP</div>
-                        <div class="stat-value">{stats.get('hp', 0)}</div>
-                    </div>
-                    <div class="stat-box">
-                        <div class="stat-label">Attack</div>
-                        <div class="stat-value">{stats.get('attack', 0)}</div>
-                    </div>
-                    <div class="stat-box">
-                        <div class="stat-label">Defense</div>
-                        <div class="stat-value">{stats.get('defense', 0)}</div>
-                    </div>
-                    <div class="stat-box">
-                        <div class="stat-label">Sp. Atk</div>
-                        <div class="stat-value">{stats.get('sp_atk', 0)}</div>
-                    </div>
-                    <div class="stat-box">
-                        <div class="stat-label">Sp. Def</div>
-                        <div class="stat-value">{stats.get('sp_def', 0)}</div>
-                    </div>
-                    <div class="stat-box">
-                        <div class="stat-label">Speed</div>
-                        <div class="stat-value">{stats.get('speed', 0)}</div>
-                    </div>
-                </div>
-                
-                <div class="moves-section">
-                    <h3>Moves</h3>
-                    {moves_html}
-                </div>
-                
-                <div class="traits-section">
-                    <h3>Traits</h3>
-                    {traits_html}
-                </div>
-            </div>
-        </div>
-        
-        <!-- Tab C: Gallery -->
-        <div id="tab-gallery" class="tab-content">
-            <div class="gallery-grid">
-                {gallery_html}
-            </div>
-        </div>
-    </div>
-    
-    <script>
-        function showTab(tabName) {{
-            // Hide all tabs
-            document.querySelectorAll('.tab-content').forEach(tab => {{
-                tab.classList.remove('active');
-            }});
-            
-            // Remove active from all buttons
-            document.querySelectorAll('.tab-button').forEach(btn => {{
-                btn.classList.remove('active');
-            }});
-            
-            // Show selected tab
-            document.getElementById('tab-' + tabName).classList.add('active');
-            
-            // Activate button
-            event.target.classList.add('active');
-        }}
-    </script>
-</body>
-</html>'''
-    
-    return html_content
+    """Generate complete Pokemon HTML entry (templates/entry_builder.html)"""
+    return render_entry(data)
 
 # ═══════════════════════════════════════════════════════════════
 # SESSION STATE
@@ -592,12 +81,15 @@ if 'preview_height' not in st.session_state:
     st.session_state.preview_height = 700
 if 'safe_mode' not in st.session_state:
     st.session_state.safe_mode = False
+if 'picker_page' not in st.session_state:
+    st.session_state.picker_page = 1
 
 # Builder state
-if 'hero_image_b64' not in st.session_state:
-    st.session_state.hero_image_b64 = None
+# images are IngestedImage (resized + re-encoded) until the entry is generated
+if 'hero_image' not in st.session_state:
+    st.session_state.hero_image = None
 if 'gallery_items' not in st.session_state:
-    st.session_state.gallery_items = [{'b64': None, 'caption': ''} for _ in range(6)]
+    st.session_state.gallery_items = [{'image': None, 'caption': ''} for _ in range(6)]
 
 # ═══════════════════════════════════════════════════════════════
 # NACLI UI THEME
@@ -647,7 +139,7 @@ with st.sidebar:
     if st.session_state.mode == "Library":
         # Music
         st.subheader("🎵 Music")
-        music_files = list(MUSIC_DIR.glob("*.mp3")) + list(MUSIC_DIR.glob("*.wav"))
+        music_files = list_music(MUSIC_DIR)
         
         if music_files:
             selected_music = st.selectbox(
@@ -657,47 +149,70 @@ with st.sidebar:
             )
             
             if selected_music != "None":
-                music_path = MUSIC_DIR / selected_music
-                audio_base64 = get_audio_base64(music_path)
-                if audio_base64:
-                    st.markdown(f"""
-                        <audio controls autoplay loop style="width: 100%;">
-                            <source src="data:audio/mp3;base64,{audio_base64}" type="audio/mp3">
-                        </audio>
-                    """, unsafe_allow_html=True)
+                # cached bytes served by st.audio (no base64 through the websocket)
+                track_bytes, track_mime = load_track(MUSIC_DIR / selected_music)
+                st.audio(track_bytes, format=track_mime, loop=True, autoplay=True)
+        
+        with st.expander("➕ Add track"):
+            track_upload = st.file_uploader(
+                "MP3 / M4A / OGG / WAV",
+                type=['mp3', 'm4a', 'ogg', 'wav'],
+                key="track_upload",
+                label_visibility="collapsed"
+            )
+            if track_upload and st.button("💾 Save Track", use_container_width=True):
+                saved_track = import_music(track_upload, MUSIC_DIR)
+                st.success(f"Saved: {saved_track.name}")
+                st.rerun()
         
         st.markdown("---")
         
-        # Pokemon selection
-        all_entries = list_pokemon_entries()
+        # Pokemon selection (one directory scan; only new/changed entries are re-read)
+        LIBRARY_INDEX.sync()
+        entry_count = LIBRARY_INDEX.total()
         
-        if all_entries:
-            pokemon_names = [get_pokemon_name_from_path(entry) for entry in all_entries]
-            
+        if entry_count:
             if st.button("🎲 Random", use_container_width=True):
-                st.session_state.current_pokemon = random.choice(all_entries)
+                st.session_state.current_pokemon = LIBRARY_INDEX.random_entry()
                 st.rerun()
             
-            if st.session_state.current_pokemon:
-                current_name = get_pokemon_name_from_path(st.session_state.current_pokemon)
-                try:
-                    current_index = pokemon_names.index(current_name)
-                except ValueError:
-                    current_index = 0
-            else:
-                current_index = 0
-            
-            selected_pokemon = st.selectbox(
-                "Select",
-                pokemon_names,
-                index=current_index,
+            search = st.text_input(
+                "Search",
+                placeholder="Name or evolution line...",
                 label_visibility="collapsed"
-            )
+            ).strip()
+            
+            # only one page of names is queried per rerun
+            matches = LIBRARY_INDEX.total(search=search)
+            page_count = max(1, math.ceil(matches / PICKER_PAGE_SIZE))
+            st.session_state.picker_page = min(st.session_state.picker_page, page_count)
+            if page_count > 1:
+                st.number_input("Page", 1, page_count, key="picker_page")
+            page = st.session_state.picker_page
+            page_entries = [
+                path for path, _ in LIBRARY_INDEX.query(
+                    search=search, limit=PICKER_PAGE_SIZE, offset=(page - 1) * PICKER_PAGE_SIZE
+                )
+            ]
             
-            selected_index = pokemon_names.index(selected_pokemon)
-            st.session_state.current_pokemon = all_entries[selected_index]
+            # keep the open entry selectable even when it is on another page
+            current = st.session_state.current_pokemon
+            if current and current.exists() and current not in page_entries:
+                page_entries.insert(0, current)
             
-            st.info(f"**{len(all_entries)}** entries")
+            if page_entries:
+                selected_pokemon = st.selectbox(
+                    "Select",
+                    page_entries,
+                    index=page_entries.index(current) if current in page_entries else 0,
+                    format_func=get_pokemon_name_from_path,
+                    label_visibility="collapsed"
+                )
+                st.session_state.current_pokemon = selected_pokemon
+            else:
+                st.caption("No matches")
+            
+            st.info(f"**{entry_count}** entries")
         else:
             st.warning("No entries yet")
         
@@ -728,19 +243,25 @@ if st.session_state.mode == "Library":
         # Action buttons
         col1, col2, col3 = st.columns([1, 1, 1])
         
+        # entries in asset mode reference ../images/<sha256>.<ext>; bundle inlines them
+        html_content = st.session_state.current_pokemon.read_text()
+        linked_assets = asset_refs(html_content)
+        bundled_html = bundle_html(html_content, IMAGES_DIR) if linked_assets else html_content
+        
         with col1:
-            html_content = st.session_state.current_pokemon.read_text()
             st.download_button(
                 label="💾 Download",
-                data=html_content,
+                data=bundled_html,
                 file_name=st.session_state.current_pokemon.name,
                 mime="text/html",
-                use_container_width=True
+                use_container_width=True,
+                help="Self-contained (shared images inlined)" if linked_assets else None
             )
         
         with col2:
             if st.button("🗑️ Delete", use_container_width=True):
                 st.session_state.current_pokemon.unlink()
+                LIBRARY_INDEX.note_deleted(st.session_state.current_pokemon)
                 st.session_state.current_pokemon = None
                 st.success(f"Deleted {pokemon_name}")
                 st.rerun()
@@ -751,9 +272,8 @@ if st.session_state.mode == "Library":
         
         st.title(f"⛏️ {pokemon_name}")
         
-        # Preview in iframe
-        html_content = st.session_state.current_pokemon.read_text()
-        escaped_html = html.escape(html_content)
+        # Preview in iframe (srcdoc cannot resolve ../images/, so preview the bundle)
+        escaped_html = html.escape(bundled_html)
         
         if st.session_state.safe_mode:
             sandbox = 'allow-same-origin'
@@ -796,6 +316,25 @@ else:
     st.title("🔨 Builder Mode")
     st.caption("Generate self-contained Pokemon entries with embedded images")
     
+    with st.expander("📥 Bulk Import"):
+        st.caption(
+            "CSV / JSON with columns like name, type, generation, nature, hp … speed, "
+            "moves (separated by ;), traits (Name: description; …) — or a Showdown team paste (.txt). "
+            "Large collections: `python poke_import.py team.csv`"
+        )
+        bulk_files = st.file_uploader(
+            "Team files",
+            type=['csv', 'json', 'jsonl', 'txt'],
+            accept_multiple_files=True,
+            key="bulk_upload"
+        )
+        if bulk_files and st.button("📥 Import All", use_container_width=True):
+            records = [rec for f in bulk_files for rec in iter_upload_records(f.name, f)]
+            stats = bulk_import(records, ENTRIES_DIR)
+            st.success(f"✅ {stats.summary()}")
+            for n, reason in stats.skipped:
+                st.caption(f"Skipped record {n}: {reason}")
+    
     with st.form("pokemon_builder"):
         st.subheader("Core Identity")
         
@@ -875,12 +414,27 @@ else:
             trait_c_name = st.text_input("Trait C Name")
             trait_c_desc = st.text_area("Trait C Description")
         
-        submit = st.form_submit_button("🔨 Generate Entry", use_container_width=True)
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            submit = st.form_submit_button("🔨 Generate Entry", use_container_width=True)
+        with col2:
+            preview = st.form_submit_button("👁️ Preview", use_container_width=True)
     
-    # Base64 Image Converter
+    # Image Converter (resize + WebP/JPEG, then embedded)
     st.markdown("---")
-    st.subheader("📦 Base64 Image Converter")
-    st.caption("Upload images to embed directly into the HTML (self-contained)")
+    st.subheader("📦 Image Converter")
+    st.caption("Uploads are oriented, resized, stripped of metadata and compressed before embedding")
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        image_format = st.selectbox("Format", FORMATS, help="Auto = WebP (keeps transparency)")
+    with col2:
+        image_quality = st.slider("Quality", 40, 95, DEFAULT_QUALITY, 1)
+    use_assets = st.toggle(
+        "Shared image assets",
+        help="Save images once in images/ (by content hash) and link them, instead of embedding "
+             "a copy in every entry. Downloads are still bundled into one self-contained file."
+    )
     
     converter_tab1, converter_tab2 = st.tabs(["Hero Image", "Gallery Images"])
     
@@ -901,14 +455,18 @@ else:
             
             with col2:
                 if st.button("Use as Hero Image", use_container_width=True):
-                    st.session_state.hero_image_b64 = image_to_base64(hero_upload)
+                    st.session_state.hero_image = ingest_image(hero_upload, "hero", image_format, image_quality)
                     st.success("✅ Hero image set!")
                     st.rerun()
                 
-                if st.session_state.hero_image_b64:
-                    st.success("Hero image loaded ✓")
+                hero = st.session_state.hero_image
+                if hero:
+                    st.success(
+                        f"Hero image loaded ✓ {hero.width}×{hero.height} {hero.fmt}, "
+                        f"{format_bytes(hero.source_bytes)} → {format_bytes(hero.size)}"
+                    )
                     if st.button("Clear Hero Image"):
-                        st.session_state.hero_image_b64 = None
+                        st.session_state.hero_image = None
                         st.rerun()
     
     with converter_tab2:
@@ -937,24 +495,37 @@ else:
                         st.image(gallery_upload, use_container_width=True)
                         if st.button(f"Add to Slot {i+1}", key=f"add_gallery_{i}"):
                             st.session_state.gallery_items[i] = {
-                                'b64': image_to_base64(gallery_upload),
+                                'image': ingest_image(gallery_upload, "gallery", image_format, image_quality),
                                 'caption': caption
                             }
                             st.success(f"Added to slot {i+1}!")
                             st.rerun()
                     
-                    if st.session_state.gallery_items[i]['b64']:
-                        st.success(f"✓ Image loaded")
+                    slot_image = st.session_state.gallery_items[i]['image']
+                    if slot_image:
+                        st.success(f"✓ Image loaded ({format_bytes(slot_image.size)})")
                         if st.button(f"Clear Slot {i+1}", key=f"clear_{i}"):
-                            st.session_state.gallery_items[i] = {'b64': None, 'caption': ''}
+                            st.session_state.gallery_items[i] = {'image': None, 'caption': ''}
                             st.rerun()
     
+    # Byte budget for this entry
+    entry_bytes = entry_image_bytes(
+        st.session_state.hero_image,
+        [item['image'] for item in st.session_state.gallery_items]
+    )
+    budget_note = f"Images in this entry: {format_bytes(entry_bytes)} of {format_bytes(ENTRY_BUDGET_BYTES)} budget"
+    if entry_bytes > ENTRY_BUDGET_BYTES:
+        st.warning(f"⚠️ {budget_note} — lower the quality or use fewer gallery images")
+    else:
+        st.caption(budget_note)
+    
     # Generate HTML
-    if submit:
+    if submit or preview:
         if not pokemon_name:
             st.error("⚠️ Pokemon Name is required!")
         else:
-            # Prepare data
+            # Prepare data (previews always embed: the iframe cannot resolve ../images/)
+            asset_dir = IMAGES_DIR if use_assets and submit else None
             data = {
                 'name': pokemon_name,
                 'is_shiny': is_shiny,
@@ -983,31 +554,42 @@ else:
                     {'label': trait_b_label, 'name': trait_b_name, 'description': trait_b_desc},
                     {'label': trait_c_label, 'name': trait_c_name, 'description': trait_c_desc}
                 ],
-                'hero_image_b64': st.session_state.hero_image_b64,
-                'gallery_items': st.session_state.gallery_items
+                'hero_image_src': image_src(st.session_state.hero_image, asset_dir),
+                'gallery_items': [
+                    {'src': image_src(item['image'], asset_dir), 'caption': item['caption']}
+                    for item in st.session_state.gallery_items
+                ],
+                'self_contained': asset_dir is None
             }
             
-            # Generate HTML
+            # Generate HTML (unchanged sections come from the renderer's cache)
             html_output = generate_pokemon_html(data)
             
-            # Save to file
-            filename_stem = safe_stem(pokemon_name)
-            if is_shiny:
-                filename = f"{filename_stem}_shiny_{datetime.now().strftime('%Y%m%d')}.html"
+            if preview:
+                # Live preview: nothing saved, builder state kept
+                st.markdown("---")
+                st.subheader(f"👁️ Preview: {pokemon_name}")
+                sandbox = 'allow-same-origin' if st.session_state.safe_mode else 'allow-scripts allow-same-origin'
+                st.components.v1.html(
+                    f'<iframe srcdoc="{html.escape(html_output)}" sandbox="{sandbox}" '
+                    f'style="width: 100%; height: {st.session_state.preview_height}px; '
+                    f'border: 3px solid #8b6f47; border-radius: 12px;"></iframe>',
+                    height=st.session_state.preview_height + 20,
+                    scrolling=False
+                )
             else:
-                filename = f"{filename_stem}_{datetime.now().strftime('%Y%m%d')}.html"
-            
-            file_path = ENTRIES_DIR / filename
-            file_path.write_text(html_output)
-            
-            st.success(f"✅ Entry created: {filename}")
-            
-            # Auto-load into preview
-            st.session_state.current_pokemon = file_path
-            st.session_state.mode = "Library"
-            
-            # Reset builder state
-            st.session_state.hero_image_b64 = None
-            st.session_state.gallery_items = [{'b64': None, 'caption': ''} for _ in range(6)]
-            
-            st.rerun()
+                # Save to file (name_date.html, or name_date_1.html ... if taken)
+                file_path = write_entry(NameReserver(ENTRIES_DIR), entry_stem(pokemon_name, is_shiny), html_output)
+                
+                LIBRARY_INDEX.note_saved(file_path)
+                st.success(f"✅ Entry created: {file_path.name}")
+                
+                # Auto-load into preview
+                st.session_state.current_pokemon = file_path
+                st.session_state.mode = "Library"
+                
+                # Reset builder state
+                st.session_state.hero_image = None
+                st.session_state.gallery_items = [{'image': None, 'caption': ''} for _ in range(6)]
+                
+                st.rerun()
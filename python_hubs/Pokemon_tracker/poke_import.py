@@ -0,0 +1,371 @@
+# ═══════════════════════════════════════════════════════════════
+# NACLI POKÉAPP - Bulk import / export (CLI + used by the builder)
+# Clarity and Steadfastness
+#
+# Import: many Pokémon -> many entries in one go
+# - Reads CSV, JSON / JSONL, or a Showdown team paste (.txt)
+# - Names reserved up front from ONE directory listing (name_date, name_date_1, ...),
+#   files created exclusively, so nothing is ever overwritten
+# - Entries rendered + written by a thread pool; library index updated in one transaction
+#
+# Export: the library's metadata as CSV (straight from the index)
+#
+# CSV / JSON fields (headers are case/space-insensitive, "Sp. Atk" = sp_atk):
+#   name*, type, generation, variant, shiny, evolution_line, ot, id_no,
+#   first_met_location, first_met_date, nature, ability, characteristic,
+#   hp, attack, defense, sp_atk, sp_def, speed,
+#   moves  ("Leaf Blade; Coil" or a list) or move1..move4,
+#   traits ("Overgrow: Powers up Grass moves; ..." or [{"label","name","description"}])
+#
+# CLI:
+#   python poke_import.py team.csv box2.json showdown.txt
+#   python poke_import.py --export library.csv
+# ═══════════════════════════════════════════════════════════════
+
+import argparse
+import csv
+import io
+import json
+import math
+import os
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date
+from pathlib import Path
+
+POKE_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(POKE_DIR))
+from poke_index import get_index  # noqa: E402
+from poke_template import STAT_FIELDS, render_entry  # noqa: E402
+
+ENTRIES_DIR = POKE_DIR / "pokemon_entries"
+
+# same defaults as the builder form
+DEFAULT_TYPE = "Normal"
+DEFAULT_GENERATION = "Gen 1"
+TRAIT_LABELS = ["Trait A", "Trait B", "Trait C"]
+
+EXPORT_FIELDS = ["file", "name", "type", "generation", "evolution_line", "variant", "shiny", "date"]
+_STEM_SUFFIX_RE = re.compile(r'(?:_shiny)?_\d{8}(?:_\d+)?$')
+
+_TRUE = {"1", "true", "yes", "y", "shiny", "✨"}
+
+
+@dataclass
+class ImportStats:
+    written: list = field(default_factory=list)
+    skipped: list = field(default_factory=list)   # (record no., reason)
+    seconds: float = 0.0
+
+    def summary(self):
+        return f"{len(self.written)} entr(ies) written, {len(self.skipped)} skipped • {self.seconds:.2f}s"
+
+
+# ═══════════════════════════════════════════════════════════════
+# NAMING
+# ═══════════════════════════════════════════════════════════════
+
+def safe_stem(name):
+    """Clean name for filesystem"""
+    cleaned = re.sub(r'[^\w\s-]', '', name.lower())
+    cleaned = re.sub(r'[\s]+', '_', cleaned)
+    return cleaned[:50]
+
+
+def entry_stem(name, shiny, day=None):
+    """Builder naming: name_YYYYMMDD / name_shiny_YYYYMMDD"""
+    stamp = (day or date.today()).strftime('%Y%m%d')
+    return f"{safe_stem(name)}_shiny_{stamp}" if shiny else f"{safe_stem(name)}_{stamp}"
+
+
+def next_available_name(stem, taken):
+    """stem.html, then stem_1.html, stem_2.html ... (first one not in `taken`)."""
+    name = f"{stem}.html"
+    counter = 1
+    while name in taken:
+        name = f"{stem}_{counter}.html"
+        counter += 1
+    return name
+
+
+class NameReserver:
+    """Hands out unused entry file names; one directory listing, then in-memory."""
+
+    def __init__(self, entries_dir):
+        self.entries_dir = Path(entries_dir)
+        self._lock = threading.Lock()
+        self._taken = {p.name for p in self.entries_dir.glob("*.html")}
+
+    def reserve(self, stem):
+        with self._lock:
+            name = next_available_name(stem, self._taken)
+            self._taken.add(name)
+            return self.entries_dir / name
+
+
+def write_entry(reserver, stem, html_output):
+    """Creates the file exclusively; a name grabbed by someone else meanwhile just moves on."""
+    while True:
+        path = reserver.reserve(stem)
+        try:
+            with open(path, "x", encoding="utf-8") as f:
+                f.write(html_output)
+            return path
+        except FileExistsError:
+            continue
+
+
+# ═══════════════════════════════════════════════════════════════
+# READERS
+# ═══════════════════════════════════════════════════════════════
+
+def _key(k):
+    return re.sub(r'[^a-z0-9]+', '_', str(k).lower()).strip('_')
+
+
+def _text(v):
+    return "" if v is None else str(v).strip()
+
+
+def _split(v, seps=r'[;\n/]'):
+    if isinstance(v, list):
+        return [_text(x) for x in v if _text(x)]
+    return [x.strip() for x in re.split(seps, _text(v)) if x.strip()]
+
+
+def _int(v, field="value"):
+    """Whole number from a cell; blank/unreadable = 0, inf/nan/1e999 -> ValueError (record skipped)."""
+    text = _text(v)
+    try:
+        f = float(text)
+    except ValueError:
+        return 0
+    if not math.isfinite(f):
+        raise ValueError(f"{field} is not a finite number ({text[:24]!r})")
+    return int(f)
+
+
+def _generation(v):
+    v = _text(v)
+    if not v:
+        return DEFAULT_GENERATION
+    digits = re.sub(r'\D', '', v)
+    return f"Gen {digits}" if digits else v
+
+
+def _traits(v):
+    traits = []
+    for item in (v if isinstance(v, list) else _split(v, r'[;\n]')):
+        if isinstance(item, dict):
+            trait = {k: _text(item.get(k)) for k in ("label", "name", "description")}
+        else:
+            name, _, desc = str(item).partition(":")
+            trait = {"label": "", "name": name.strip(), "description": desc.strip()}
+        if trait["name"]:
+            traits.append(trait)
+    for i, trait in enumerate(traits):
+        trait["label"] = trait["label"] or (TRAIT_LABELS[i] if i < len(TRAIT_LABELS) else "Trait")
+    return traits
+
+
+def record_to_data(record):
+    """One CSV row / JSON object -> the builder's data dict (None without a name)."""
+    r = {_key(k): v for k, v in record.items()}
+    name = _text(r.get("name") or r.get("species"))
+    if not name:
+        return None
+    shiny = _text(r.get("shiny") or r.get("is_shiny")).lower() in _TRUE
+    moves = _split(r["moves"]) if r.get("moves") else [_text(r.get(f"move{i}")) for i in range(1, 5)]
+    evolution = r.get("evolution_line")
+    return {
+        'name': name,
+        'is_shiny': shiny,
+        'type': _text(r.get("type")).title() or DEFAULT_TYPE,
+        'generation': _generation(r.get("generation")),
+        'variant': _text(r.get("variant")) or ("Sparkle" if shiny else "Normal"),
+        'evolution_line': ", ".join(evolution) if isinstance(evolution, list) else _text(evolution),
+        'ot': _text(r.get("ot")),
+        'id_no': _text(r.get("id_no")),
+        'first_met_location': _text(r.get("first_met_location")),
+        'first_met_date': _text(r.get("first_met_date")),
+        'nature': _text(r.get("nature")),
+        'ability': _text(r.get("ability")),
+        'characteristic': _text(r.get("characteristic")),
+        'stats': {key: _int(r.get(key), key) for key, _ in STAT_FIELDS},
+        'moves': [m for m in moves if m],
+        'traits': _traits(r.get("traits")),
+        'hero_image_src': None,
+        'gallery_items': [],
+        'self_contained': True,
+    }
+
+
+_SHOWDOWN_HEAD_RE = re.compile(r'^(?P<who>.+?)(?:\s+@\s+(?P<item>.+))?$')
+_SHOWDOWN_GENDER_RE = re.compile(r'\s*\((?:M|F)\)\s*$')
+
+
+def parse_showdown(text):
+    """Showdown team paste -> records (species, ability, nature, moves, shiny, held item, tera type)."""
+    records = []
+    for block in re.split(r'\n\s*\n', text.replace('\r\n', '\n')):
+        # "=== [gen9ou] Team ===" headers from the teambuilder export
+        lines = [ln.strip() for ln in block.splitlines() if ln.strip() and not ln.strip().startswith("===")]
+        if not lines:
+            continue
+        head = _SHOWDOWN_HEAD_RE.match(lines[0])
+        who = _SHOWDOWN_GENDER_RE.sub('', head.group('who'))
+        nickname = re.match(r'^(.*?)\s*\(([^()]+)\)$', who)
+        rec = {"name": nickname.group(2) if nickname else who, "moves": [], "traits": []}
+        if head.group('item'):
+            rec["traits"].append({"label": "Held Item", "name": head.group('item').strip(), "description": ""})
+        for ln in lines[1:]:
+            if ln.startswith("-"):
+                rec["moves"].append(ln.lstrip("- ").strip())
+            elif ln.endswith(" Nature"):
+                rec["nature"] = ln[:-len(" Nature")].strip()
+            elif ":" in ln:
+                k, _, v = ln.partition(":")
+                k = _key(k)
+                if k == "ability":
+                    rec["ability"] = v.strip()
+                elif k == "shiny":
+                    rec["shiny"] = v.strip()
+                elif k == "tera_type":
+                    rec["type"] = v.strip()
+        records.append(rec)
+    return records
+
+
+def iter_records(fp, fmt):
+    """Text stream + 'csv' / 'json' / 'jsonl' / 'showdown' -> raw records."""
+    if fmt == "csv":
+        yield from csv.DictReader(fp)
+    elif fmt == "jsonl":
+        for line in fp:
+            if line.strip():
+                yield json.loads(line)
+    elif fmt == "json":
+        data = json.load(fp)
+        if isinstance(data, dict):
+            data = data.get("pokemon", [data])
+        yield from data
+    else:
+        yield from parse_showdown(fp.read())
+
+
+def _format_for(name):
+    return {".csv": "csv", ".json": "json", ".jsonl": "jsonl"}.get(Path(name).suffix.lower(), "showdown")
+
+
+def iter_file_records(path):
+    with open(path, "r", encoding="utf-8-sig", newline="") as fp:
+        yield from iter_records(fp, _format_for(str(path)))
+
+
+def iter_upload_records(name, raw):
+    """For Streamlit UploadedFile (binary, file-like)."""
+    text = io.TextIOWrapper(raw, encoding="utf-8-sig", newline="")
+    try:
+        yield from iter_records(text, _format_for(name))
+    finally:
+        text.detach()
+
+
+# ═══════════════════════════════════════════════════════════════
+# IMPORT / EXPORT
+# ═══════════════════════════════════════════════════════════════
+
+def bulk_import(records, entries_dir=ENTRIES_DIR, workers=None, day=None):
+    """Records -> entry files (parallel) + one index update. Returns ImportStats."""
+    t0 = time.perf_counter()
+    entries_dir = Path(entries_dir)
+    entries_dir.mkdir(parents=True, exist_ok=True)
+    stats = ImportStats()
+
+    jobs = []
+    for n, record in enumerate(records, start=1):
+        try:
+            data = record_to_data(record) if isinstance(record, dict) else None
+        except ValueError as e:
+            stats.skipped.append((n, str(e)))
+            continue
+        if data is None:
+            stats.skipped.append((n, "no name"))
+        else:
+            jobs.append(data)
+
+    reserver = NameReserver(entries_dir)
+
+    def build(data):
+        return write_entry(reserver, entry_stem(data['name'], data['is_shiny'], day), render_entry(data))
+
+    workers = workers or min(8, (os.cpu_count() or 1) + 4)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        stats.written = list(pool.map(build, jobs))
+
+    if stats.written:
+        get_index(entries_dir).note_saved_many(stats.written)
+    stats.seconds = time.perf_counter() - t0
+    return stats
+
+
+def import_files(paths, entries_dir=ENTRIES_DIR, workers=None):
+    def records():
+        for p in paths:
+            yield from iter_file_records(p)
+
+    return bulk_import(records(), entries_dir, workers)
+
+
+def export_csv(out, entries_dir=ENTRIES_DIR):
+    """Library metadata (one row per entry) as CSV into a text stream."""
+    index = get_index(entries_dir)
+    index.sync()
+    writer = csv.DictWriter(out, fieldnames=EXPORT_FIELDS)
+    writer.writeheader()
+    for path, meta in index.query(sort="Name"):
+        writer.writerow({
+            "file": path.name,
+            "name": _STEM_SUFFIX_RE.sub('', path.stem).replace('_', ' ').title(),
+            "type": meta["type"],
+            "generation": meta["generation"],
+            "evolution_line": ", ".join(meta["evolution_line"]),
+            "variant": meta["variant"],
+            "shiny": "yes" if meta["shiny"] else "",
+            "date": meta["date"],
+        })
+
+
+# ═══════════════════════════════════════════════════════════════
+# CLI
+# ═══════════════════════════════════════════════════════════════
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Bulk-create Pokémon entries from CSV / JSON / Showdown files.")
+    ap.add_argument("files", nargs="*", help=".csv, .json, .jsonl or Showdown .txt files")
+    ap.add_argument("--entries", default=str(ENTRIES_DIR), help=f"entries folder (default: {ENTRIES_DIR})")
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--export", metavar="CSV", help="write the library's metadata to this CSV and exit")
+    args = ap.parse_args(argv)
+
+    if args.export:
+        with open(args.export, "w", encoding="utf-8", newline="") as f:
+            export_csv(f, args.entries)
+        print(f"Exported library to {args.export}")
+        return 0
+    if not args.files:
+        ap.error("no input files (or use --export)")
+
+    stats = import_files(args.files, args.entries, args.workers)
+    for n, reason in stats.skipped:
+        print(f"  skipped record {n}: {reason}")
+    print(f"Imported into {args.entries}: {stats.summary()}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,229 @@
+# ═══════════════════════════════════════════════════════════════
+# NACLI POKÉAPP - Library index (sidecar SQLite next to the entries)
+# Clarity and Steadfastness
+#
+# - One row per entry: TYPE / GENERATION / EVOLUTION_LINE / VARIANT / shiny / date
+# - Keyed by file name + (mtime, size): sync() only re-reads entries that changed
+#   (a rerun with no changes = one directory scan, zero file reads)
+# - note_saved() / note_deleted() keep it current right after a write
+# - Filtering, sorting, counting and paging are SQL queries, not regexes over every file
+# ═══════════════════════════════════════════════════════════════
+
+import re
+import sqlite3
+import threading
+from datetime import date
+from pathlib import Path
+
+INDEX_NAME = ".poke_index.sqlite"
+INDEX_VERSION = 1
+
+SORTS = {
+    "Name": "name COLLATE NOCASE",
+    "Newest": "entry_date DESC, name COLLATE NOCASE",
+    "Generation": "gen_no, name COLLATE NOCASE",
+    "Type": "type, name COLLATE NOCASE",
+}
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS entries (
+  file TEXT PRIMARY KEY,
+  mtime_ns INTEGER NOT NULL,
+  size INTEGER NOT NULL,
+  name TEXT NOT NULL,
+  type TEXT NOT NULL,
+  generation TEXT NOT NULL,
+  gen_no INTEGER NOT NULL,
+  evolution_line TEXT NOT NULL,
+  variant TEXT NOT NULL,
+  shiny INTEGER NOT NULL,
+  entry_date TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_entries_type_gen ON entries(type, generation);
+"""
+
+_TYPE_RE = re.compile(r'<!-- TYPE:\s*(\w+)\s*-->')
+_GEN_RE = re.compile(r'<!-- GENERATION:\s*(Gen\s*\d+)\s*-->')
+_EVO_RE = re.compile(r'<!-- EVOLUTION_LINE:\s*(.+?)\s*-->')
+_VARIANT_RE = re.compile(r'<!-- VARIANT:\s*(.+?)\s*-->')
+_SHINY_BODY_RE = re.compile(r'<body[^>]*class="[^"]*\bshiny\b')
+_STEM_DATE_RE = re.compile(r'_(\d{4})(\d{2})(\d{2})(?:_\d+)?$')
+
+
+def parse_pokemon_metadata(html_content):
+    """Extract metadata from HTML comments"""
+    metadata = {
+        "type": "Normal",
+        "generation": "Gen 1",
+        "evolution_line": []
+    }
+
+    type_match = _TYPE_RE.search(html_content)
+    gen_match = _GEN_RE.search(html_content)
+    evo_match = _EVO_RE.search(html_content)
+
+    if type_match:
+        metadata["type"] = type_match.group(1)
+    if gen_match:
+        metadata["generation"] = gen_match.group(1)
+    if evo_match:
+        metadata["evolution_line"] = [e.strip() for e in evo_match.group(1).split(',')]
+
+    return metadata
+
+
+def _entry_row(path, st):
+    content = path.read_text(encoding="utf-8", errors="replace")
+    meta = parse_pokemon_metadata(content)
+    variant_match = _VARIANT_RE.search(content)
+    variant = variant_match.group(1) if variant_match else ""
+    shiny = (
+        "shiny" in path.stem.lower()
+        or variant.lower() in ("sparkle", "shiny")
+        or bool(_SHINY_BODY_RE.search(content))
+    )
+    stem_date = _STEM_DATE_RE.search(path.stem)
+    if stem_date:
+        entry_date = "-".join(stem_date.groups())
+    else:
+        entry_date = date.fromtimestamp(st.st_mtime).isoformat()
+    return (
+        path.name,
+        st.st_mtime_ns,
+        st.st_size,
+        path.stem.replace('_', ' ').title(),
+        meta["type"],
+        meta["generation"],
+        int(re.sub(r"\D", "", meta["generation"]) or 0),
+        ", ".join(meta["evolution_line"]),
+        variant,
+        int(shiny),
+        entry_date,
+    )
+
+
+class PokeIndex:
+    """Sidecar index for one entries folder. Safe to share across Streamlit reruns/threads."""
+
+    def __init__(self, entries_dir):
+        self.entries_dir = Path(entries_dir)
+        self._lock = threading.Lock()
+        self.con = sqlite3.connect(str(self.entries_dir / INDEX_NAME), check_same_thread=False)
+        self.con.row_factory = sqlite3.Row
+        with self.con:
+            if self.con.execute("PRAGMA user_version").fetchone()[0] != INDEX_VERSION:
+                self.con.execute("DROP TABLE IF EXISTS entries")
+                self.con.execute(f"PRAGMA user_version = {INDEX_VERSION}")
+            self.con.executescript(SCHEMA_SQL)
+
+    # ---- keeping it current ----
+    def sync(self):
+        """Re-reads only new/changed entries, drops vanished ones. Returns files re-read."""
+        with self._lock:
+            known = {
+                r["file"]: (r["mtime_ns"], r["size"])
+                for r in self.con.execute("SELECT file, mtime_ns, size FROM entries")
+            }
+            changed = []
+            seen = set()
+            for path in self.entries_dir.glob("*.html"):
+                st = path.stat()
+                seen.add(path.name)
+                if known.get(path.name) != (st.st_mtime_ns, st.st_size):
+                    changed.append(_entry_row(path, st))
+            gone = [(f,) for f in known if f not in seen]
+            if changed or gone:
+                with self.con:
+                    self.con.executemany("INSERT OR REPLACE INTO entries VALUES (?,?,?,?,?,?,?,?,?,?,?)", changed)
+                    self.con.executemany("DELETE FROM entries WHERE file = ?", gone)
+            return len(changed)
+
+    def note_saved(self, path):
+        path = Path(path)
+        with self._lock, self.con:
+            self.con.execute("INSERT OR REPLACE INTO entries VALUES (?,?,?,?,?,?,?,?,?,?,?)",
+                             _entry_row(path, path.stat()))
+
+    def note_saved_many(self, paths):
+        """One transaction for a batch of freshly written entries (bulk import)."""
+        rows = [_entry_row(Path(p), Path(p).stat()) for p in paths]
+        with self._lock, self.con:
+            self.con.executemany("INSERT OR REPLACE INTO entries VALUES (?,?,?,?,?,?,?,?,?,?,?)", rows)
+
+    def note_deleted(self, path):
+        with self._lock, self.con:
+            self.con.execute("DELETE FROM entries WHERE file = ?", (Path(path).name,))
+
+    # ---- reading ----
+    @staticmethod
+    def _where(type_filter, gen_filter, shiny_only, search):
+        where, args = [], []
+        if type_filter != "All Types":
+            where.append("type = ?")
+            args.append(type_filter)
+        if gen_filter != "All Generations":
+            where.append("generation = ?")
+            args.append(gen_filter)
+        if shiny_only:
+            where.append("shiny = 1")
+        if search:
+            where.append("(name LIKE ? OR evolution_line LIKE ?)")
+            args += [f"%{search}%"] * 2
+        return (" WHERE " + " AND ".join(where) if where else ""), args
+
+    def query(self, type_filter="All Types", gen_filter="All Generations", shiny_only=False, sort="Name",
+              search="", limit=None, offset=0):
+        """[(path, metadata)] like filter_pokemon(), straight from the index (one page with limit/offset)."""
+        where, args = self._where(type_filter, gen_filter, shiny_only, search)
+        sql = "SELECT * FROM entries" + where + " ORDER BY " + SORTS.get(sort, SORTS["Name"])
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            args += [limit, offset]
+        with self._lock:
+            rows = self.con.execute(sql, args).fetchall()
+        return [(self.entries_dir / r["file"], self._metadata(r)) for r in rows]
+
+    def random_entry(self, type_filter="All Types", gen_filter="All Generations", shiny_only=False, search=""):
+        """Path of one random matching entry (None when nothing matches)."""
+        where, args = self._where(type_filter, gen_filter, shiny_only, search)
+        with self._lock:
+            row = self.con.execute("SELECT file FROM entries" + where + " ORDER BY RANDOM() LIMIT 1", args).fetchone()
+        return self.entries_dir / row["file"] if row else None
+
+    def counts(self, column):
+        """{value: n} for 'type' or 'generation' (sidebar labels)."""
+        if column not in ("type", "generation"):
+            raise ValueError(column)
+        with self._lock:
+            rows = self.con.execute(f"SELECT {column} AS v, COUNT(*) AS n FROM entries GROUP BY {column}")
+            return {r["v"]: r["n"] for r in rows}
+
+    def total(self, type_filter="All Types", gen_filter="All Generations", shiny_only=False, search=""):
+        where, args = self._where(type_filter, gen_filter, shiny_only, search)
+        with self._lock:
+            return self.con.execute("SELECT COUNT(*) FROM entries" + where, args).fetchone()[0]
+
+    @staticmethod
+    def _metadata(row):
+        return {
+            "type": row["type"],
+            "generation": row["generation"],
+            "evolution_line": [e for e in row["evolution_line"].split(", ") if e],
+            "variant": row["variant"],
+            "shiny": bool(row["shiny"]),
+            "date": row["entry_date"],
+        }
+
+
+_INDEXES = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+def get_index(entries_dir):
+    """One PokeIndex per folder per process (module state survives Streamlit reruns)."""
+    key = str(Path(entries_dir).resolve())
+    with _INDEXES_LOCK:
+        idx = _INDEXES.get(key)
+        if idx is None:
+            idx = _INDEXES[key] = PokeIndex(key)
+        return idx
@@ -0,0 +1,300 @@
+# ═══════════════════════════════════════════════════════════════
+# NACLI POKÉAPP - Media helpers (shared by Pokeapp.py and Dev_Forge/pages/Nacli-app.py)
+# Clarity and Steadfastness
+#
+# Image ingestion:
+# - EXIF orientation applied, then ALL metadata dropped (re-encoded from pixels)
+# - Downscaled to a preset max dimension (hero / gallery / thumb), never upscaled
+# - WebP or JPEG at a chosen quality; PNG only when the image has real transparency
+# - Sizes reported so the builder can show a byte budget per entry
+#
+# Asset store (opt-in):
+# - Images saved once as images/<sha256>.<ext>; entries reference ../images/<sha256>.<ext>
+# - Same image in many entries = one file on disk
+# - bundle_html() inlines those references as data URIs (preview, self-contained download)
+#
+# Music:
+# - Track bytes memoised by (path, mtime, size) and handed to st.audio, which serves
+#   them over HTTP instead of pushing a base64 string through the websocket each rerun
+# - WAV transcoded ONCE to AAC (.m4a) with ffmpeg when available (optional)
+# ═══════════════════════════════════════════════════════════════
+
+import base64
+import hashlib
+import io
+import os
+import re
+import shutil
+import subprocess
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+from PIL import Image, ImageOps, features
+
+# max width/height in pixels
+PRESETS = {
+    "hero": 1024,
+    "gallery": 800,
+    "thumb": 256,
+}
+
+FORMATS = ["Auto", "WebP", "JPEG", "PNG"]
+DEFAULT_QUALITY = 82
+
+# soft limit for all images in one entry (hero + gallery)
+ENTRY_BUDGET_BYTES = 1_500_000
+
+WEBP_OK = features.check("webp")
+
+_MIME = {"WEBP": "image/webp", "JPEG": "image/jpeg", "PNG": "image/png"}
+_EXT = {"WEBP": "webp", "JPEG": "jpg", "PNG": "png"}
+
+
+@dataclass(frozen=True)
+class IngestedImage:
+    data: bytes
+    fmt: str          # WEBP / JPEG / PNG
+    width: int
+    height: int
+    source_bytes: int
+
+    @property
+    def mime(self):
+        return _MIME[self.fmt]
+
+    @property
+    def ext(self):
+        return _EXT[self.fmt]
+
+    @property
+    def size(self):
+        return len(self.data)
+
+    def data_uri(self):
+        # built once per image: previews re-embed the same images on every rerun
+        uri = self.__dict__.get("_data_uri")
+        if uri is None:
+            uri = f"data:{self.mime};base64,{base64.b64encode(self.data).decode()}"
+            object.__setattr__(self, "_data_uri", uri)
+        return uri
+
+    @property
+    def asset_name(self):
+        return f"{hashlib.sha256(self.data).hexdigest()}.{self.ext}"
+
+
+def has_transparency(image):
+    """True only when some pixel is actually see-through (not just an alpha channel)."""
+    if image.mode == "P":
+        if "transparency" not in image.info:
+            return False
+        image = image.convert("RGBA")
+    if image.mode in ("RGBA", "LA", "PA"):
+        return image.getchannel("A").getextrema()[0] < 255
+    return False
+
+
+def _flatten(image, background=(255, 255, 255)):
+    """Alpha composited onto a solid background (JPEG has no alpha)."""
+    rgba = image.convert("RGBA")
+    base = Image.new("RGB", rgba.size, background)
+    base.paste(rgba, mask=rgba.getchannel("A"))
+    return base
+
+
+def _pick_format(choice, transparent):
+    choice = (choice or "Auto").upper()
+    if choice == "AUTO":
+        if WEBP_OK:
+            return "WEBP"
+        return "PNG" if transparent else "JPEG"
+    if choice == "WEBP" and not WEBP_OK:
+        return "PNG" if transparent else "JPEG"
+    return choice
+
+
+def ingest_image(image_file, preset="hero", fmt="Auto", quality=DEFAULT_QUALITY):
+    """Uploaded file / path / bytes -> IngestedImage (resized, oriented, metadata-free)."""
+    if image_file is None:
+        return None
+    if isinstance(image_file, (bytes, bytearray)):
+        raw = bytes(image_file)
+    elif hasattr(image_file, "getvalue"):
+        raw = image_file.getvalue()
+    elif hasattr(image_file, "read"):
+        raw = image_file.read()
+    else:
+        with open(image_file, "rb") as f:
+            raw = f.read()
+
+    limit = PRESETS.get(preset, PRESETS["hero"])
+
+    image = Image.open(io.BytesIO(raw))
+    image.seek(0)  # animated GIF/WebP -> first frame
+    if image.format == "JPEG":
+        image.draft("RGB", (limit, limit))  # decode at 1/2, 1/4 ... scale: phone photos load fast
+    image = ImageOps.exif_transpose(image)
+
+    if max(image.size) > limit:
+        image.thumbnail((limit, limit), Image.LANCZOS)
+
+    transparent = has_transparency(image)
+    out_fmt = _pick_format(fmt, transparent)
+
+    if transparent and out_fmt != "JPEG":
+        image = image.convert("RGBA")
+    elif image.mode in ("RGBA", "LA", "PA", "P"):
+        image = _flatten(image)
+    elif image.mode != "RGB":
+        image = image.convert("RGB")
+
+    buf = io.BytesIO()
+    if out_fmt == "WEBP":
+        image.save(buf, format="WEBP", quality=quality, method=4)
+    elif out_fmt == "JPEG":
+        image.save(buf, format="JPEG", quality=quality, optimize=True, progressive=True)
+    else:
+        image.save(buf, format="PNG", optimize=True)
+
+    return IngestedImage(buf.getvalue(), out_fmt, image.width, image.height, len(raw))
+
+
+def format_bytes(n):
+    for unit in ("B", "KB", "MB"):
+        if n < 1024 or unit == "MB":
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+
+
+def entry_image_bytes(hero, gallery_images):
+    """Total encoded bytes of the images one entry will carry."""
+    total = hero.size if hero else 0
+    total += sum(img.size for img in gallery_images if img)
+    return total
+
+
+# ═══════════════════════════════════════════════════════════════
+# ASSET STORE
+# ═══════════════════════════════════════════════════════════════
+
+# entries live in pokemon_entries/, assets in the sibling images/ folder
+ASSET_PREFIX = "../images/"
+ASSET_REF_RE = re.compile(r'(?:\.\./)?images/([0-9a-f]{64}\.(?:webp|jpg|png))')
+_EXT_MIME = {"webp": "image/webp", "jpg": "image/jpeg", "png": "image/png"}
+
+
+def store_asset(image, images_dir):
+    """Writes the image once under its content hash; returns the reference for entry HTML."""
+    path = Path(images_dir) / image.asset_name
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_bytes(image.data)
+        os.replace(tmp, path)
+    return ASSET_PREFIX + image.asset_name
+
+
+def image_src(image, images_dir=None):
+    """img src for an entry: shared asset reference (asset mode) or inline data URI."""
+    if image is None:
+        return None
+    return store_asset(image, images_dir) if images_dir else image.data_uri()
+
+
+@lru_cache(maxsize=128)
+def _asset_data_uri(path_str):
+    # content-addressed: a given file name never changes, so no invalidation needed
+    path = Path(path_str)
+    if not path.exists():
+        return None
+    mime = _EXT_MIME[path.suffix.lstrip(".")]
+    return f"data:{mime};base64,{base64.b64encode(path.read_bytes()).decode()}"
+
+
+def asset_refs(html_content):
+    return sorted(set(ASSET_REF_RE.findall(html_content)))
+
+
+def bundle_html(html_content, images_dir):
+    """Self-contained copy: every ../images/<sha256>.<ext> replaced by its data URI."""
+    if "images/" not in html_content:
+        return html_content
+    images_dir = Path(images_dir)
+
+    def inline(match):
+        uri = _asset_data_uri(str(images_dir / match.group(1)))
+        return uri or match.group(0)
+
+    html_content = ASSET_REF_RE.sub(inline, html_content)
+    return html_content.replace("<!-- SELF_CONTAINED: false -->", "<!-- SELF_CONTAINED: true -->")
+
+
+# ═══════════════════════════════════════════════════════════════
+# MUSIC
+# ═══════════════════════════════════════════════════════════════
+
+# Optional transcoder (WAV -> AAC); without it WAVs play as-is
+FFMPEG = shutil.which("ffmpeg")
+
+MUSIC_EXTS = (".mp3", ".m4a", ".ogg", ".wav")
+AUDIO_MIME = {".mp3": "audio/mpeg", ".m4a": "audio/mp4", ".ogg": "audio/ogg", ".wav": "audio/wav"}
+AUDIO_BITRATE = "160k"
+
+
+def list_music(music_dir):
+    """Playable tracks, hiding a WAV once its compressed copy exists."""
+    music_dir = Path(music_dir)
+    files = sorted(p for p in music_dir.iterdir() if p.suffix.lower() in MUSIC_EXTS) if music_dir.exists() else []
+    compressed = {p.stem for p in files if p.suffix.lower() != ".wav"}
+    return [p for p in files if not (p.suffix.lower() == ".wav" and p.stem in compressed)]
+
+
+def transcode_wav(wav_path):
+    """WAV -> .m4a next to it (once). Returns the new path, or None if ffmpeg is missing/fails."""
+    wav_path = Path(wav_path)
+    target = wav_path.with_suffix(".m4a")
+    if target.exists() and target.stat().st_mtime >= wav_path.stat().st_mtime:
+        return target
+    if not FFMPEG:
+        return None
+    tmp = target.with_name(target.stem + ".tmp.m4a")
+    result = subprocess.run(
+        [FFMPEG, "-y", "-loglevel", "error", "-i", str(wav_path), "-vn", "-c:a", "aac", "-b:a", AUDIO_BITRATE, str(tmp)],
+        capture_output=True,
+    )
+    if result.returncode != 0:
+        tmp.unlink(missing_ok=True)
+        return None
+    os.replace(tmp, target)
+    return target
+
+
+def import_music(uploaded_file, music_dir):
+    """Saves an uploaded track; WAV is transcoded on import (the original kept only if that fails)."""
+    music_dir = Path(music_dir)
+    music_dir.mkdir(parents=True, exist_ok=True)
+    path = music_dir / Path(uploaded_file.name).name
+    path.write_bytes(uploaded_file.getvalue())
+    if path.suffix.lower() == ".wav":
+        compressed = transcode_wav(path)
+        if compressed:
+            path.unlink()
+            return compressed
+    return path
+
+
+@lru_cache(maxsize=4)
+def _track_bytes(path_str, mtime_ns, size):
+    with open(path_str, "rb") as f:
+        return f.read()
+
+
+def load_track(path):
+    """(bytes, mime) for st.audio, read from disk only when the file changes."""
+    path = Path(path)
+    if path.suffix.lower() == ".wav":
+        path = transcode_wav(path) or path
+    st = path.stat()
+    data = _track_bytes(str(path), st.st_mtime_ns, st.st_size)
+    return data, AUDIO_MIME.get(path.suffix.lower(), "audio/mpeg")
@@ -0,0 +1,148 @@
+# ═══════════════════════════════════════════════════════════════
+# NACLI POKÉAPP - Entry page renderer (shared by Pokeapp.py and Dev_Forge/pages/Nacli-app.py)
+# Clarity and Steadfastness
+#
+# - Page layout lives in templates/entry_builder.html (plain HTML/CSS, Printessa slots)
+#   compiled ONCE at import into literal/slot segments
+# - Repeating sections (hero, stats, moves, traits, gallery) are small compiled
+#   fragments, each memoised by its inputs: a preview after editing one field
+#   re-renders that section only, the rest is a cache hit
+# - Every user value is HTML-escaped by its slot (names, captions, moves, traits)
+# ═══════════════════════════════════════════════════════════════
+
+import sys
+from functools import lru_cache
+from pathlib import Path
+
+POKE_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(POKE_DIR.parent))
+from generators.printessa import compile_template  # noqa: E402
+
+ENTRY_TEMPLATE = POKE_DIR / "templates" / "entry_builder.html"
+ENTRY_PAGE = compile_template(ENTRY_TEMPLATE.read_text(encoding="utf-8"))
+
+STAT_FIELDS = [
+    ("hp", "HP"),
+    ("attack", "Attack"),
+    ("defense", "Defense"),
+    ("sp_atk", "Sp. Atk"),
+    ("sp_def", "Sp. Def"),
+    ("speed", "Speed"),
+]
+
+HERO_IMG = compile_template('<img src="{{SRC}}" alt="{{ALT=Pokemon}}" class="hero-image">')
+HERO_PLACEHOLDER = '<div class="hero-placeholder">⛏️</div>'
+
+GALLERY_ITEM = compile_template('''<div class="gallery-item">
+    <img src="{{SRC}}" alt="{{CAPTION=}}">
+    {{CAPTION_HTML|raw=}}
+</div>''')
+GALLERY_CAPTION = compile_template('<div class="gallery-caption">{{CAPTION}}</div>')
+GALLERY_EMPTY = '<p style="text-align: center; opacity: 0.6;">No images in gallery</p>'
+
+STAT_BOX = compile_template('''<div class="stat-box">
+                        <div class="stat-label">{{LABEL}}</div>
+                        <div class="stat-value">{{VALUE=0}}</div>
+                    </div>''')
+
+MOVE_ITEM = compile_template('<div class="move-item">{{MOVE}}</div>\n')
+MOVES_EMPTY = '<p style="opacity: 0.6;">No moves listed</p>'
+
+TRAIT_BOX = compile_template('''<div class="trait-box">
+    <div class="trait-label">{{LABEL=}}</div>
+    <div class="trait-name">{{NAME}}</div>
+    <div class="trait-desc">{{DESCRIPTION=}}</div>
+</div>\n''')
+TRAITS_EMPTY = '<p style="opacity: 0.6;">No traits listed</p>'
+
+
+# ═══════════════════════════════════════════════════════════════
+# SECTIONS (memoised by their inputs)
+# ═══════════════════════════════════════════════════════════════
+
+def create_hero_image_tag(image_src, alt_text="Pokemon"):
+    """Create hero image HTML tag (src = data URI or relative path)"""
+    if not image_src:
+        return HERO_PLACEHOLDER
+    return _hero_html(image_src, alt_text)
+
+
+def create_gallery_image_tag(image_src, caption=""):
+    """Create gallery image HTML tag"""
+    if not image_src:
+        return ""
+    caption_html = GALLERY_CAPTION.render({"CAPTION": caption}) if caption else ""
+    return GALLERY_ITEM.render({"SRC": image_src, "CAPTION": caption, "CAPTION_HTML": caption_html})
+
+
+# image sources can be data URIs (large strings): keep only a few of those around
+@lru_cache(maxsize=8)
+def _hero_html(image_src, alt_text):
+    return HERO_IMG.render({"SRC": image_src, "ALT": alt_text})
+
+
+@lru_cache(maxsize=8)
+def _gallery_html(items):
+    gallery_html = "".join(create_gallery_image_tag(src, caption) for src, caption in items if src)
+    return gallery_html or GALLERY_EMPTY
+
+
+@lru_cache(maxsize=64)
+def _stats_html(values):
+    return "\n                    ".join(
+        STAT_BOX.render({"LABEL": label, "VALUE": value})
+        for (_, label), value in zip(STAT_FIELDS, values)
+    )
+
+
+@lru_cache(maxsize=64)
+def _moves_html(moves):
+    moves_html = "".join(MOVE_ITEM.render({"MOVE": move}) for move in moves if move)
+    return moves_html or MOVES_EMPTY
+
+
+@lru_cache(maxsize=64)
+def _traits_html(traits):
+    traits_html = "".join(
+        TRAIT_BOX.render({"LABEL": label, "NAME": name, "DESCRIPTION": description})
+        for label, name, description in traits if name
+    )
+    return traits_html or TRAITS_EMPTY
+
+
+# ═══════════════════════════════════════════════════════════════
+# PAGE
+# ═══════════════════════════════════════════════════════════════
+
+def render_entry(data):
+    """Complete Pokemon HTML entry from the builder's data dict."""
+    shiny = bool(data.get('is_shiny'))
+    stats = data.get('stats', {})
+    values = {
+        'NAME': data['name'],
+        'TYPE': data['type'],
+        'GENERATION': data['generation'],
+        'VARIANT': data['variant'],
+        'EVOLUTION_LINE': data['evolution_line'],
+        'OT': data.get('ot'),
+        'ID_NO': data.get('id_no'),
+        'FIRST_MET_LOCATION': data.get('first_met_location'),
+        'FIRST_MET_DATE': data.get('first_met_date'),
+        'NATURE': data.get('nature'),
+        'ABILITY': data.get('ability'),
+        'CHARACTERISTIC': data.get('characteristic'),
+        'SHINY_CLASS': "shiny" if shiny else "",
+        'SHINY_OPEN': "✨ " if shiny else "",
+        'SHINY_CLOSE': " ✨" if shiny else "",
+        'SELF_CONTAINED': "true" if data.get('self_contained', True) else "false",
+        'HERO_HTML': create_hero_image_tag(data.get('hero_image_src'), data['name']),
+        'STATS_HTML': _stats_html(tuple(stats.get(key, 0) for key, _ in STAT_FIELDS)),
+        'MOVES_HTML': _moves_html(tuple(data.get('moves', []))),
+        'TRAITS_HTML': _traits_html(tuple(
+            (t['label'], t['name'], t['description']) for t in data.get('traits', [])
+        )),
+        'GALLERY_HTML': _gallery_html(tuple(
+            (item['src'], item['caption']) for item in data.get('gallery_items', [])
+        )),
+    }
+    return ENTRY_PAGE.render(values)
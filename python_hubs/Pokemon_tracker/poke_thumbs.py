@@ -0,0 +1,100 @@
+# ═══════════════════════════════════════════════════════════════
+# NACLI POKÉAPP - Library card thumbnails (used by GlassyLibrary.py)
+# Clarity and Steadfastness
+#
+# - Thumbnail = the entry's hero image (data URI or shared ../images/ asset),
+#   downscaled to the "thumb" preset
+# - Stored on disk as images/thumbs/<sha256 of the hero image>.<ext>:
+#   same picture in many entries = one thumbnail, made once, never stale
+# - Entry -> thumbnail lookups memoised by (file, mtime, size), so an unchanged
+#   entry is read at most once per process, and only when its card is on screen
+# ═══════════════════════════════════════════════════════════════
+
+import base64
+import binascii
+import hashlib
+import os
+import re
+from functools import lru_cache
+from pathlib import Path
+
+from poke_media import ASSET_REF_RE, WEBP_OK, ingest_image
+
+THUMB_QUALITY = 75
+# PNG fallback keeps transparent sprites transparent
+THUMB_FORMAT, THUMB_EXT = ("WebP", "webp") if WEBP_OK else ("PNG", "png")
+
+_IMG_TAG_RE = re.compile(r'<img\b[^>]*>', re.IGNORECASE)
+_SRC_RE = re.compile(r'\bsrc="([^"]+)"')
+_DATA_URI_RE = re.compile(r'^data:image/[\w.+-]+;base64,(.+)$', re.DOTALL)
+
+
+def _hero_src(html_content):
+    """src of the hero image (builder entries), else of the first real image."""
+    fallback = None
+    for tag in _IMG_TAG_RE.findall(html_content):
+        src = _SRC_RE.search(tag)
+        if not src:
+            continue
+        src = src.group(1)
+        if not (src.startswith("data:image/") or ASSET_REF_RE.search(src)):
+            continue  # template placeholders, remote URLs
+        if 'hero-image' in tag:
+            return src
+        fallback = fallback or src
+    return fallback
+
+
+def _src_bytes(src, images_dir):
+    data_uri = _DATA_URI_RE.match(src)
+    if data_uri:
+        try:
+            return base64.b64decode(data_uri.group(1), validate=False)
+        except (binascii.Error, ValueError):
+            return None
+    asset = ASSET_REF_RE.search(src)
+    path = Path(images_dir) / asset.group(1)
+    return path.read_bytes() if path.exists() else None
+
+
+def _make_thumb(raw, thumbs_dir):
+    path = Path(thumbs_dir) / f"{hashlib.sha256(raw).hexdigest()}.{THUMB_EXT}"
+    if path.exists():
+        return path
+    try:
+        thumb = ingest_image(raw, "thumb", THUMB_FORMAT, THUMB_QUALITY)
+    except Exception:
+        return None  # not a decodable image
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_bytes(thumb.data)
+    os.replace(tmp, path)
+    return path
+
+
+@lru_cache(maxsize=4096)
+def _entry_thumb(path_str, mtime_ns, size, images_dir):
+    content = Path(path_str).read_text(encoding="utf-8", errors="replace")
+    src = _hero_src(content)
+    if not src:
+        return None
+    raw = _src_bytes(src, images_dir)
+    if not raw:
+        return None
+    return _make_thumb(raw, Path(images_dir) / "thumbs")
+
+
+def entry_thumbnail(entry_path, images_dir):
+    """Thumbnail file for an entry (made on first request), or None without a usable image."""
+    entry_path = Path(entry_path)
+    try:
+        st = entry_path.stat()
+    except FileNotFoundError:
+        return None
+    return _entry_thumb(str(entry_path), st.st_mtime_ns, st.st_size, str(images_dir))
+
+
+@lru_cache(maxsize=256)
+def thumbnail_bytes(thumb_path):
+    # content-addressed file: bytes for a given name never change
+    return Path(thumb_path).read_bytes()
@@ -4,24 +4,55 @@ Teacher-first. No AI. No analytics. No admin logic.
 
 Purpose:
 - Copy base HTML templates
-- Lightly populate safe fields (date, title, standards)
+- Lightly populate safe fields (date, title, standards) via named {{SLOTS}}
 - Output ready-to-print files
+- Batch mode: a manifest (CSV/JSON) of many titles x standards x templates
+  rendered across a worker pool into a folder or straight into one ZIP
+- Header fields are checked against artifact_contracts/schemas before anything
+  is written (generators must comply or fail)
+
+Usage:
+  python python_hubs/generate_artifacts.py                      # interactive, one title
+  python python_hubs/generate_artifacts.py --manifest semester.csv --out semester.zip
 """
 
+import argparse
+import csv
+import json
 import os
+import re
+import sys
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import date
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from generators import printessa  # noqa: E402
+from logic import artifact_validation  # noqa: E402
+
 # ===== CONFIG =====
 TEMPLATES = {
     "exit_ticket": "materials/exit_tickets/exit_ticket_v1.html",
-    "worksheet": "materials/worksheets/worksheet_v1.html",
+    "worksheet": "materials/materials/worksheets/worksheet_v1.html",
     "lesson_plan": "materials/lesson_plans/lesson_plan_v1.html",
     "pbis_reflective": "materials/pbis/pbis_reflective_note_v1.html",
     "photo_evidence": "materials/evidence/photo_evidence_v1.html"
 }
 
+# template -> artifact_contracts/schemas/<contract>.schema.json
+CONTRACTS = {
+    "exit_ticket": "exit_ticket",
+    "worksheet": "worksheet",
+    "lesson_plan": "lesson_plan",
+    "pbis_reflective": "pbis_form",
+    "photo_evidence": "evidence_capture",
+}
+
 OUTPUT_DIR = "generated_artifacts"
 
+# Template paths are relative to the repo root (fallback when run from elsewhere)
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
 SAFE_PLACEHOLDERS = {
     "{{DATE}}": date.today().isoformat(),
 }
@@ -31,27 +62,79 @@ def ensure_dir(path):
     if not os.path.exists(path):
         os.makedirs(path)
 
+def template_path(path):
+    if os.path.exists(path) or os.path.isabs(path):
+        return path
+    return os.path.join(REPO_ROOT, path)
+
 def load_template(path):
-    with open(path, "r", encoding="utf-8") as f:
+    with open(template_path(path), "r", encoding="utf-8") as f:
         return f.read()
 
 def save_output(content, out_path):
     with open(out_path, "w", encoding="utf-8") as f:
         f.write(content)
 
+def slugify(text, fallback="untitled"):
+    s = re.sub(r"[^a-z0-9]+", "_", (text or "").lower()).strip("_")
+    return s[:48] or fallback
+
+# ===== COMPILED TEMPLATES =====
+# Templates mark named slots (<span data-slot="TITLE">, "STANDARDS", "DATE" ...), compiled once
+# by generators/printessa.py and rendered with a single join.
+def load_plan(path):
+    """Compiled template for a file, cached until the file changes."""
+    return printessa.load_template(template_path(path))
+
+def safe_values(title="", standards="", **extra):
+    values = {key.strip("{} "): value for key, value in SAFE_PLACEHOLDERS.items()}
+    values.update({"TITLE": title, "STANDARDS": standards})
+    values.update({k.upper(): v for k, v in extra.items()})
+    return values
+
+def render_plan(plan, fields):
+    return plan.render(fields)
+
 def populate_safe_fields(content, title="", standards=""):
-    content = content.replace("__________________________", title or "__________________________", 1)
-    content = content.replace("__________________________", standards or "__________________________", 1)
-    return content
+    return printessa.compile_template(content).render(safe_values(title, standards))
+
+# ===== CONTRACTS =====
+def contract_record(title="", standards="", **extra):
+    """The header fields a generator fills, shaped like the contract fields."""
+    record = {k.lower(): v for k, v in extra.items() if v not in (None, "")}
+    if title:
+        record["title"] = title
+    if standards:
+        record["standard_tags"] = artifact_validation.split_tags(standards)
+    return record
+
+def check_contracts(items):
+    """
+    items: (label, template_name, record). Partial check (only the fields present).
+    Raises ValueError listing every offending output; nothing has been written yet.
+    """
+    by_template = {}
+    for label, name, record in items:
+        by_template.setdefault(name, []).append((label, record))
+    problems = []
+    for name, rows in by_template.items():
+        bad = artifact_validation.validate_many(CONTRACTS[name], (r for _, r in rows), partial=True)
+        for i, errors in bad.items():
+            problems.append(f"{rows[i][0]}: {artifact_validation.format_errors(errors)}")
+    if problems:
+        shown = "\n  ".join(problems[:20])
+        more = f"\n  ... and {len(problems) - 20} more" if len(problems) > 20 else ""
+        raise ValueError(f"{len(problems)} artifact(s) break their contract:\n  {shown}{more}")
 
 # ===== MAIN =====
 def generate_all(title="", standards=""):
     today = date.today().isoformat()
+    record = contract_record(title, standards)
+    check_contracts((name, name, record) for name in TEMPLATES)
     ensure_dir(OUTPUT_DIR)
 
-    for name, template_path in TEMPLATES.items():
-        html = load_template(template_path)
-        html = populate_safe_fields(html, title=title, standards=standards)
+    for name, template_path_ in TEMPLATES.items():
+        html = render_plan(load_plan(template_path_), safe_values(title, standards))
 
         out_name = f"{name}_{today}.html"
         out_path = os.path.join(OUTPUT_DIR, out_name)
@@ -59,10 +142,104 @@ def generate_all(title="", standards=""):
         save_output(html, out_path)
         print(f"Generated: {out_path}")
 
+# ===== BATCH =====
+def read_manifest(path):
+    """
+    Rows of: title, standards, templates (optional), plus any extra slot columns.
+    templates = "exit_ticket;worksheet" (CSV) or a list (JSON); blank = all templates.
+    """
+    if path.lower().endswith(".csv"):
+        with open(path, "r", encoding="utf-8-sig", newline="") as f:
+            rows = list(csv.DictReader(f))
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            rows = json.load(f)
+        if isinstance(rows, dict):
+            rows = rows.get("lessons") or rows.get("rows") or []
+    for row in rows:
+        names = row.get("templates") or list(TEMPLATES)
+        if isinstance(names, str):
+            names = [n.strip() for n in re.split(r"[;,|]", names) if n.strip()]
+        yield {
+            "title": (row.get("title") or "").strip(),
+            "standards": (row.get("standards") or "").strip(),
+            "templates": names,
+            # any other column fills a slot of the same name (e.g. unit -> {{UNIT}})
+            "extra": {k: v for k, v in row.items() if k and k not in ("title", "standards", "templates")},
+        }
+
+def plan_jobs(manifest_rows, validate=True):
+    """(out_name, template_name, fields) per output file; names are collision-safe."""
+    today = date.today().isoformat()
+    used = set()
+    jobs = []
+    records = []
+    for row in manifest_rows:
+        for name in row["templates"]:
+            if name not in TEMPLATES:
+                raise ValueError(f"Unknown template '{name}' (choose from: {', '.join(TEMPLATES)})")
+            stem = f"{name}_{slugify(row['title'])}_{today}"
+            out_name, n = f"{stem}.html", 2
+            while out_name in used:
+                out_name, n = f"{stem}_{n}.html", n + 1
+            used.add(out_name)
+            jobs.append((out_name, name, safe_values(row["title"], row["standards"], **row["extra"])))
+            records.append((out_name, name, contract_record(row["title"], row["standards"], **row["extra"])))
+    if validate:
+        check_contracts(records)
+    return jobs
+
+def _render_job(job):
+    # top-level so process pools can pickle it
+    out_name, plan, fields = job
+    return out_name, render_plan(plan, fields)
+
+def generate_batch(manifest_path, out=OUTPUT_DIR, workers=None, use_processes=False, validate=True):
+    """
+    Renders every manifest row x template. Each template is compiled ONCE.
+    The whole manifest is contract-checked first (ValueError, no files written).
+    out ending in .zip -> one archive, written as results arrive; else a folder.
+    Returns the number of files written.
+    """
+    plans = {name: load_plan(path) for name, path in TEMPLATES.items()}
+    jobs = [(out_name, plans[name], fields) for out_name, name, fields in plan_jobs(read_manifest(manifest_path), validate)]
+
+    pool_cls = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+    chunksize = max(1, len(jobs) // ((workers or os.cpu_count() or 1) * 4))
+    count = 0
+    with pool_cls(max_workers=workers) as pool:
+        results = pool.map(_render_job, jobs, chunksize=chunksize)
+        if out.lower().endswith(".zip"):
+            ensure_dir(os.path.dirname(os.path.abspath(out)))
+            with zipfile.ZipFile(out, "w", compression=zipfile.ZIP_DEFLATED) as z:
+                for out_name, html in results:
+                    z.writestr(out_name, html)
+                    count += 1
+        else:
+            ensure_dir(out)
+            for out_name, html in results:
+                save_output(html, os.path.join(out, out_name))
+                count += 1
+    return count
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="BSChapp Generator (Phase 1)")
+    parser.add_argument("--manifest", help="CSV/JSON of lessons: title, standards, templates")
+    parser.add_argument("--out", default=OUTPUT_DIR, help="output folder, or a .zip path")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--processes", action="store_true", help="use a process pool instead of threads")
+    args = parser.parse_args()
+
     print("BSChapp Generator (Phase 1)")
-    title = input("Enter lesson/topic title (optional): ").strip()
-    standards = input("Enter standard tags (optional): ").strip()
+    try:
+        if args.manifest:
+            n = generate_batch(args.manifest, out=args.out, workers=args.workers, use_processes=args.processes)
+            print(f"Done. {n} file(s) written to {args.out}.")
+        else:
+            title = input("Enter lesson/topic title (optional): ").strip()
+            standards = input("Enter standard tags (optional): ").strip()
 
-    generate_all(title=title, standards=standards)
-    print("Done. Files are ready to print.")
\ No newline at end of file
+            generate_all(title=title, standards=standards)
+            print("Done. Files are ready to print.")
+    except ValueError as e:
+        sys.exit(f"Not generated. {e}")
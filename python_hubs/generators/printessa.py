@@ -0,0 +1,111 @@
+"""
+Printessa template engine — named slots for materials/*.html
+
+Slot syntax (inside any template text):
+    {{TITLE}}                 HTML-escaped value
+    {{NOTES|lines}}           HTML-escaped, newlines -> <br>
+    {{SNIPPET|raw}}           inserted as-is (trusted HTML only)
+    {{DATE=____________}}     text printed when no value is given (the blank line)
+
+Printable templates (materials/*.html) mark slots with a span instead, so the
+file opened or printed as-is still shows the blank line:
+    <span data-slot="DATE">____________</span>
+    <span data-slot="NOTES" data-mode="lines">____</span>
+The span is kept; only its content is replaced by the value.
+
+A template is parsed ONCE into literal/slot segments; rendering is a single
+"".join over those segments, however many slots the template has.
+"""
+
+from __future__ import annotations
+
+import html
+import os
+import re
+from dataclasses import dataclass
+from typing import Callable, Dict, Mapping, Tuple
+
+BLANK = "__________________________"
+
+_SLOT_RE = re.compile(
+    r"\{\{\s*(?P<name>[A-Z][A-Z0-9_]*)\s*(?:\|\s*(?P<mode>html|lines|raw)\s*)?(?:=(?P<blank>[^}]*))?\}\}"
+    r"|(?P<open><span\s+data-slot=\"(?P<span_name>[A-Z][A-Z0-9_]*)\""
+    r"(?:\s+data-mode=\"(?P<span_mode>html|lines|raw)\")?\s*>)(?P<span_blank>[^<]*)(?P<close></span>)"
+)
+
+
+def _escape_lines(s: str) -> str:
+    return html.escape(s).replace("\r\n", "\n").replace("\n", "<br>")
+
+
+def _raw(s: str) -> str:
+    return s
+
+
+_ESCAPERS: Dict[str, Callable[[str], str]] = {
+    "html": html.escape,
+    "lines": _escape_lines,
+    "raw": _raw,
+}
+
+
+@dataclass(frozen=True)
+class Slot:
+    name: str
+    mode: str  # key of _ESCAPERS (kept as a name so compiled templates pickle)
+    blank: str
+
+
+@dataclass(frozen=True)
+class CompiledTemplate:
+    segments: Tuple[object, ...]  # str literals and Slot objects, in order
+    slot_names: Tuple[str, ...]  # unique, first-seen order
+
+    def render(self, values: Mapping[str, object] | None = None) -> str:
+        values = values or {}
+        out = []
+        for seg in self.segments:
+            if isinstance(seg, Slot):
+                v = values.get(seg.name)
+                out.append(seg.blank if v is None or v == "" else _ESCAPERS[seg.mode](str(v)))
+            else:
+                out.append(seg)
+        return "".join(out)
+
+
+def compile_template(text: str) -> CompiledTemplate:
+    segments = []
+    names = []
+    pos = 0
+    for m in _SLOT_RE.finditer(text):
+        if m.start() > pos:
+            segments.append(text[pos:m.start()])
+        if m.group("open"):
+            # <span data-slot>: the span stays, its text is the blank
+            name, mode, blank = m.group("span_name"), m.group("span_mode") or "html", m.group("span_blank")
+            segments += [m.group("open"), Slot(name, mode, blank), m.group("close")]
+        else:
+            name, mode, blank = m.group("name"), m.group("mode") or "html", m.group("blank")
+            segments.append(Slot(name, mode, BLANK if blank is None else blank))
+        if name not in names:
+            names.append(name)
+        pos = m.end()
+    if pos < len(text):
+        segments.append(text[pos:])
+    return CompiledTemplate(tuple(segments), tuple(names))
+
+
+_CACHE: Dict[Tuple[str, int, int], CompiledTemplate] = {}
+
+
+def load_template(path: str) -> CompiledTemplate:
+    """Compiled template for a file, cached until the file changes."""
+    full = os.path.abspath(path)
+    st = os.stat(full)
+    key = (full, st.st_mtime_ns, st.st_size)
+    tpl = _CACHE.get(key)
+    if tpl is None:
+        with open(full, "r", encoding="utf-8") as f:
+            tpl = compile_template(f.read())
+        _CACHE[key] = tpl
+    return tpl
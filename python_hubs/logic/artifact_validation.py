@@ -0,0 +1,285 @@
+"""
+Artifact contract validation — artifact_contracts/schemas/*.schema.json
+
+Each schema's `required_fields` is compiled ONCE into a tree of small checker
+closures (type, max_length, allowed_values, min/max, item counts, date format).
+Compiled validators are cached by the schema file's sha256, so re-reading an
+unchanged contract is free and validating an artifact is a few dict lookups.
+
+    errors = validate("exit_ticket", {"title": "...", "grade_level": "7", ...})
+    bad = validate_many("worksheet", records)   # {index: [FieldError, ...]}
+
+partial=True checks only the fields that are present (generators that fill a
+few header fields); otherwise every required field must be there and unknown
+fields are reported ("schemas define what gets stored — and what never does").
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+SCHEMA_DIR = os.path.join(REPO_ROOT, "artifact_contracts", "schemas")
+
+
+@dataclass(frozen=True)
+class FieldError:
+    path: str  # "title", "do_now.response_lines", "procedure[2].minutes"
+    code: str  # missing | unknown | type | max_length | allowed_values | min | max | min_items | max_items | format
+    message: str
+
+    def as_dict(self) -> Dict[str, str]:
+        return {"path": self.path, "code": self.code, "message": self.message}
+
+
+# A checker appends FieldErrors for `value` found at `path`.
+Checker = Callable[[Any, str, List[FieldError]], None]
+
+_TYPES: Dict[str, Tuple[type, ...]] = {
+    "string": (str,),
+    "integer": (int,),
+    "boolean": (bool,),
+    "array": (list, tuple),
+    "object": (dict,),
+}
+
+_DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+
+def _is_type(value: Any, type_name: str) -> bool:
+    if type_name == "integer" and isinstance(value, bool):
+        return False  # bool is an int subclass; the contracts keep them apart
+    return isinstance(value, _TYPES.get(type_name, (object,)))
+
+
+# -----------------------------
+# Compiler
+# -----------------------------
+def _compile_field(spec: Mapping[str, Any]) -> Checker:
+    """Builds one closure for a field spec; only the rules the spec declares are checked."""
+    type_name = spec.get("type", "")
+    steps: List[Checker] = []
+
+    if "max_length" in spec:
+        limit = int(spec["max_length"])
+
+        def check_len(v, path, errors):
+            if len(v) > limit:
+                errors.append(FieldError(path, "max_length", f"{len(v)} characters (max {limit})"))
+
+        steps.append(check_len)
+
+    if "allowed_values" in spec:
+        allowed = frozenset(spec["allowed_values"])
+        shown = ", ".join(spec["allowed_values"])
+
+        def check_allowed(v, path, errors):
+            if v not in allowed:
+                errors.append(FieldError(path, "allowed_values", f"{v!r} is not one of: {shown}"))
+
+        steps.append(check_allowed)
+
+    if spec.get("format") == "YYYY-MM-DD":
+
+        def check_date(v, path, errors):
+            try:
+                ok = bool(_DATE_RE.match(v)) and bool(date.fromisoformat(v))
+            except ValueError:
+                ok = False
+            if not ok:
+                errors.append(FieldError(path, "format", f"{v!r} is not a YYYY-MM-DD date"))
+
+        steps.append(check_date)
+
+    if "min" in spec or "max" in spec:
+        lo, hi = spec.get("min"), spec.get("max")
+
+        def check_range(v, path, errors):
+            if lo is not None and v < lo:
+                errors.append(FieldError(path, "min", f"{v} is below {lo}"))
+            elif hi is not None and v > hi:
+                errors.append(FieldError(path, "max", f"{v} is above {hi}"))
+
+        steps.append(check_range)
+
+    if "min_items" in spec or "max_items" in spec:
+        lo_n, hi_n = spec.get("min_items"), spec.get("max_items")
+
+        def check_count(v, path, errors):
+            if lo_n is not None and len(v) < lo_n:
+                errors.append(FieldError(path, "min_items", f"{len(v)} item(s) (min {lo_n})"))
+            elif hi_n is not None and len(v) > hi_n:
+                errors.append(FieldError(path, "max_items", f"{len(v)} item(s) (max {hi_n})"))
+
+        steps.append(check_count)
+
+    if type_name == "array" and "items" in spec:
+        item_check = _compile_items(spec["items"])
+
+        def check_items(v, path, errors):
+            for i, item in enumerate(v):
+                item_check(item, f"{path}[{i}]", errors)
+
+        steps.append(check_items)
+
+    if type_name == "object" and "fields" in spec:
+        steps.append(_compile_fields(spec["fields"], partial=True, strict=False))
+
+    def check(v, path, errors):
+        if type_name and not _is_type(v, type_name):
+            errors.append(FieldError(path, "type", f"expected {type_name}, got {type(v).__name__}"))
+            return
+        for step in steps:
+            step(v, path, errors)
+
+    return check
+
+
+def _compile_items(items: Any) -> Checker:
+    """Array items: a bare type name ("string") or a record shape ({"term": "string", ...})."""
+    if isinstance(items, str):
+        return _compile_field({"type": items})
+    shape = {}
+    for key, value in items.items():
+        if key.startswith("allowed_") and isinstance(value, list):
+            # e.g. "allowed_section_types" constrains "section_type"
+            target = key[len("allowed_"):].rstrip("s")
+            shape.setdefault(target, {"type": "string"})["allowed_values"] = value
+        elif isinstance(value, str):
+            shape.setdefault(key, {})["type"] = value
+    return _compile_field({"type": "object", "fields": shape})
+
+
+def _compile_fields(fields: Mapping[str, Any], *, partial: bool, strict: bool) -> Checker:
+    checks = {name: _compile_field(spec) for name, spec in fields.items()}
+    required = tuple(checks)
+
+    def check(obj, path, errors):
+        prefix = f"{path}." if path else ""
+        if not partial:
+            for name in required:
+                if name not in obj:
+                    errors.append(FieldError(prefix + name, "missing", "required field is missing"))
+        for name, value in obj.items():
+            fn = checks.get(name)
+            if fn is not None:
+                if value is not None:
+                    fn(value, prefix + name, errors)
+            elif strict:
+                errors.append(FieldError(prefix + name, "unknown", "field is not in the contract"))
+
+    return check
+
+
+@dataclass(frozen=True)
+class CompiledSchema:
+    artifact_type: str
+    version: str
+    digest: str
+    field_names: Tuple[str, ...]
+    print_profiles: Tuple[str, ...]
+    _full: Checker
+    _partial: Checker
+
+    def validate(self, artifact: Mapping[str, Any], *, partial: bool = False) -> List[FieldError]:
+        errors: List[FieldError] = []
+        if not isinstance(artifact, Mapping):
+            return [FieldError("", "type", f"expected object, got {type(artifact).__name__}")]
+        body = artifact
+        profile = artifact.get("print_profile")
+        if profile is not None:
+            body = {k: v for k, v in artifact.items() if k != "print_profile"}
+            if profile not in self.print_profiles:
+                errors.append(FieldError("print_profile", "allowed_values",
+                                         f"{profile!r} is not one of: {', '.join(self.print_profiles)}"))
+        (self._partial if partial else self._full)(body, "", errors)
+        return errors
+
+
+def compile_schema(schema: Mapping[str, Any], digest: str = "") -> CompiledSchema:
+    fields = schema.get("required_fields") or {}
+    return CompiledSchema(
+        artifact_type=schema.get("artifact_type", ""),
+        version=str(schema.get("version", "")),
+        digest=digest,
+        field_names=tuple(fields),
+        print_profiles=tuple((schema.get("print_profile") or {}).get("options") or ()),
+        _full=_compile_fields(fields, partial=False, strict=True),
+        _partial=_compile_fields(fields, partial=True, strict=False),
+    )
+
+
+# -----------------------------
+# Cache (schema file hash -> compiled)
+# -----------------------------
+_BY_DIGEST: Dict[str, CompiledSchema] = {}
+_BY_STAT: Dict[Tuple[str, int, int], str] = {}  # only re-hash when the file's stat changes
+
+
+def load_schema(path: str) -> CompiledSchema:
+    """Compiled validator for a schema file; recompiled only when its content hash changes."""
+    full = os.path.abspath(path)
+    st = os.stat(full)
+    key = (full, st.st_mtime_ns, st.st_size)
+    digest = _BY_STAT.get(key)
+    if digest is None or digest not in _BY_DIGEST:
+        with open(full, "rb") as f:
+            raw = f.read()
+        digest = hashlib.sha256(raw).hexdigest()
+        if digest not in _BY_DIGEST:
+            _BY_DIGEST[digest] = compile_schema(json.loads(raw.decode("utf-8")), digest)
+        _BY_STAT[key] = digest
+    return _BY_DIGEST[digest]
+
+
+def schema_path(artifact_type: str, schema_dir: Optional[str] = None) -> str:
+    return os.path.join(schema_dir or SCHEMA_DIR, f"{artifact_type}.schema.json")
+
+
+def get_validator(artifact_type: str, schema_dir: Optional[str] = None) -> CompiledSchema:
+    path = schema_path(artifact_type, schema_dir)
+    if not os.path.exists(path):
+        raise KeyError(f"No contract for artifact type '{artifact_type}' ({path})")
+    return load_schema(path)
+
+
+def artifact_types(schema_dir: Optional[str] = None) -> List[str]:
+    suffix = ".schema.json"
+    folder = schema_dir or SCHEMA_DIR
+    return sorted(n[: -len(suffix)] for n in os.listdir(folder) if n.endswith(suffix))
+
+
+# -----------------------------
+# Public API
+# -----------------------------
+def validate(artifact_type: str, artifact: Mapping[str, Any], *, partial: bool = False) -> List[FieldError]:
+    """[] when the artifact honours its contract."""
+    return get_validator(artifact_type).validate(artifact, partial=partial)
+
+
+def validate_many(
+    artifact_type: str, artifacts: Iterable[Mapping[str, Any]], *, partial: bool = False
+) -> Dict[int, List[FieldError]]:
+    """Bulk check; the schema is resolved once. Returns {index: errors} for failing artifacts only."""
+    check = get_validator(artifact_type).validate
+    out: Dict[int, List[FieldError]] = {}
+    for i, artifact in enumerate(artifacts):
+        errors = check(artifact, partial=partial)
+        if errors:
+            out[i] = errors
+    return out
+
+
+def format_errors(errors: Iterable[FieldError]) -> str:
+    return "; ".join(f"{e.path or '(artifact)'}: {e.message}" for e in errors)
+
+
+def split_tags(text: str) -> List[str]:
+    """'MS-ESS2-4, MS-ESS1-2' -> ['MS-ESS2-4', 'MS-ESS1-2'] (the header 'Standards' field)."""
+    return [t.strip() for t in re.split(r"[,;]", text or "") if t.strip()]